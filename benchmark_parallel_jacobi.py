@@ -0,0 +1,62 @@
+"""Benchmark the shared-memory parallel Jacobi engine against the serial one.
+
+Usage:
+    python benchmark_parallel_jacobi.py [--size N] [--sweeps K] [--max-workers P]
+
+Times K sweeps of a dense, strictly diagonally dominant N x N system with the
+vectorized engine and with the parallel engine on 1..P workers, and checks
+that every parallel run reproduces the serial solution.
+"""
+import argparse
+import os
+import time
+import numpy as np
+from jacobi import jacobi_method
+
+
+def build_system(n: int, seed: int = 0):
+    """Build a dense, strictly diagonally dominant test system."""
+    rng = np.random.default_rng(seed)
+    A = rng.uniform(-1.0, 1.0, (n, n))
+    A[np.arange(n), np.arange(n)] = n
+    b = rng.uniform(-1.0, 1.0, n)
+    return A, b
+
+
+def time_solve(A, b, sweeps: int, **kwargs):
+    """Run exactly `sweeps` Jacobi sweeps and return (seconds, result)."""
+    start = time.perf_counter()
+    result = jacobi_method(
+        A, b, max_iterations=sweeps, tolerance=0.0, log_policy="none",
+        divergence_check=False, **kwargs
+    )
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=8000, help="Matrix size N")
+    parser.add_argument("--sweeps", type=int, default=50, help="Sweeps per run")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1,
+                        help="Largest worker count to try")
+    args = parser.parse_args()
+
+    A, b = build_system(args.size)
+    print(f"Dense Jacobi, n = {args.size}, {args.sweeps} sweeps")
+
+    serial_time, serial = time_solve(A, b, args.sweeps, engine="vectorized")
+    print(f"{'vectorized':>12}: {serial_time:8.3f} s")
+
+    counts = [2 ** k for k in range(args.max_workers.bit_length()) if 2 ** k <= args.max_workers]
+    if args.max_workers not in counts:
+        counts.append(args.max_workers)
+
+    for workers in counts:
+        elapsed, result = time_solve(A, b, args.sweeps, engine="parallel", workers=workers)
+        match = np.allclose(result["solution"], serial["solution"], rtol=0, atol=1e-12)
+        print(f"{workers:>4} workers: {elapsed:8.3f} s  "
+              f"speedup {serial_time / elapsed:5.2f}x  matches serial: {match}")
+
+
+if __name__ == "__main__":
+    main()
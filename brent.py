@@ -0,0 +1,193 @@
+"""Brent's method: bracketing root finder mixing interpolation, secant and bisection steps."""
+import numpy as np
+from typing import Callable, Dict, Optional
+from config_loader import config
+from iteration_log import IterationLog
+from expression import compile_expression
+from regula_falsi import check_bracket
+
+# Relative machine precision, for the minimum step near the root
+EPS = np.finfo(float).eps
+
+
+def brent_method(
+    func_str: str,
+    a: float,
+    b: float,
+    max_iterations: Optional[int] = None,
+    tolerance: Optional[float] = None,
+    log_policy: Optional[str] = None
+) -> Dict:
+    """Find root of equation using Brent's method.
+
+    Like Regula-Falsi, the method keeps a bracket [a, b] with f(a) and f(b)
+    of opposite signs, so it always converges. Each iteration tries, in
+    order of speed:
+    1. Inverse quadratic interpolation through the last three points
+    2. A secant step when only two distinct points are available
+    3. Bisection, whenever the interpolated step would leave the bracket
+       or shrink it more slowly than halving would
+    Typical solves take a handful of function evaluations.
+
+    Takes the same inputs and returns the same layout as
+    regula_falsi_method, so clients can switch between the engines.
+
+    Args:
+        func_str: Function as string (e.g., "x**2 - 4")
+        a: Left endpoint
+        b: Right endpoint
+        max_iterations: Maximum number of iterations
+        tolerance: Convergence tolerance on |f| and on the bracket width
+        log_policy: Iteration log retention policy (see iteration_log.IterationLog)
+
+    Returns:
+        Dictionary containing:
+            - success: Whether the method converged
+            - root: Approximate root
+            - iterations: Number of iterations performed
+            - error: Width of the final bracket
+            - iteration_log: Iteration details retained by the log policy;
+              each entry also names its step ("interpolation", "secant"
+              or "bisection")
+            - message: Status message
+            - function_evaluations: Number of evaluations of f
+    """
+    # Load configuration
+    if max_iterations is None:
+        max_iterations = config.get('brent.max_iterations', 100)
+    if tolerance is None:
+        tolerance = config.get('brent.tolerance', 1e-6)
+
+    try:
+        iteration_log = IterationLog(log_policy)
+
+        # Create function from string (compiled once, cached across calls)
+        f = compile_expression(func_str)
+
+        fa, fb, result = check_bracket(f, a, b, tolerance)
+        if result is not None:
+            return result
+
+        return _brent(f, a, b, fa, fb, max_iterations, tolerance, iteration_log)
+
+    except ZeroDivisionError:
+        return {
+            "success": False,
+            "root": None,
+            "iterations": 0,
+            "error": None,
+            "iteration_log": [],
+            "message": "Division by zero - function may be constant"
+        }
+
+    except Exception as e:
+        return {
+            "success": False,
+            "root": None,
+            "iterations": 0,
+            "error": None,
+            "iteration_log": [],
+            "message": f"Error: {str(e)}"
+        }
+
+
+def _brent(
+    f: Callable,
+    a: float,
+    b: float,
+    fa: float,
+    fb: float,
+    max_iterations: int,
+    tolerance: float,
+    iteration_log: IterationLog
+) -> Dict:
+    """Run Brent iterations from a bracket [a, b] with known f(a), f(b).
+
+    b is the best estimate so far, a the previous iterate and c the
+    contrapoint, with f(b) and f(c) of opposite signs.
+    """
+    c, fc = a, fa
+    d = e = b - a
+
+    for iteration in range(max_iterations):
+        # Keep the smaller |f| in b
+        if abs(fc) < abs(fb):
+            a, fa = b, fb
+            b, fb = c, fc
+            c, fc = a, fa
+
+        tol1 = 2 * EPS * abs(b) + 0.5 * tolerance
+        xm = 0.5 * (c - b)
+
+        step = "bisection"
+        if abs(e) >= tol1 and abs(fa) > abs(fb):
+            s = fb / fa
+            if a == c:
+                # Secant through a and b
+                p = 2 * xm * s
+                q = 1 - s
+                step = "secant"
+            else:
+                # Inverse quadratic interpolation through a, b and c
+                q = fa / fc
+                r = fb / fc
+                p = s * (2 * xm * q * (q - r) - (b - a) * (r - 1))
+                q = (q - 1) * (r - 1) * (s - 1)
+                step = "interpolation"
+            if p > 0:
+                q = -q
+            p = abs(p)
+
+            # Accept the interpolated step only if it stays well inside the
+            # bracket and shrinks faster than the step before last
+            if 2 * p < min(3 * xm * q - abs(tol1 * q), abs(e * q)):
+                e = d
+                d = p / q
+            else:
+                step = "bisection"
+        if step == "bisection":
+            d = xm
+            e = d
+
+        a, fa = b, fb
+        b = b + d if abs(d) > tol1 else b + np.copysign(tol1, xm)
+        fb = f(b)
+
+        # Keep the root bracketed between b and c
+        if fb * fc > 0:
+            c, fc = a, fa
+            d = e = b - a
+
+        error = abs(c - b)
+
+        # Log iteration
+        iteration_log.record(iteration + 1, error, lambda: {
+            "a": float(min(b, c)),
+            "b": float(max(b, c)),
+            "c": float(b),
+            "f(c)": float(fb),
+            "step": step
+        })
+
+        # Check convergence
+        if abs(fb) < tolerance or error <= 2 * tol1:
+            return {
+                "success": True,
+                "root": float(b),
+                "iterations": iteration + 1,
+                "error": float(error),
+                "iteration_log": iteration_log.to_list(),
+                "message": f"Converged after {iteration + 1} iterations",
+                "function_evaluations": iteration + 3
+            }
+
+    # Did not converge
+    return {
+        "success": False,
+        "root": float(b),
+        "iterations": max_iterations,
+        "error": float(error),
+        "iteration_log": iteration_log.to_list(),
+        "message": f"Did not converge after {max_iterations} iterations",
+        "function_evaluations": max_iterations + 2
+    }
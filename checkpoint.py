@@ -0,0 +1,166 @@
+"""Periodic .npz checkpoints of long-running iterative solves."""
+import hashlib
+import os
+import re
+import time
+import uuid
+import numpy as np
+from typing import Dict, Optional
+from config_loader import config
+from linear_operators import LinearSystemError
+
+# Tokens name files in the checkpoint directory, so keep them path-safe
+TOKEN_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+class CheckpointError(LinearSystemError):
+    """Raised when a checkpoint cannot be resumed."""
+
+
+def system_fingerprint(operator_key: Optional[str], b: np.ndarray) -> str:
+    """Return a hash identifying a linear system by its operator and b.
+
+    Args:
+        operator_key: Content fingerprint of A (see operator_cache.fingerprint);
+            None for operators without hashable content
+        b: Right-hand side
+
+    Raises:
+        CheckpointError: If operator_key is None: a matvec callable has no
+            content to hash, so a token could be resumed against another
+            operator with the same b
+    """
+    if operator_key is None:
+        raise CheckpointError("Checkpointing needs an operator with hashable content, not a matvec callable")
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(operator_key).encode())
+    digest.update(str(b.shape).encode())
+    digest.update(np.ascontiguousarray(b, dtype=float).tobytes())
+    return digest.hexdigest()
+
+
+class Checkpointer:
+    """Saves the state of one iterative solve under a resume token.
+
+    The state (iterate, iteration count and any solver-specific vectors) is
+    written every `every` iterations and when the run stops unconverged, to
+    <directory>/<token>.npz. Writes go to a temporary file that is renamed
+    into place, so a crash mid-write never corrupts the last checkpoint.
+    A converged run deletes its checkpoint. Checkpoints that are never
+    resumed are pruned on every save: files older than max_age are
+    deleted, then the oldest beyond max_files.
+    """
+
+    def __init__(
+        self,
+        solver: str,
+        fingerprint: str,
+        token: Optional[str] = None,
+        every: Optional[int] = None,
+        directory: Optional[str] = None,
+        max_age: Optional[float] = None,
+        max_files: Optional[int] = None
+    ):
+        """Initialize the checkpointer.
+
+        Args:
+            solver: Name of the solver writing the state
+            fingerprint: System fingerprint (see system_fingerprint)
+            token: Resume token; a new one is generated if None
+            every: Iterations between periodic saves (uses checkpoint.every
+                config; 0 saves only when the run stops)
+            directory: Checkpoint directory (uses checkpoint.directory config)
+            max_age: Seconds after which other checkpoints are deleted
+                (uses checkpoint.max_age config)
+            max_files: Most checkpoints kept in the directory (uses
+                checkpoint.max_files config)
+        """
+        if token is None:
+            token = uuid.uuid4().hex
+        if not TOKEN_PATTERN.match(token):
+            raise CheckpointError("Resume token may only contain letters, digits, '-' and '_'")
+        if every is None:
+            every = config.get('checkpoint.every', 100)
+        if directory is None:
+            directory = config.get('checkpoint.directory', 'checkpoints')
+        if max_age is None:
+            max_age = config.get('checkpoint.max_age', 86400)
+        if max_files is None:
+            max_files = config.get('checkpoint.max_files', 100)
+
+        self.solver = solver
+        self.fingerprint = fingerprint
+        self.token = token
+        self.every = int(every)
+        self.directory = directory
+        self.max_age = float(max_age)
+        self.max_files = int(max_files)
+        self.path = os.path.join(directory, f"{token}.npz")
+
+    def load(self) -> Optional[Dict[str, np.ndarray]]:
+        """Return the saved state for this token, or None if there is none.
+
+        Raises:
+            CheckpointError: If the checkpoint belongs to another solver or system
+        """
+        if not os.path.exists(self.path):
+            return None
+        with np.load(self.path) as saved:
+            state = {key: saved[key] for key in saved.files}
+        if str(state.pop("solver")) != self.solver:
+            raise CheckpointError("Resume token belongs to a different solver")
+        if str(state.pop("fingerprint")) != self.fingerprint:
+            raise CheckpointError("Resume token belongs to a different system")
+        return state
+
+    def periodic(self, iteration: int, **state):
+        """Save the state if a periodic checkpoint is due at this iteration."""
+        if self.every and iteration % self.every == 0:
+            self.save(iteration, **state)
+
+    def save(self, iteration: int, **state):
+        """Write the state atomically."""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        temporary = f"{self.path}.tmp.npz"
+        np.savez(
+            temporary, solver=self.solver, fingerprint=self.fingerprint,
+            iteration=iteration, **state
+        )
+        os.replace(temporary, self.path)
+        self.prune()
+
+    def prune(self):
+        """Delete expired checkpoints and the oldest beyond max_files.
+
+        The checkpoint of this token is always kept.
+        """
+        now = time.time()
+        others = []
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(".npz") or entry.path == self.path:
+                continue
+            try:
+                modified = entry.stat().st_mtime
+                if now - modified > self.max_age:
+                    os.remove(entry.path)
+                else:
+                    others.append((modified, entry.path))
+            except FileNotFoundError:
+                # Deleted concurrently by another run
+                continue
+        others.sort()
+        for _, path in others[:max(len(others) - (self.max_files - 1), 0)]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+
+    def discard(self):
+        """Delete the checkpoint (after the run has converged)."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    @property
+    def saved(self) -> bool:
+        """Whether a checkpoint currently exists for this token."""
+        return os.path.exists(self.path)
@@ -34,16 +34,81 @@ class ConfigLoader:
                     "jacobi": {
                         "max_iterations": 100,
                         "tolerance": 1e-6,
-                        "relaxation_factor": 1.0
+                        "relaxation_factor": 1.0,
+                        "engine": "vectorized",
+                        "divergence_check": True,
+                        "spectral_steps": 20,
+                        "divergence_window": 5,
+                        "workers": 0,
+                        "max_workers": 0,
+                        "sweep_timeout": 60,
+                        "precision": "float64",
+                        "mixed_inner_tolerance": 1e-4,
+                        "permute_rows": True,
+                        "acceleration": "none",
+                        "anderson_depth": 5,
+                        "measure_baseline": False,
+                        "cache": {
+                            "enabled": True,
+                            "max_size": 32,
+                            "max_bytes": 1073741824,
+                            "warm_start": False
+                        }
+                    },
+                    "conjugate_gradient": {
+                        "max_iterations": 1000,
+                        "tolerance": 1e-8,
+                        "preconditioner": "jacobi"
                     },
                     "regula_falsi": {
+                        "max_iterations": 100,
+                        "tolerance": 1e-6,
+                        "variant": "classic",
+                        "compare": False
+                    },
+                    "brent": {
                         "max_iterations": 100,
                         "tolerance": 1e-6
                     },
+                    "root_search": {
+                        "grid_points": 200,
+                        "max_refinements": 10,
+                        "refine_points": 16,
+                        "tolerance": 1e-8,
+                        "max_iterations": 100,
+                        "variant": "illinois",
+                        "polynomial": True
+                    },
+                    "polynomial": {
+                        "polish": True,
+                        "newton_steps": 2,
+                        "cluster_factor": 10,
+                        "tolerance": 1e-8
+                    },
+                    "expression": {
+                        "cache_size": 256,
+                        "max_polynomial_degree": 100
+                    },
+                    "checkpoint": {
+                        "enabled": False,
+                        "every": 100,
+                        "directory": "checkpoints",
+                        "max_age": 86400,
+                        "max_files": 100
+                    },
+                    "iteration_log": {
+                        "policy": "full",
+                        "every": 10,
+                        "last": 50
+                    },
                     "finite_difference": {
                         "default_h": 0.01,
                         "min_h": 1e-10,
-                        "max_h": 1.0
+                        "max_h": 1.0,
+                        "compact": False,
+                        "nonuniform": False,
+                        "max_order": 10,
+                        "max_accuracy": 20
                     }
                 }
         except Exception as e:
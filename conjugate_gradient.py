@@ -0,0 +1,224 @@
+"""Preconditioned Conjugate Gradient method for symmetric positive-definite systems."""
+import numpy as np
+from typing import Dict, List, Optional
+from config_loader import config
+from iteration_log import IterationLog
+from checkpoint import Checkpointer, system_fingerprint
+from jacobi import MatrixLike
+from linear_operators import LinearSystemError, cached_value, prepare_linear_system
+from operator_cache import fingerprint
+
+# Available preconditioners
+PRECONDITIONERS = ("jacobi", "none")
+
+
+def conjugate_gradient_method(
+    A: MatrixLike,
+    b: List[float],
+    x0: Optional[List[float]] = None,
+    max_iterations: Optional[int] = None,
+    tolerance: Optional[float] = None,
+    preconditioner: Optional[str] = None,
+    log_policy: Optional[str] = None,
+    checkpoint: Optional[bool] = None,
+    resume_token: Optional[str] = None
+) -> Dict:
+    """Solve a symmetric positive-definite system with (preconditioned) CG.
+
+    Each iteration applies A once and the preconditioner M once:
+        alpha = (r·z) / (p·Ap),  x += alpha p,  r -= alpha Ap
+        z = M⁻¹ r,  beta = (r_new·z_new) / (r·z),  p = z + beta p
+
+    With the "jacobi" preconditioner M = diag(A), so M⁻¹ is the same
+    diagonal inverse used by the Jacobi sweep. On SPD systems this usually
+    converges in tens of iterations where plain Jacobi needs thousands.
+
+    Checkpointing works as for jacobi_method; the checkpoint holds the
+    full recurrence state (x, r, p and r·z), so a resumed run continues
+    exactly where the previous one stopped.
+
+    Args:
+        A: Symmetric positive-definite matrix (n x n), dense or CSR
+        b: Right-hand side vector (n)
+        x0: Initial guess (if None, uses zero vector)
+        max_iterations: Maximum number of iterations
+        tolerance: Tolerance on the relative residual ||b - Ax|| / ||b||
+        preconditioner: "jacobi" or "none"
+        log_policy: Iteration log retention policy (see iteration_log.IterationLog)
+        checkpoint: Save periodic checkpoints (uses checkpoint.enabled config;
+            implied by resume_token)
+        resume_token: Token of the checkpoint to resume from or save under
+
+    Returns:
+        Dictionary with the same keys as jacobi_method, where error and the
+        iteration_log errors are relative residual norms, plus:
+            - preconditioner: Preconditioner used
+            - resume_token, resumed_from_iteration: As for jacobi_method
+              (when checkpointing)
+    """
+    # Load configuration
+    if max_iterations is None:
+        max_iterations = config.get('conjugate_gradient.max_iterations', 1000)
+    if tolerance is None:
+        tolerance = config.get('conjugate_gradient.tolerance', 1e-8)
+    if preconditioner is None:
+        preconditioner = config.get('conjugate_gradient.preconditioner', 'jacobi')
+    if checkpoint is None:
+        checkpoint = config.get('checkpoint.enabled', False)
+
+    try:
+        if preconditioner not in PRECONDITIONERS:
+            raise LinearSystemError(
+                f"Unknown preconditioner '{preconditioner}'. Use one of: {', '.join(PRECONDITIONERS)}"
+            )
+
+        A, b, x = prepare_linear_system(A, b, x0)
+
+        if b.ndim != 1:
+            raise LinearSystemError("Conjugate gradient accepts a single right-hand side vector")
+
+        if preconditioner == "jacobi":
+            inv_diag = cached_value(A, "inverse_diagonal", lambda: 1.0 / A.diagonal())
+        else:
+            inv_diag = np.ones(len(b))
+
+        iteration_log = IterationLog(log_policy)
+        b_norm = np.linalg.norm(b)
+        if b_norm == 0:
+            b_norm = 1.0
+
+        # The recurrence state depends on the preconditioner, so it is part
+        # of the checkpoint's solver name
+        checkpointer = None
+        state = None
+        if checkpoint or resume_token is not None:
+            key = cached_value(A, "fingerprint", lambda: fingerprint(A))
+            checkpointer = Checkpointer(
+                f"conjugate_gradient:{preconditioner}", system_fingerprint(key, b), resume_token
+            )
+            state = checkpointer.load()
+
+        if state is not None:
+            x, r, p = (state[name].astype(float) for name in ("x", "r", "p"))
+            rz = float(state["rz"])
+            start_iteration = int(state["iteration"])
+            result = _cg_iterations(
+                A, x, r, p, rz, inv_diag, b_norm, start_iteration, max_iterations,
+                tolerance, iteration_log, checkpointer
+            )
+            result["resumed_from_iteration"] = start_iteration
+        else:
+            r = b - A.matvec(x)
+            error = np.linalg.norm(r) / b_norm
+            if error < tolerance:
+                result = {
+                    "success": True,
+                    "solution": x.tolist(),
+                    "iterations": 0,
+                    "error": float(error),
+                    "iteration_log": [],
+                    "message": "Initial guess already satisfies the tolerance"
+                }
+            else:
+                z = inv_diag * r
+                result = _cg_iterations(
+                    A, x, r, z.copy(), r @ z, inv_diag, b_norm, 0, max_iterations,
+                    tolerance, iteration_log, checkpointer
+                )
+
+        result["preconditioner"] = preconditioner
+        if checkpointer is not None:
+            result["resume_token"] = checkpointer.token if checkpointer.saved else None
+        return result
+
+    except LinearSystemError as e:
+        return {
+            "success": False,
+            "solution": None,
+            "iterations": 0,
+            "error": None,
+            "iteration_log": [],
+            "message": str(e)
+        }
+
+    except Exception as e:
+        return {
+            "success": False,
+            "solution": None,
+            "iterations": 0,
+            "error": None,
+            "iteration_log": [],
+            "message": f"Error: {str(e)}"
+        }
+
+
+def _cg_iterations(
+    A,
+    x: np.ndarray,
+    r: np.ndarray,
+    p: np.ndarray,
+    rz: float,
+    inv_diag: np.ndarray,
+    b_norm: float,
+    start_iteration: int,
+    max_iterations: int,
+    tolerance: float,
+    iteration_log: IterationLog,
+    checkpointer: Optional[Checkpointer]
+) -> Dict:
+    """Run CG iterations from the recurrence state (x, r, p, r·z).
+
+    Counts on from start_iteration; with a checkpointer the state is saved
+    periodically and when the run stops unconverged.
+    """
+    end_iteration = start_iteration + max_iterations
+    error = np.linalg.norm(r) / b_norm
+
+    for iteration in range(start_iteration, end_iteration):
+        Ap = A.matvec(p)
+        pAp = p @ Ap
+        if pAp <= 0:
+            raise LinearSystemError("Matrix is not positive definite")
+
+        alpha = rz / pAp
+        x += alpha * p
+        r -= alpha * Ap
+
+        # Relative residual
+        error = np.linalg.norm(r) / b_norm
+
+        # Log iteration
+        iteration_log.record(iteration + 1, error, lambda: {"solution": x.tolist()})
+
+        # Check convergence
+        if error < tolerance:
+            if checkpointer is not None:
+                checkpointer.discard()
+            return {
+                "success": True,
+                "solution": x.tolist(),
+                "iterations": iteration + 1,
+                "error": float(error),
+                "iteration_log": iteration_log.to_list(),
+                "message": f"Converged after {iteration + 1} iterations"
+            }
+
+        z = inv_diag * r
+        rz_new = r @ z
+        p = z + (rz_new / rz) * p
+        rz = rz_new
+
+        if checkpointer is not None:
+            checkpointer.periodic(iteration + 1, x=x, r=r, p=p, rz=rz)
+
+    # Did not converge
+    if checkpointer is not None:
+        checkpointer.save(end_iteration, x=x, r=r, p=p, rz=rz)
+    return {
+        "success": False,
+        "solution": x.tolist(),
+        "iterations": end_iteration,
+        "error": float(error),
+        "iteration_log": iteration_log.to_list(),
+        "message": f"Did not converge after {end_iteration} iterations"
+    }
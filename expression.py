@@ -0,0 +1,258 @@
+"""Validated, compiled and cached evaluation of user-supplied function strings."""
+import ast
+import math
+import numpy as np
+from functools import lru_cache
+from typing import Dict, Optional, Sequence, Tuple
+from config_loader import config
+
+# Names available to expressions evaluated on arrays (NumPy ufuncs)
+ARRAY_NAMESPACE: Dict[str, object] = {
+    'np': np,
+    'sin': np.sin,
+    'cos': np.cos,
+    'tan': np.tan,
+    'exp': np.exp,
+    'log': np.log,
+    'sqrt': np.sqrt,
+    'abs': np.abs,
+    'pi': np.pi,
+    'e': np.e
+}
+
+# The same names for the scalar fast path: math functions on Python floats
+# avoid the per-call overhead of dispatching a ufunc on a 0-d value
+SCALAR_NAMESPACE: Dict[str, object] = {
+    'np': np,
+    'sin': math.sin,
+    'cos': math.cos,
+    'tan': math.tan,
+    'exp': math.exp,
+    'log': math.log,
+    'sqrt': math.sqrt,
+    'abs': abs,
+    'pi': math.pi,
+    'e': math.e
+}
+
+# Attributes of np that expressions may use
+NUMPY_ATTRIBUTES = frozenset({
+    'sin', 'cos', 'tan', 'arcsin', 'arccos', 'arctan', 'arctan2',
+    'sinh', 'cosh', 'tanh', 'arcsinh', 'arccosh', 'arctanh',
+    'exp', 'expm1', 'exp2', 'log', 'log2', 'log10', 'log1p',
+    'sqrt', 'cbrt', 'square', 'power', 'abs', 'absolute', 'sign',
+    'floor', 'ceil', 'hypot', 'maximum', 'minimum', 'pi', 'e'
+})
+
+# Syntax allowed in an expression: arithmetic, comparisons, conditional
+# expressions and calls of the whitelisted functions
+ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.BoolOp, ast.Compare, ast.IfExp,
+    ast.Call, ast.Name, ast.Load, ast.Attribute, ast.Constant,
+    ast.operator, ast.unaryop, ast.boolop, ast.cmpop
+)
+
+
+# Constants a polynomial may contain besides numbers
+POLYNOMIAL_CONSTANTS = {'pi': math.pi, 'e': math.e}
+
+
+class ExpressionError(ValueError):
+    """Raised when a function string is not a valid, safe expression."""
+
+
+class CompiledExpression:
+    """A validated expression compiled once into two Python functions.
+
+    Calling the object evaluates the expression: Python ints and floats
+    take the scalar path (math functions), anything else the array path
+    (NumPy ufuncs), so one compiled expression serves both a root finder's
+    scalar evaluations and a vectorized evaluation over a whole grid.
+
+    Expressions of a single variable that are polynomials in it also carry
+    their coefficients (highest degree first), extracted from the AST at
+    parse time; coefficients is None for any other expression.
+    """
+
+    def __init__(self, source: str, variables: Tuple[str, ...]):
+        """Validate and compile the expression.
+
+        Args:
+            source: Expression text, e.g. "x**2 - 4"
+            variables: Names of the expression's arguments, in call order
+
+        Raises:
+            ExpressionError: If the text is not a valid, safe expression
+        """
+        for name in variables:
+            if not name.isidentifier():
+                raise ExpressionError(f"Invalid variable name '{name}'")
+        try:
+            tree = ast.parse(source.strip(), mode="eval")
+        except SyntaxError as e:
+            raise ExpressionError(f"Invalid expression '{source}': {e.msg}") from None
+
+        _validate(tree, source, variables)
+
+        # Wrap the expression in a lambda of the variables, so evaluating it
+        # is a plain function call with the namespace as its globals
+        arguments = ast.arguments(
+            posonlyargs=[], args=[ast.arg(arg=name) for name in variables],
+            kwonlyargs=[], kw_defaults=[], defaults=[]
+        )
+        wrapper = ast.Expression(body=ast.Lambda(args=arguments, body=tree.body))
+        code = compile(ast.fix_missing_locations(wrapper), "<expression>", "eval")
+
+        self.source = source
+        self.variables = variables
+        self.coefficients = None
+        if len(variables) == 1:
+            self.coefficients = _polynomial(
+                tree.body, variables[0], config.get('expression.max_polynomial_degree', 100)
+            )
+        self.scalar = eval(code, {"__builtins__": {}, **SCALAR_NAMESPACE})
+        self.array = eval(code, {"__builtins__": {}, **ARRAY_NAMESPACE})
+
+    def __call__(self, *values):
+        """Evaluate the expression, using the scalar path for Python numbers.
+
+        math raises where NumPy returns nan or inf (e.g. log(-1) or an
+        overflowing exp), so such scalar evaluations are retried on the
+        array path to keep NumPy's semantics.
+        """
+        if all(type(value) in (int, float) for value in values):
+            try:
+                return self.scalar(*values)
+            except (ValueError, OverflowError):
+                return self.array(*(np.float64(value) for value in values))
+        return self.array(*values)
+
+
+def _validate(tree: ast.AST, source: str, variables: Sequence[str]):
+    """Reject any syntax or name outside the expression whitelist."""
+    for node in ast.walk(tree):
+        if not isinstance(node, ALLOWED_NODES):
+            raise ExpressionError(
+                f"Unsupported syntax in expression '{source}': {type(node).__name__}"
+            )
+        if isinstance(node, ast.Constant) and not isinstance(node.value, (int, float, complex)):
+            raise ExpressionError(f"Only numeric constants are allowed in expression '{source}'")
+        if isinstance(node, ast.Name) and node.id not in variables and node.id not in ARRAY_NAMESPACE:
+            raise ExpressionError(f"Unknown name '{node.id}' in expression '{source}'")
+        if isinstance(node, ast.Attribute):
+            if not (isinstance(node.value, ast.Name) and node.value.id == 'np'):
+                raise ExpressionError(f"Unsupported attribute access in expression '{source}'")
+            if node.attr not in NUMPY_ATTRIBUTES:
+                raise ExpressionError(f"'np.{node.attr}' is not allowed in expressions")
+        if isinstance(node, ast.Call) and node.keywords:
+            raise ExpressionError(f"Keyword arguments are not allowed in expression '{source}'")
+
+
+def _polynomial(node: ast.AST, variable: str, max_degree: int) -> Optional[Tuple[float, ...]]:
+    """Return the coefficients of a polynomial expression, or None.
+
+    Sums, differences and products of polynomials, division by a nonzero
+    constant and powers with a constant non-negative integer exponent are
+    polynomials; anything else (functions, other names, x**0.5, 1/x, ...)
+    is not.
+
+    Args:
+        node: Validated expression node
+        variable: Name of the polynomial's variable
+        max_degree: Degrees above this are not treated as polynomials
+
+    Returns:
+        Real coefficients, highest degree first (np.polyval order)
+    """
+    def walk(node):
+        if isinstance(node, ast.Constant):
+            if isinstance(node.value, complex):
+                return None
+            try:
+                return np.array([float(node.value)])
+            except OverflowError:
+                return None
+        if isinstance(node, ast.Name):
+            if node.id == variable:
+                return np.array([1.0, 0.0])
+            if node.id in POLYNOMIAL_CONSTANTS:
+                return np.array([POLYNOMIAL_CONSTANTS[node.id]])
+            return None
+        if isinstance(node, ast.Attribute):
+            if node.attr in POLYNOMIAL_CONSTANTS:
+                return np.array([POLYNOMIAL_CONSTANTS[node.attr]])
+            return None
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.UAdd, ast.USub)):
+            operand = walk(node.operand)
+            if operand is None:
+                return None
+            return -operand if isinstance(node.op, ast.USub) else operand
+        if not isinstance(node, ast.BinOp):
+            return None
+
+        left, right = walk(node.left), walk(node.right)
+        if left is None or right is None:
+            return None
+        if isinstance(node.op, ast.Add):
+            result = np.polyadd(left, right)
+        elif isinstance(node.op, ast.Sub):
+            result = np.polysub(left, right)
+        elif isinstance(node.op, ast.Mult):
+            result = np.polymul(left, right)
+        elif isinstance(node.op, ast.Div):
+            if len(right) != 1 or right[0] == 0:
+                return None
+            result = left / right[0]
+        elif isinstance(node.op, ast.Pow):
+            if len(right) != 1:
+                return None
+            exponent = right[0]
+            if len(left) == 1:
+                # A constant base: one power, however large the exponent
+                # (non-finite results are rejected below)
+                with np.errstate(all="ignore"):
+                    result = np.power(left, exponent)
+            else:
+                if not np.isfinite(exponent) or exponent < 0 or exponent != int(exponent):
+                    return None
+                # Checked before multiplying, so the loop runs at most
+                # max_degree times
+                if (len(left) - 1) * exponent > max_degree:
+                    return None
+                result = np.array([1.0])
+                for _ in range(int(exponent)):
+                    result = np.polymul(result, left)
+        else:
+            return None
+
+        result = np.trim_zeros(np.atleast_1d(result), 'f')
+        if len(result) - 1 > max_degree:
+            return None
+        return result if len(result) else np.array([0.0])
+
+    coefficients = walk(node)
+    if coefficients is None or not np.all(np.isfinite(coefficients)):
+        return None
+    return tuple(coefficients.tolist())
+
+
+@lru_cache(maxsize=config.get('expression.cache_size', 256))
+def compile_expression(source: str, variables: Tuple[str, ...] = ("x",)) -> CompiledExpression:
+    """Return the compiled expression for source, reusing cached compilations.
+
+    Compilations are kept in a bounded LRU cache shared by every caller, so
+    a function string is parsed and validated once per process rather than
+    once per evaluation.
+
+    Args:
+        source: Expression text, e.g. "x**2 - 4"
+        variables: Names of the expression's arguments, in call order
+
+    Returns:
+        CompiledExpression callable as expr(x) (or expr(*variables))
+
+    Raises:
+        ExpressionError: If the text is not a valid, safe expression
+    """
+    return CompiledExpression(source, tuple(variables))
+
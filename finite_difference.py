@@ -0,0 +1,285 @@
+"""Vectorized finite difference engine shared by the forward, backward and center methods."""
+import numpy as np
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from config_loader import config
+from expression import compile_expression
+
+# Stencil layouts: points ahead of x, behind x, or symmetric about x
+LAYOUTS = ("forward", "backward", "central")
+
+
+def fornberg_weights(offsets: np.ndarray, order: int) -> np.ndarray:
+    """Return finite difference weights for the derivative at 0 (Fornberg, 1988).
+
+    offsets may carry leading batch dimensions, e.g. one row of local
+    spacings per point of a non-uniform grid; the recurrence then runs on
+    all rows at once.
+
+    Args:
+        offsets: Distinct stencil points (..., n), relative to the point
+        order: Derivative order, below n
+
+    Returns:
+        Weights w (..., n) such that f^(order)(0) ≈ sum(w * f(offsets))
+    """
+    offsets = np.asarray(offsets, dtype=float)
+    n = offsets.shape[-1]
+    c = np.zeros(offsets.shape[:-1] + (n, order + 1))
+    c[..., 0, 0] = 1.0
+    c1 = np.ones(offsets.shape[:-1])
+    c4 = offsets[..., 0]
+    for i in range(1, n):
+        mn = min(i, order)
+        c2 = np.ones(offsets.shape[:-1])
+        c5 = c4
+        c4 = offsets[..., i]
+        for j in range(i):
+            c3 = offsets[..., i] - offsets[..., j]
+            c2 = c2 * c3
+            if j == i - 1:
+                for k in range(mn, 0, -1):
+                    c[..., i, k] = c1 * (k * c[..., i - 1, k - 1] - c5 * c[..., i - 1, k]) / c2
+                c[..., i, 0] = -c1 * c5 * c[..., i - 1, 0] / c2
+            for k in range(mn, 0, -1):
+                c[..., j, k] = (c4 * c[..., j, k] - k * c[..., j, k - 1]) / c3
+            c[..., j, 0] = c4 * c[..., j, 0] / c3
+        c1 = c2
+    return c[..., order]
+
+
+@lru_cache(maxsize=128)
+def stencil(layout: str, order: int, accuracy: int) -> Tuple[Tuple[int, ...], Tuple[float, ...]]:
+    """Return the contiguous stencil (offsets, weights) of a layout.
+
+    Forward and backward stencils of accuracy p use order + p points;
+    central stencils (p even) use 2 * ((order + 1) // 2) - 1 + p points.
+    Weights that vanish by symmetry (e.g. the centre of a central first
+    derivative) are exactly 0. order and accuracy are capped at
+    finite_difference.max_order and finite_difference.max_accuracy, beyond
+    which the weights lose all precision (and eventually overflow).
+
+    Args:
+        layout: "forward", "backward" or "central"
+        order: Derivative order (>= 1)
+        accuracy: Order of the truncation error O(h^accuracy)
+
+    Raises:
+        ValueError: If the combination is invalid, or its weights are not finite
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown stencil layout '{layout}'. Use one of: {', '.join(LAYOUTS)}")
+    if order < 1 or int(order) != order:
+        raise ValueError("Order must be a positive integer")
+    if accuracy < 1 or int(accuracy) != accuracy:
+        raise ValueError("Accuracy must be a positive integer")
+    max_order = config.get('finite_difference.max_order', 10)
+    max_accuracy = config.get('finite_difference.max_accuracy', 20)
+    if order > max_order:
+        raise ValueError(f"Order must be at most {max_order}")
+    if accuracy > max_accuracy:
+        raise ValueError(f"Accuracy must be at most {max_accuracy}")
+
+    if layout == "central":
+        if accuracy % 2:
+            raise ValueError("Central stencils need an even accuracy")
+        half = (2 * ((order + 1) // 2) - 1 + accuracy) // 2
+        offsets = np.arange(-half, half + 1)
+    else:
+        offsets = np.arange(int(order + accuracy))
+        if layout == "backward":
+            offsets = offsets - offsets[-1]
+
+    with np.errstate(over="ignore", invalid="ignore"):
+        weights = fornberg_weights(offsets.astype(float), int(order))
+    if not np.all(np.isfinite(weights)):
+        raise ValueError(f"Stencil weights for order {order}, accuracy {accuracy} are not finite")
+    weights[np.abs(weights) < 1e-12 * np.abs(weights).max()] = 0.0
+    return tuple(offsets.tolist()), tuple(weights.tolist())
+
+
+def finite_difference(
+    scheme: str,
+    func_str: str,
+    x_values: List[float],
+    y_values: Optional[List[float]] = None,
+    order: int = 1,
+    h: Optional[float] = None,
+    compact: Optional[bool] = None,
+    accuracy: Optional[int] = None,
+    nonuniform: Optional[bool] = None
+) -> Dict:
+    """Compute finite differences of one scheme at every x value at once.
+
+    The stencil for (scheme, order, accuracy) comes from Fornberg's
+    algorithm. With func_str, all stencil abscissae form one
+    (len(x_values), stencil) array and the compiled expression is evaluated
+    once over it; with y_values, the weights are applied to the samples in
+    a single correlation pass. Higher accuracy reaches the same error with
+    a larger h. Irregularly sampled y_values use per-point weights from the
+    actual x spacing (nonuniform).
+
+    Args:
+        scheme: "forward", "backward" or "central"
+        func_str: Function as string (e.g., "x**2") or empty if y_values provided
+        x_values: List of x values (can be single value or list)
+        y_values: List of corresponding y values (used when func_str is empty)
+        order: Order of derivative (any positive integer)
+        h: Step size (optional, uses config default)
+        compact: Return plain derivative and x lists instead of a dict per
+            point (uses finite_difference.compact config)
+        accuracy: Order of the truncation error O(h^accuracy); even for
+            central (default: 1 for forward/backward, 2 for central)
+        nonuniform: Take the spacing of y_values from x_values instead of h,
+            with weights computed per point (uses finite_difference.nonuniform
+            config; function strings always use h)
+
+    Returns:
+        Dictionary containing:
+            - success: Whether computation succeeded
+            - derivative: Per-point results (a list of derivative values,
+              None where the stencil is incomplete, when compact)
+            - order: Order of derivative
+            - accuracy: Accuracy order of the stencil
+            - h: Step size used
+            - points: Per-point results (empty when compact)
+            - x: The x values (only when compact)
+            - message: Status message
+    """
+    # Load configuration
+    if h is None:
+        h = config.get('finite_difference.default_h', 0.01)
+    if compact is None:
+        compact = config.get('finite_difference.compact', False)
+    if nonuniform is None:
+        nonuniform = config.get('finite_difference.nonuniform', False)
+
+    try:
+        # Validate step size
+        min_h = config.get('finite_difference.min_h', 1e-10)
+        max_h = config.get('finite_difference.max_h', 1.0)
+
+        if h < min_h or h > max_h:
+            return _failure(order, h, f"Step size h must be between {min_h} and {max_h}")
+
+        if not func_str and y_values is None:
+            return _failure(order, h, "Either func_str or y_values must be provided")
+
+        if accuracy is None:
+            accuracy = 2 if scheme == "central" else 1
+        try:
+            offsets, weights = (np.array(values) for values in stencil(scheme, order, accuracy))
+        except ValueError as e:
+            return _failure(order, h, str(e))
+
+        # Points with zero weight need not be evaluated or reported; on a
+        # non-uniform grid no local weight vanishes by symmetry
+        used = weights != 0
+        if nonuniform and not func_str:
+            used[:] = True
+        x = np.atleast_1d(np.asarray(x_values, dtype=float))
+        grid = x[:, None] + offsets[used] * h
+
+        if func_str:
+            # Every stencil point of every x in one array evaluation
+            f = compile_expression(func_str)
+            samples = np.broadcast_to(np.asarray(f(grid), dtype=float), grid.shape)
+            derivative = samples @ weights[used] / h**order
+            valid = np.ones(len(x), dtype=bool)
+        elif nonuniform:
+            # Local weights from the actual spacings around every point,
+            # all computed in one batched Fornberg recurrence
+            y = np.asarray(y_values, dtype=float)
+            if np.any(np.diff(x) <= 0):
+                return _failure(order, h, "x_values must be strictly increasing on a non-uniform grid")
+            rows = np.arange(-offsets[0], min(len(x), len(y)) - offsets[-1])
+            indices = rows[:, None] + offsets
+            with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+                local_weights = fornberg_weights(x[indices] - x[rows, None], order)
+            if not np.all(np.isfinite(local_weights)):
+                return _failure(order, h, "Non-uniform stencil weights are not finite; the spacing is too uneven")
+            derivative = np.full(len(x), np.nan)
+            derivative[rows] = (local_weights * y[indices]).sum(axis=1)
+            valid = np.zeros(len(x), dtype=bool)
+            valid[rows] = True
+            grid = np.full(grid.shape, np.nan)
+            grid[rows] = x[indices]
+            samples = np.full(grid.shape, np.nan)
+            samples[rows] = y[indices]
+        else:
+            # Stencil points are neighbouring samples: one correlation pass
+            # gives the derivative at every point whose stencil fits inside
+            # y_values; points near either end have none
+            y = np.asarray(y_values, dtype=float)
+            first = -offsets[0]
+            if len(y) >= len(weights):
+                interior = np.correlate(y, weights, mode="valid") / h**order
+            else:
+                interior = np.empty(0)
+            interior = interior[:max(len(x) - first, 0)]
+            derivative = np.full(len(x), np.nan)
+            derivative[first:first + len(interior)] = interior
+            valid = np.zeros(len(x), dtype=bool)
+            valid[first:first + len(interior)] = True
+            if not compact:
+                samples = np.full(grid.shape, np.nan)
+                rows = np.flatnonzero(valid)
+                samples[rows] = y[rows[:, None] + offsets[used]]
+
+        prefix = {1: "", 2: "second order "}.get(order, f"order {order} ")
+
+        if compact:
+            return {
+                "success": True,
+                "derivative": np.where(valid, derivative, None).tolist(),
+                "x": x.tolist(),
+                "order": order,
+                "accuracy": accuracy,
+                "h": float(h),
+                "points": [],
+                "message": f"Successfully computed {order}-order {scheme} finite differences"
+            }
+
+        results = []
+        for xi, di, ok, abscissae, values in zip(
+            x.tolist(), derivative.tolist(), valid.tolist(), grid.tolist(), samples.tolist()
+        ):
+            if ok:
+                results.append({
+                    "x": xi,
+                    "derivative": di,
+                    "points_used": [
+                        {"x": point, "f(x)": value} for point, value in zip(abscissae, values)
+                    ]
+                })
+            else:
+                results.append({
+                    "x": xi,
+                    "derivative": None,
+                    "error": f"Not enough points for {prefix}{scheme} difference"
+                })
+
+        return {
+            "success": True,
+            "derivative": results,
+            "order": order,
+            "accuracy": accuracy,
+            "h": float(h),
+            "points": results,
+            "message": f"Successfully computed {order}-order {scheme} finite differences"
+        }
+
+    except Exception as e:
+        return _failure(order, h if h else 0, f"Error: {str(e)}")
+
+
+def _failure(order: int, h: float, message: str) -> Dict:
+    """Return a failed finite difference result."""
+    return {
+        "success": False,
+        "derivative": None,
+        "order": order,
+        "h": h,
+        "points": [],
+        "message": message
+    }
@@ -0,0 +1,82 @@
+"""Iteration log retention policies shared by the iterative solvers."""
+from collections import deque
+from typing import Callable, Dict, List, Optional
+from config_loader import config
+
+
+# Supported policies:
+#   full    - keep every iteration with all details
+#   none    - keep nothing
+#   every:k - keep every k-th iteration
+#   last:N  - keep only the last N iterations (ring buffer)
+#   summary - keep only the iteration number and error of every iteration
+LOG_POLICIES = ("full", "none", "every", "last", "summary")
+
+
+class IterationLog:
+    """Collects per-iteration details according to a retention policy.
+
+    Details are passed as a callable so that expensive entries (such as a
+    copy of the solution vector) are only built for iterations that are kept.
+    """
+
+    def __init__(self, policy: Optional[str] = None):
+        """Initialize the log.
+
+        Args:
+            policy: Retention policy, e.g. "full", "none", "every:10",
+                "last:50" or "summary". Uses the iteration_log.policy config
+                value if not given; "every" and "last" without a count take
+                iteration_log.every / iteration_log.last from config.
+        """
+        if policy is None:
+            policy = config.get('iteration_log.policy', 'full')
+
+        name, _, count = str(policy).partition(':')
+        name = name.strip().lower()
+        if name not in LOG_POLICIES:
+            raise ValueError(
+                f"Unknown log policy '{policy}'. Use one of: full, none, every:k, last:N, summary"
+            )
+
+        if name in ("every", "last"):
+            if count:
+                count = int(count)
+            else:
+                count = int(config.get(f'iteration_log.{name}', 10 if name == "every" else 50))
+            if count < 1:
+                raise ValueError(f"Log policy '{name}' needs a positive count")
+        else:
+            count = None
+
+        self.policy = name
+        self.count = count
+        self._entries = deque(maxlen=count) if name == "last" else []
+
+    def record(self, iteration: int, error: float, details: Callable[[], Dict]):
+        """Record one iteration if the policy keeps it.
+
+        Args:
+            iteration: 1-based iteration number
+            error: Error estimate of this iteration
+            details: Callable returning the remaining fields of the entry
+        """
+        if self.policy == "none":
+            return
+        if self.policy == "summary":
+            self._entries.append({"iteration": iteration, "error": float(error)})
+            return
+        if self.policy == "every" and iteration % self.count != 0:
+            return
+
+        entry = {"iteration": iteration}
+        entry.update(details())
+        entry["error"] = float(error)
+        self._entries.append(entry)
+
+    def to_list(self) -> List[Dict]:
+        """Return the retained entries in iteration order."""
+        return list(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
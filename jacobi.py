@@ -1,27 +1,127 @@
 """Jacobi iterative method for solving systems of linear equations."""
 import numpy as np
-from typing import List, Dict, Tuple, Optional
+from collections import deque
+from typing import Any, Callable, List, Dict, Tuple, Optional
 from config_loader import config
+from iteration_log import IterationLog
+from linear_operators import LinearSystemError, as_operator, cached_value, prepare_linear_system
+from checkpoint import Checkpointer, system_fingerprint
+from operator_cache import CachedOperator, fingerprint, operator_cache
+from parallel_jacobi import ParallelSweep
+
+# Dense nested lists/arrays, CSRMatrix or a CSR dict
+MatrixLike = Any
+
+# A Jacobi sweep maps (x^(k), b) to x^(k+1)
+Sweep = Callable[[np.ndarray, np.ndarray], np.ndarray]
+
+# Working precisions: plain float64 or float32 sweeps, or float32 sweeps
+# inside a float64 iterative-refinement loop
+PRECISIONS = ("float64", "float32", "mixed")
+
+# Acceleration schemes layered on top of the sweep
+ACCELERATIONS = ("none", "chebyshev", "anderson")
 
 
 def jacobi_method(
-    A: List[List[float]], 
+    A: MatrixLike, 
     b: List[float], 
     x0: Optional[List[float]] = None,
     max_iterations: Optional[int] = None,
-    tolerance: Optional[float] = None
+    tolerance: Optional[float] = None,
+    engine: Optional[str] = None,
+    log_policy: Optional[str] = None,
+    relaxation_factor: Optional[float] = None,
+    divergence_check: Optional[bool] = None,
+    workers: Optional[int] = None,
+    use_cache: Optional[bool] = None,
+    warm_start: Optional[bool] = None,
+    precision: Optional[str] = None,
+    permute_rows: Optional[bool] = None,
+    acceleration: Optional[str] = None,
+    anderson_depth: Optional[int] = None,
+    measure_baseline: Optional[bool] = None,
+    checkpoint: Optional[bool] = None,
+    resume_token: Optional[str] = None
 ) -> Dict:
     """Solve a system of linear equations using the Jacobi iterative method.
     
     The Jacobi method solves Ax = b by iterating:
     x_i^(k+1) = (b_i - sum(A_ij * x_j^(k) for j != i)) / A_ii
     
+    With the default "vectorized" engine A is split once into its diagonal D
+    and off-diagonal part R, and every sweep is x^(k+1) = (b - R x^(k)) / D.
+    The "reference" engine keeps the element-wise double loop for checking.
+    The "parallel" engine splits the rows of a dense A across worker
+    processes that share A, b and x through shared memory (see
+    parallel_jacobi.ParallelSweep).
+    
+    A may be dense (nested lists or an array) or sparse in CSR form (a
+    CSRMatrix or a dict with "indptr", "indices" and "data"); sparse sweeps
+    cost O(nnz) and never allocate the dense matrix.
+    
+    b may also be an n x k block B, in which case A X = B is solved for all
+    k columns at once (see _jacobi_block).
+    
+    With the operator cache enabled, A is fingerprinted and the prepared
+    operator (off-diagonal part, diagonal, dominance verdict, spectral
+    estimate) is reused across calls with the same matrix; warm_start
+    additionally starts from the last solution computed for that matrix.
+    
+    A relaxation factor ω != 1 gives weighted Jacobi:
+    x^(k+1) = x^(k) + ω (x_J^(k+1) - x^(k)), where x_J is the plain Jacobi update.
+    
+    Sweeps are memory-bound, so precision="float32" stores A and the
+    iterate in single precision for roughly half the traffic, at the cost
+    of tolerances much below 1e-6 relative becoming unreachable.
+    precision="mixed" keeps the float32 sweeps but wraps them in a float64
+    iterative-refinement loop (see _mixed_refinement), so the solution is
+    accurate to float64 tolerances.
+    
+    If A is not strictly diagonally dominant but some reordering of its
+    rows is (see find_dominant_permutation), the system is solved with the
+    rows of A and b reordered; x is unaffected by the reordering. Strict
+    dominance guarantees convergence, so the reordering is only applied
+    when it achieves it.
+    
+    When ρ is close to 1 plain sweeps converge slowly. acceleration
+    "chebyshev" runs Chebyshev semi-iteration with the estimated ρ (see
+    _chebyshev_iteration) and "anderson" mixes the last anderson_depth
+    sweeps (see _anderson_iteration). Both need a single right-hand side.
+    
+    With checkpoint enabled the iterate is saved to an .npz file every
+    checkpoint.every sweeps and when the run stops unconverged, and the
+    result carries a resume_token. Passing that token back continues from
+    the saved iterate and iteration count. A caller-chosen token also
+    works: if no checkpoint exists for it yet, a new run is saved under
+    it, so the same request can be retried after a worker restart.
+    
     Args:
-        A: Coefficient matrix (n x n)
-        b: Right-hand side vector (n)
-        x0: Initial guess (if None, uses zero vector)
+        A: Coefficient matrix (n x n), dense or CSR
+        b: Right-hand side vector (n) or block of right-hand sides (n x k)
+        x0: Initial guess (if None, uses zero vector); n x k when b is a block
         max_iterations: Maximum number of iterations
         tolerance: Convergence tolerance
+        engine: Sweep engine, "vectorized", "reference" or "parallel"
+        log_policy: Iteration log retention policy (see iteration_log.IterationLog)
+        relaxation_factor: Weight ω in (0, 2) (uses jacobi.relaxation_factor config)
+        divergence_check: Run the spectral-radius pre-check and abort early on
+            divergence (uses jacobi.divergence_check config)
+        workers: Worker processes for the parallel engine (uses jacobi.workers
+            config; capped at parallel_jacobi.max_workers())
+        use_cache: Reuse prepared operators across calls (uses jacobi.cache.enabled config)
+        warm_start: Start from the cached last solution when x0 is None
+            (uses jacobi.cache.warm_start config)
+        precision: "float64", "float32" or "mixed" (uses jacobi.precision config)
+        permute_rows: Reorder rows to reach diagonal dominance (uses
+            jacobi.permute_rows config; dense and CSR storage only)
+        acceleration: "none", "chebyshev" or "anderson" (uses jacobi.acceleration config)
+        anderson_depth: History depth of Anderson mixing (uses jacobi.anderson_depth config)
+        measure_baseline: Also run unaccelerated sweeps to measure the speedup
+            instead of estimating it (uses jacobi.measure_baseline config)
+        checkpoint: Save periodic checkpoints (uses checkpoint.enabled config;
+            implied by resume_token)
+        resume_token: Token of the checkpoint to resume from or save under
         
     Returns:
         Dictionary containing:
@@ -29,103 +129,212 @@ def jacobi_method(
             - solution: Final solution vector
             - iterations: Number of iterations performed
             - error: Final error
-            - iteration_log: List of iteration details
+            - iteration_log: Iteration details retained by the log policy
             - message: Status message
+            - convergence_estimate: Estimated spectral radius, whether the
+              iteration is predicted to converge and the predicted number of
+              iterations (when divergence_check is enabled)
+            - divergence_detected: Whether the run was aborted as divergent
+            - warm_started: Whether x0 was taken from the operator cache
+            - precision: Working precision requested
+            - converged_precision: Precision the returned solution is accurate
+              to ("float64" or "float32"), None if it did not converge
+            - refinement_steps: Outer float64 corrections (mixed precision only)
+            - row_permutation: Row order p applied as A[p] x = b[p], or None
+            - acceleration: Scheme used, accelerated and unaccelerated
+              iteration counts, whether the latter was "estimated" or
+              "measured", and the speedup (when acceleration is not "none")
+            - resume_token: Token to resume the run from its checkpoint, None
+              if it converged (when checkpointing)
+            - resumed_from_iteration: Iteration the run resumed at (when resuming)
     """
     # Load configuration
     if max_iterations is None:
         max_iterations = config.get('jacobi.max_iterations', 100)
     if tolerance is None:
         tolerance = config.get('jacobi.tolerance', 1e-6)
+    if engine is None:
+        engine = config.get('jacobi.engine', 'vectorized')
+    if relaxation_factor is None:
+        relaxation_factor = config.get('jacobi.relaxation_factor', 1.0)
+    if divergence_check is None:
+        divergence_check = config.get('jacobi.divergence_check', True)
+    if use_cache is None:
+        use_cache = config.get('jacobi.cache.enabled', True)
+    if warm_start is None:
+        warm_start = config.get('jacobi.cache.warm_start', False)
+    if precision is None:
+        precision = config.get('jacobi.precision', 'float64')
+    if permute_rows is None:
+        permute_rows = config.get('jacobi.permute_rows', True)
+    if acceleration is None:
+        acceleration = config.get('jacobi.acceleration', 'none')
+    if anderson_depth is None:
+        anderson_depth = config.get('jacobi.anderson_depth', 5)
+    if measure_baseline is None:
+        measure_baseline = config.get('jacobi.measure_baseline', False)
+    if checkpoint is None:
+        checkpoint = config.get('checkpoint.enabled', False)
     
+    engine_sweep = None
     try:
-        # Convert to numpy arrays
-        A = np.array(A, dtype=float)
-        b = np.array(b, dtype=float)
-        n = len(b)
-        
-        # Validate input
-        if A.shape[0] != A.shape[1]:
+        if engine not in SWEEP_ENGINES:
             return {
                 "success": False,
                 "solution": None,
                 "iterations": 0,
                 "error": None,
                 "iteration_log": [],
-                "message": "Matrix A must be square"
+                "message": f"Unknown engine '{engine}'. Use one of: {', '.join(SWEEP_ENGINES)}"
             }
         
-        if A.shape[0] != n:
-            return {
-                "success": False,
-                "solution": None,
-                "iterations": 0,
-                "error": None,
-                "iteration_log": [],
-                "message": "Dimensions of A and b don't match"
-            }
+        # Reuse the prepared operator for a matrix seen before
+        entry = getattr(A, "cache_entry", None)
+        if entry is None and use_cache:
+            entry = operator_cache.lookup(A)
+        if entry is not None:
+            A = entry.operator
         
-        # Check for zero diagonal elements
-        if np.any(np.diag(A) == 0):
-            return {
-                "success": False,
-                "solution": None,
-                "iterations": 0,
-                "error": None,
-                "iteration_log": [],
-                "message": "Matrix has zero diagonal elements"
-            }
+        warm_started = False
+        if (warm_start and x0 is None and entry is not None
+                and entry.last_solution is not None
+                and entry.last_solution.shape == np.shape(b)):
+            x0 = entry.last_solution
+            warm_started = True
         
-        # Initialize solution vector
-        if x0 is None:
-            x = np.zeros(n)
-        else:
-            x = np.array(x0, dtype=float)
+        # Reorder rows towards diagonal dominance, before the zero-diagonal check.
+        # Only explicit storage can be permuted; checking dominance of a
+        # banded, stencil or callable operator would materialize it
+        permutation = None
+        if permute_rows:
+            A = as_operator(A)
+            if hasattr(A, "permute_rows") and np.shape(b)[:1] == A.shape[:1]:
+                reordering = cached_value(A, "dominant_reordering", lambda: _dominant_reordering(A))
+                if reordering is not None:
+                    permutation, A = reordering
+                    b = np.asarray(b, dtype=float)[permutation]
         
-        iteration_log = []
+        # Convert and validate input
+        A, b, x = prepare_linear_system(A, b, x0)
         
-        for iteration in range(max_iterations):
-            x_new = np.zeros(n)
-            
-            # Jacobi iteration
-            for i in range(n):
-                sum_val = 0.0
-                for j in range(n):
-                    if i != j:
-                        sum_val += A[i, j] * x[j]
-                x_new[i] = (b[i] - sum_val) / A[i, i]
-            
-            # Calculate error
-            error = np.linalg.norm(x_new - x, ord=np.inf)
-            
-            # Log iteration
-            iteration_log.append({
-                "iteration": iteration + 1,
-                "solution": x_new.tolist(),
-                "error": float(error)
-            })
-            
-            # Check convergence
-            if error < tolerance:
+        if not 0 < relaxation_factor < 2:
+            raise LinearSystemError("Relaxation factor must be between 0 and 2")
+        if precision not in PRECISIONS:
+            raise LinearSystemError(
+                f"Unknown precision '{precision}'. Use one of: {', '.join(PRECISIONS)}"
+            )
+        if precision == "mixed" and b.ndim != 1:
+            raise LinearSystemError("Mixed precision accepts a single right-hand side vector")
+        if acceleration not in ACCELERATIONS:
+            raise LinearSystemError(
+                f"Unknown acceleration '{acceleration}'. Use one of: {', '.join(ACCELERATIONS)}"
+            )
+        if acceleration != "none" and (b.ndim != 1 or precision == "mixed"):
+            raise LinearSystemError(
+                "Acceleration needs a single right-hand side vector and cannot be combined "
+                "with mixed precision"
+            )
+        if acceleration == "anderson" and int(anderson_depth) < 1:
+            raise LinearSystemError("Anderson depth must be at least 1")
+        
+        # Resume from (and keep writing) a checkpoint of the iterate
+        checkpointer = None
+        start_iteration = 0
+        if checkpoint or resume_token is not None:
+            if b.ndim != 1 or precision == "mixed" or acceleration != "none":
+                raise LinearSystemError(
+                    "Checkpointing supports single right-hand side runs without "
+                    "acceleration or mixed precision"
+                )
+            key = cached_value(A, "fingerprint", lambda: fingerprint(A))
+            checkpointer = Checkpointer("jacobi", system_fingerprint(key, b), resume_token)
+            state = checkpointer.load()
+            if state is not None:
+                x = state["x"].astype(float)
+                start_iteration = int(state["iteration"])
+        
+        # Sweeps run on a single-precision copy of A, kept with the cache entry
+        A_sweep, b_sweep = A, b
+        if precision != "float64":
+            A_sweep = cached_value(A, ("astype", "float32"), lambda: A.astype(np.float32))
+            b_sweep = b.astype(np.float32)
+            if precision == "float32":
+                x = x.astype(np.float32)
+        
+        if engine == "parallel":
+            engine_sweep = SWEEP_ENGINES[engine](A_sweep, workers)
+        else:
+            engine_sweep = SWEEP_ENGINES[engine](A_sweep)
+        sweep = engine_sweep
+        if relaxation_factor != 1.0:
+            sweep = _weighted(sweep, relaxation_factor)
+        iteration_log = IterationLog(log_policy)
+        
+        # Cheap spectral pre-check on the iteration matrix
+        estimate = None
+        if divergence_check or acceleration != "none":
+            estimate = _convergence_estimate(
+                A, sweep, b_sweep, x.astype(b_sweep.dtype), tolerance, relaxation_factor
+            )
+            if divergence_check and not estimate["predicted_to_converge"]:
                 return {
-                    "success": True,
-                    "solution": x_new.tolist(),
-                    "iterations": iteration + 1,
-                    "error": float(error),
-                    "iteration_log": iteration_log,
-                    "message": f"Converged after {iteration + 1} iterations"
+                    "success": False,
+                    "solution": x.tolist(),
+                    "iterations": 0,
+                    "error": None,
+                    "iteration_log": [],
+                    "message": (
+                        "Predicted divergence: estimated spectral radius "
+                        f"{estimate['spectral_radius']:.4g} >= 1"
+                    ),
+                    "convergence_estimate": estimate,
+                    "divergence_detected": True
                 }
-            
-            x = x_new
         
-        # Did not converge
+        if precision == "mixed":
+            result = _mixed_refinement(
+                A, sweep, b, x, max_iterations, tolerance, iteration_log,
+                config.get('jacobi.mixed_inner_tolerance', 1e-4)
+            )
+        elif b.ndim == 2:
+            result = _jacobi_block(sweep, b_sweep, x, max_iterations, tolerance, iteration_log)
+        elif acceleration != "none":
+            result = _accelerated(
+                acceleration, sweep, b_sweep, x, max_iterations, tolerance, iteration_log,
+                estimate, int(anderson_depth), measure_baseline
+            )
+        else:
+            window = config.get('jacobi.divergence_window', 5) if divergence_check else 0
+            result = _jacobi_single(
+                sweep, b_sweep, x, max_iterations, tolerance, iteration_log, window,
+                start_iteration, checkpointer
+            )
+        
+        if estimate is not None:
+            result["convergence_estimate"] = estimate
+        result.setdefault("divergence_detected", False)
+        result["warm_started"] = warm_started
+        result["precision"] = precision
+        result["converged_precision"] = None
+        if result["success"]:
+            result["converged_precision"] = "float32" if precision == "float32" else "float64"
+        result["row_permutation"] = None if permutation is None else permutation.tolist()
+        if checkpointer is not None:
+            result["resume_token"] = checkpointer.token if checkpointer.saved else None
+            if start_iteration:
+                result["resumed_from_iteration"] = start_iteration
+        if entry is not None:
+            entry.last_solution = np.array(result["solution"])
+        return result
+    
+    except LinearSystemError as e:
         return {
             "success": False,
-            "solution": x.tolist(),
-            "iterations": max_iterations,
-            "error": float(error),
-            "iteration_log": iteration_log,
-            "message": f"Did not converge after {max_iterations} iterations"
+            "solution": None,
+            "iterations": 0,
+            "error": None,
+            "iteration_log": [],
+            "message": str(e)
         }
     
     except Exception as e:
@@ -137,32 +346,807 @@ def jacobi_method(
             "iteration_log": [],
             "message": f"Error: {str(e)}"
         }
+    
+    finally:
+        # The parallel engine owns worker processes and shared memory
+        if hasattr(engine_sweep, "close"):
+            engine_sweep.close()
+
+
+def _jacobi_single(
+    sweep: Sweep,
+    b: np.ndarray,
+    x: np.ndarray,
+    max_iterations: int,
+    tolerance: float,
+    iteration_log: IterationLog,
+    divergence_window: int,
+    start_iteration: int = 0,
+    checkpointer: Optional[Checkpointer] = None
+) -> Dict:
+    """Run Jacobi sweeps for a single right-hand side vector.
+    
+    If divergence_window > 0 the run is aborted as soon as the error has
+    grown on that many consecutive sweeps and exceeds the first sweep's
+    error, or becomes non-finite, instead of running all max_iterations.
+    Growth is measured against the error two sweeps earlier so that the
+    period-2 oscillation of a ±ρ eigenvalue pair still counts as growth.
+    
+    A resumed run counts on from start_iteration. With a checkpointer the
+    iterate is saved periodically and when the run stops unconverged.
+    """
+    first_error = None
+    recent_errors = deque(maxlen=3)
+    growth_streak = 0
+    end_iteration = start_iteration + max_iterations
+    
+    for iteration in range(start_iteration, end_iteration):
+        # Jacobi iteration
+        x_new = sweep(x, b)
+        
+        # Calculate error
+        error = np.linalg.norm(x_new - x, ord=np.inf)
+        
+        # Log iteration
+        iteration_log.record(iteration + 1, error, lambda: {"solution": x_new.tolist()})
+        
+        # Check convergence
+        if error < tolerance:
+            if checkpointer is not None:
+                checkpointer.discard()
+            return {
+                "success": True,
+                "solution": x_new.tolist(),
+                "iterations": iteration + 1,
+                "error": float(error),
+                "iteration_log": iteration_log.to_list(),
+                "message": f"Converged after {iteration + 1} iterations"
+            }
+        
+        # Monitor for geometric error growth
+        if divergence_window:
+            if first_error is None:
+                first_error = error
+            recent_errors.append(error)
+            if len(recent_errors) == 3:
+                growth_streak = growth_streak + 1 if error > recent_errors[0] else 0
+            if not np.isfinite(error) or (
+                growth_streak >= divergence_window and error > first_error
+            ):
+                return {
+                    "success": False,
+                    "solution": x.tolist(),
+                    "iterations": iteration + 1,
+                    "error": float(error),
+                    "iteration_log": iteration_log.to_list(),
+                    "message": (
+                        f"Diverging: error grew on {growth_streak} consecutive "
+                        f"iterations, aborted after {iteration + 1} iterations"
+                    ),
+                    "divergence_detected": True
+                }
+        
+        x = x_new
+        if checkpointer is not None:
+            checkpointer.periodic(iteration + 1, x=x)
+    
+    # Did not converge
+    if checkpointer is not None:
+        checkpointer.save(end_iteration, x=x)
+    return {
+        "success": False,
+        "solution": x.tolist(),
+        "iterations": end_iteration,
+        "error": float(error),
+        "iteration_log": iteration_log.to_list(),
+        "message": f"Did not converge after {end_iteration} iterations"
+    }
+
+
+def _jacobi_block(
+    sweep: Sweep,
+    B: np.ndarray,
+    X: np.ndarray,
+    max_iterations: int,
+    tolerance: float,
+    iteration_log: IterationLog
+) -> Dict:
+    """Run Jacobi sweeps for every column of an n x k right-hand side block.
+    
+    All active columns are updated together as one matrix-matrix sweep.
+    Convergence is tracked per column, and a column that has converged is
+    frozen: it is dropped from later sweeps so it stops costing work.
+    
+    Args:
+        sweep: Jacobi sweep built by one of SWEEP_ENGINES
+        B: Right-hand side block (n x k)
+        X: Initial guess block (n x k)
+        max_iterations: Maximum number of iterations
+        tolerance: Convergence tolerance per column
+        iteration_log: Log that receives one entry per sweep
+        
+    Returns:
+        Result dictionary as for jacobi_method, with the solution as an
+        n x k block plus per-column iterations, errors and convergence flags
+    """
+    k = B.shape[1]
+    active = np.arange(k)
+    column_iterations = np.full(k, max_iterations)
+    column_errors = np.full(k, np.inf)
+    iterations = 0
+    
+    for iteration in range(max_iterations):
+        if len(active) == 0:
+            break
+        iterations = iteration + 1
+        
+        X_new = sweep(X[:, active], B[:, active])
+        errors = np.abs(X_new - X[:, active]).max(axis=0)
+        X[:, active] = X_new
+        column_errors[active] = errors
+        
+        iteration_log.record(iteration + 1, errors.max(), lambda: {"active_columns": int(len(active))})
+        
+        # Freeze the columns that converged on this sweep
+        done = errors < tolerance
+        column_iterations[active[done]] = iteration + 1
+        active = active[~done]
+    
+    converged = ~np.isin(np.arange(k), active)
+    n_converged = int(converged.sum())
+    error = float(column_errors.max()) if k else 0.0
+    
+    if n_converged == k:
+        message = f"All {k} columns converged after {int(column_iterations.max(initial=0))} iterations"
+    else:
+        message = f"{n_converged} of {k} columns converged within {max_iterations} iterations"
+    
+    return {
+        "success": n_converged == k,
+        "solution": X.tolist(),
+        "iterations": iterations,
+        "error": error,
+        "iteration_log": iteration_log.to_list(),
+        "message": message,
+        "column_iterations": column_iterations.tolist(),
+        "column_errors": column_errors.tolist(),
+        "column_converged": converged.tolist()
+    }
+
+
+def _mixed_refinement(
+    A,
+    sweep: Sweep,
+    b: np.ndarray,
+    x: np.ndarray,
+    max_iterations: int,
+    tolerance: float,
+    iteration_log: IterationLog,
+    inner_tolerance: float
+) -> Dict:
+    """Solve A x = b by float64 iterative refinement around float32 sweeps.
+    
+    Each outer step computes the residual r = b - A x in float64, solves
+    the correction equation A d = r with float32 sweeps until a sweep step
+    is below inner_tolerance relative to |d|, and updates x += d in float64.
+    The float32 rounding only affects d, whose size shrinks every step, so
+    x reaches float64 accuracy. The run has converged once a correction is
+    below tolerance, the same step-size criterion as plain Jacobi; sweeps
+    across all corrections count against max_iterations.
+    
+    Args:
+        A: Float64 operator used for the residuals
+        sweep: Jacobi sweep on the float32 copy of A
+        b: Right-hand side vector (float64)
+        x: Initial guess (float64)
+        max_iterations: Maximum number of float32 sweeps in total
+        tolerance: Convergence tolerance on the correction size
+        iteration_log: Log that receives one entry per refinement step
+        inner_tolerance: Relative step size that ends an inner solve
+        
+    Returns:
+        Result dictionary as for jacobi_method, plus refinement_steps
+    """
+    sweeps = 0
+    refinement_steps = 0
+    error = float("inf")
+    
+    while sweeps < max_iterations:
+        r = (b - A.matvec(x)).astype(np.float32)
+        d = np.zeros_like(r)
+        while sweeps < max_iterations:
+            d_new = sweep(d, r)
+            sweeps += 1
+            step = np.linalg.norm(d_new - d, ord=np.inf)
+            d = d_new
+            inner_done = step < tolerance or step <= inner_tolerance * np.linalg.norm(d, ord=np.inf)
+            if inner_done or not np.isfinite(step):
+                break
+        
+        x = x + d.astype(np.float64)
+        refinement_steps += 1
+        error = np.linalg.norm(d, ord=np.inf)
+        
+        # Log refinement step
+        iteration_log.record(sweeps, error, lambda: {"solution": x.tolist(), "refinement": refinement_steps})
+        
+        # Check convergence
+        if error < tolerance:
+            return {
+                "success": True,
+                "solution": x.tolist(),
+                "iterations": sweeps,
+                "error": float(error),
+                "iteration_log": iteration_log.to_list(),
+                "message": (
+                    f"Converged after {sweeps} iterations "
+                    f"({refinement_steps} refinement steps)"
+                ),
+                "refinement_steps": refinement_steps
+            }
+        if not np.isfinite(error):
+            break
+    
+    # Did not converge
+    return {
+        "success": False,
+        "solution": x.tolist(),
+        "iterations": sweeps,
+        "error": float(error),
+        "iteration_log": iteration_log.to_list(),
+        "message": f"Did not converge after {sweeps} iterations",
+        "refinement_steps": refinement_steps
+    }
+
+
+def _accelerated(
+    acceleration: str,
+    sweep: Sweep,
+    b: np.ndarray,
+    x: np.ndarray,
+    max_iterations: int,
+    tolerance: float,
+    iteration_log: IterationLog,
+    estimate: Dict,
+    anderson_depth: int,
+    measure_baseline: bool
+) -> Dict:
+    """Run an accelerated iteration and compare it against plain sweeps.
+    
+    The unaccelerated iteration count is the spectral prediction from
+    estimate, or, with measure_baseline, the count of an actual plain run
+    from the same starting guess (None if that run does not converge).
+    """
+    if acceleration == "chebyshev":
+        rho = estimate["spectral_radius"]
+        if not rho < 1.0:
+            raise LinearSystemError(
+                f"Chebyshev acceleration needs a spectral radius below 1 (estimated {rho:.4g})"
+            )
+        result = _chebyshev_iteration(sweep, b, x.copy(), max_iterations, tolerance, iteration_log, rho)
+    else:
+        result = _anderson_iteration(
+            sweep, b, x.copy(), max_iterations, tolerance, iteration_log, anderson_depth
+        )
+    
+    if measure_baseline:
+        baseline = _jacobi_single(sweep, b, x, max_iterations, tolerance, IterationLog("none"), 0)
+        unaccelerated = baseline["iterations"] if baseline["success"] else None
+    else:
+        unaccelerated = estimate["predicted_iterations"]
+    
+    speedup = None
+    if result["success"] and unaccelerated is not None:
+        speedup = unaccelerated / max(result["iterations"], 1)
+    result["acceleration"] = {
+        "method": acceleration,
+        "iterations": result["iterations"],
+        "unaccelerated_iterations": unaccelerated,
+        "baseline": "measured" if measure_baseline else "estimated",
+        "speedup": speedup
+    }
+    return result
+
+
+def _chebyshev_iteration(
+    sweep: Sweep,
+    b: np.ndarray,
+    x: np.ndarray,
+    max_iterations: int,
+    tolerance: float,
+    iteration_log: IterationLog,
+    rho: float
+) -> Dict:
+    """Chebyshev semi-iteration on top of the Jacobi sweep.
+    
+    For an iteration matrix with real eigenvalues in [-ρ, ρ] (e.g. A
+    symmetric positive definite), the three-term recurrence
+        x^(k+1) = x^(k-1) + ω_(k+1) (sweep(x^(k)) - x^(k-1))
+        ω_1 = 1,  ω_2 = 2 / (2 - ρ²),  ω_(k+1) = 1 / (1 - ρ² ω_k / 4)
+    is the optimal polynomial acceleration: the error falls by about
+    ρ / (1 + sqrt(1 - ρ²)) per sweep instead of ρ. Underestimating ρ
+    costs robustness, so ρ should come from enough power-iteration steps.
+    """
+    x_prev = x
+    omega = 1.0
+    error = float("inf")
+    
+    for iteration in range(max_iterations):
+        if iteration == 1:
+            omega = 2.0 / (2.0 - rho ** 2)
+        elif iteration > 1:
+            omega = 1.0 / (1.0 - rho ** 2 * omega / 4.0)
+        x_new = x_prev + omega * (sweep(x, b) - x_prev)
+        
+        # Calculate error
+        error = np.linalg.norm(x_new - x, ord=np.inf)
+        
+        # Log iteration
+        iteration_log.record(iteration + 1, error, lambda: {"solution": x_new.tolist()})
+        
+        # Check convergence
+        if error < tolerance:
+            return {
+                "success": True,
+                "solution": x_new.tolist(),
+                "iterations": iteration + 1,
+                "error": float(error),
+                "iteration_log": iteration_log.to_list(),
+                "message": f"Converged after {iteration + 1} iterations (Chebyshev acceleration)"
+            }
+        if not np.isfinite(error):
+            return _not_converged(x, iteration + 1, error, iteration_log)
+        
+        x_prev, x = x, x_new
+    
+    return _not_converged(x, max_iterations, error, iteration_log)
+
+
+def _anderson_iteration(
+    sweep: Sweep,
+    b: np.ndarray,
+    x: np.ndarray,
+    max_iterations: int,
+    tolerance: float,
+    iteration_log: IterationLog,
+    depth: int
+) -> Dict:
+    """Anderson mixing of the last `depth` Jacobi sweeps.
+    
+    With g_k = sweep(x_k) and residual f_k = g_k - x_k, the next iterate
+    is x_(k+1) = g_k - ΔG γ, where γ minimizes ||f_k - ΔF γ|| over the
+    differences ΔF, ΔG of the last depth residuals and sweeps. It needs
+    no spectral information and also works for non-symmetric A. The error
+    is ||f_k||, the step a plain sweep would take, as for plain Jacobi.
+    """
+    delta_f = deque(maxlen=depth)
+    delta_g = deque(maxlen=depth)
+    f_prev = g_prev = None
+    error = float("inf")
+    
+    for iteration in range(max_iterations):
+        g = sweep(x, b)
+        f = g - x
+        
+        # Calculate error
+        error = np.linalg.norm(f, ord=np.inf)
+        
+        # Log iteration
+        iteration_log.record(iteration + 1, error, lambda: {"solution": g.tolist()})
+        
+        # Check convergence
+        if error < tolerance:
+            return {
+                "success": True,
+                "solution": g.tolist(),
+                "iterations": iteration + 1,
+                "error": float(error),
+                "iteration_log": iteration_log.to_list(),
+                "message": f"Converged after {iteration + 1} iterations (Anderson acceleration)"
+            }
+        if not np.isfinite(error):
+            return _not_converged(x, iteration + 1, error, iteration_log)
+        
+        if f_prev is not None:
+            delta_f.append(f - f_prev)
+            delta_g.append(g - g_prev)
+        f_prev, g_prev = f, g
+        
+        if delta_f:
+            gamma = np.linalg.lstsq(np.column_stack(delta_f), f, rcond=None)[0]
+            x = g - np.column_stack(delta_g) @ gamma
+        else:
+            x = g
+    
+    return _not_converged(x, max_iterations, error, iteration_log)
+
+
+def _not_converged(x: np.ndarray, iterations: int, error: float, iteration_log: IterationLog) -> Dict:
+    """Result of an accelerated run that stopped without converging."""
+    return {
+        "success": False,
+        "solution": x.tolist(),
+        "iterations": iterations,
+        "error": float(error),
+        "iteration_log": iteration_log.to_list(),
+        "message": f"Did not converge after {iterations} iterations"
+    }
+
+
+def _vectorized_sweep(A) -> Sweep:
+    """Build a Jacobi sweep that runs as whole-array operations.
+    
+    The diagonal of A is extracted once here, so each sweep costs one
+    off-diagonal product (O(n²) dense, O(nnz) sparse) and one division.
+    The same sweep handles a vector or an n x k block of iterates.
+    """
+    D = cached_value(A, "diagonal", A.diagonal)
+    
+    def sweep(x: np.ndarray, b: np.ndarray) -> np.ndarray:
+        if x.ndim == 2:
+            return (b - A.offdiag_matvec(x)) / D[:, None]
+        return (b - A.offdiag_matvec(x)) / D
+    
+    return sweep
 
 
-def check_diagonal_dominance(A: List[List[float]]) -> Tuple[bool, str]:
+def estimate_spectral_radius(
+    A: MatrixLike,
+    steps: Optional[int] = None,
+    relaxation_factor: float = 1.0
+) -> float:
+    """Estimate the spectral radius of the (weighted) Jacobi iteration matrix.
+    
+    Runs a few power-iteration steps on M = (1 - ω) I - ω D⁻¹R. Jacobi
+    converges for every starting guess if and only if ρ(M) < 1. The estimate
+    is the average growth rate over the second half of the steps, which is
+    robust to the oscillation caused by complex or ±ρ eigenvalue pairs.
+    
+    Args:
+        A: Coefficient matrix, dense or CSR
+        steps: Number of power-iteration steps (uses jacobi.spectral_steps config)
+        relaxation_factor: Weight ω of weighted Jacobi
+        
+    Returns:
+        Estimated spectral radius ρ(M)
+    """
+    if steps is None:
+        steps = config.get('jacobi.spectral_steps', 20)
+    A = as_operator(A)
+    D = A.diagonal()
+    omega = relaxation_factor
+    
+    v = np.random.default_rng(0).uniform(-1.0, 1.0, A.shape[0])
+    v /= np.linalg.norm(v)
+    log_growth = []
+    for _ in range(max(int(steps), 2)):
+        v = (1.0 - omega) * v - omega * A.offdiag_matvec(v) / D
+        norm = np.linalg.norm(v)
+        if norm == 0 or not np.isfinite(norm):
+            return 0.0 if norm == 0 else float("inf")
+        log_growth.append(np.log(norm))
+        v /= norm
+    
+    tail = log_growth[len(log_growth) // 2:]
+    return float(np.exp(np.mean(tail)))
+
+
+def _convergence_estimate(
+    A,
+    sweep: Sweep,
+    b: np.ndarray,
+    x: np.ndarray,
+    tolerance: float,
+    relaxation_factor: float
+) -> Dict:
+    """Predict whether Jacobi converges and roughly how many sweeps it needs.
+    
+    The first step size d1 = ||x1 - x0|| shrinks by about ρ per sweep, so
+    the tolerance is reached after about 1 + log(tol / d1) / log(ρ) sweeps.
+    """
+    steps = config.get('jacobi.spectral_steps', 20)
+    rho = cached_value(
+        A, ("spectral_radius", relaxation_factor, steps),
+        lambda: estimate_spectral_radius(A, steps, relaxation_factor)
+    )
+    converges = rho < 1.0
+    predicted = None
+    if converges:
+        d1 = float(np.max(np.abs(sweep(x, b) - x))) if x.size else 0.0
+        if d1 < tolerance or rho == 0.0:
+            predicted = 1
+        else:
+            predicted = 1 + int(np.ceil(np.log(tolerance / d1) / np.log(rho)))
+    return {
+        "spectral_radius": rho,
+        "predicted_to_converge": converges,
+        "predicted_iterations": predicted
+    }
+
+
+def _weighted(sweep: Sweep, omega: float) -> Sweep:
+    """Wrap a Jacobi sweep as weighted Jacobi with relaxation factor omega."""
+    
+    def weighted_sweep(x: np.ndarray, b: np.ndarray) -> np.ndarray:
+        return x + omega * (sweep(x, b) - x)
+    
+    return weighted_sweep
+
+
+def _reference_sweep(A) -> Sweep:
+    """Build a Jacobi sweep using the element-wise double loop.
+    
+    Kept as a reference implementation to cross-check the vectorized engine.
+    """
+    A = A.to_dense()
+    n = A.shape[0]
+    
+    def sweep(x: np.ndarray, b: np.ndarray) -> np.ndarray:
+        if x.ndim == 2:
+            return np.column_stack([sweep(x[:, j], b[:, j]) for j in range(x.shape[1])])
+        x_new = np.zeros(n, dtype=x.dtype)
+        for i in range(n):
+            sum_val = 0.0
+            for j in range(n):
+                if i != j:
+                    sum_val += A[i, j] * x[j]
+            x_new[i] = (b[i] - sum_val) / A[i, i]
+        return x_new
+    
+    return sweep
+
+
+# Available Jacobi sweep engines
+SWEEP_ENGINES = {
+    "vectorized": _vectorized_sweep,
+    "reference": _reference_sweep,
+    "parallel": ParallelSweep,
+}
+
+
+def check_diagonal_dominance(A: MatrixLike) -> Tuple[bool, str]:
     """Check if matrix is diagonally dominant.
     
     A matrix is strictly diagonally dominant if:
     |A_ii| > sum(|A_ij| for j != i) for all i
     
     Args:
-        A: Coefficient matrix
+        A: Coefficient matrix, dense or CSR
         
     Returns:
         Tuple of (is_dominant, message)
     """
+    report = diagonal_dominance_report(A)
+    return report["is_dominant"], report["message"]
+
+
+def diagonal_dominance_report(A: MatrixLike) -> Dict:
+    """Check strict diagonal dominance of every row in one vectorized pass.
+    
+    The margin of row i is |A_ii| - sum(|A_ij| for j != i); the row is
+    strictly dominant if its margin is positive.
+    
+    Args:
+        A: Coefficient matrix, dense or CSR
+        
+    Returns:
+        Dictionary containing:
+            - is_dominant: Whether every row is strictly dominant
+            - failing_rows: 1-based indices of the rows that are not
+            - margins: Margin of each failing row (<= 0)
+            - message: Status message
+    """
+    try:
+        A = as_operator(A)
+        return cached_value(A, "diagonal_dominance", lambda: _diagonal_dominance(A))
+    
+    except Exception as e:
+        return {
+            "is_dominant": False,
+            "failing_rows": [],
+            "margins": [],
+            "message": f"Error checking diagonal dominance: {str(e)}"
+        }
+
+
+def _diagonal_dominance(A) -> Dict:
+    """Vectorized strict diagonal dominance check on an operator."""
+    diagonal = np.abs(A.diagonal())
+    row_sums = A.offdiag_abs_row_sums()
+    
+    failing = np.nonzero(diagonal <= row_sums)[0]
+    if len(failing):
+        shown = [
+            f"Row {i+1} fails diagonal dominance: |{diagonal[i]}| <= {row_sums[i]}"
+            for i in failing[:5]
+        ]
+        if len(failing) > 5:
+            shown.append(f"and {len(failing) - 5} more rows")
+        message = "; ".join(shown)
+    else:
+        message = "Matrix is strictly diagonally dominant"
+    
+    return {
+        "is_dominant": len(failing) == 0,
+        "failing_rows": (failing + 1).tolist(),
+        "margins": (diagonal[failing] - row_sums[failing]).tolist(),
+        "message": message
+    }
+
+
+def find_dominant_permutation(A: MatrixLike) -> Optional[np.ndarray]:
+    """Find a row order that makes A strictly diagonally dominant.
+    
+    Row i can only be strictly dominant in the position of its largest
+    entry, since |A_ij| > sum(|A_ik| for k != j) requires A_ij to beat
+    every other entry. So the assignment of rows to diagonal positions is
+    forced: a dominant order exists exactly when every row satisfies
+    2 max|A_ij| > sum|A_ij| and the columns of the row maxima are all
+    distinct. The search is one O(nnz) pass.
+    
+    Args:
+        A: Coefficient matrix, dense or CSR
+        
+    Returns:
+        Permutation p such that A[p] is strictly diagonally dominant, or
+        None if no row order is (or A is matrix-free)
+    """
+    A = as_operator(A)
+    n = A.shape[0]
+    if A.format == "dense":
+        magnitudes = np.abs(A.A)
+        columns = magnitudes.argmax(axis=1)
+        peaks = magnitudes[np.arange(n), columns]
+        totals = magnitudes.sum(axis=1)
+    elif A.format == "csr":
+        lengths = np.diff(A.indptr)
+        if np.any(lengths == 0):
+            return None
+        magnitudes = np.abs(A.data)
+        rows = np.repeat(np.arange(n), lengths)
+        # Sort each row's entries by decreasing magnitude; the first is the peak
+        first = np.lexsort((-magnitudes, rows))[A.indptr[:-1]]
+        columns = A.indices[first]
+        peaks = magnitudes[first]
+        totals = np.bincount(rows, weights=magnitudes, minlength=n)
+    else:
+        return None
+    
+    if A.shape[1] != n or not np.all(2 * peaks > totals):
+        return None
+    permutation = np.full(n, -1)
+    permutation[columns] = np.arange(n)
+    if np.any(permutation < 0):
+        return None
+    return permutation
+
+
+def _dominant_reordering(A):
+    """Return (permutation, permuted operator) for a non-dominant A, or None.
+    
+    The permuted operator gets its own cache entry when A is cached, so its
+    derived values are memoized along with it.
+    """
+    if diagonal_dominance_report(A)["is_dominant"]:
+        return None
+    permutation = find_dominant_permutation(A)
+    if permutation is None:
+        return None
+    permuted = A.permute_rows(permutation)
+    if getattr(A, "cache_entry", None) is not None:
+        permuted.cache_entry = CachedOperator(None, permuted)
+    return permutation, permuted
+
+
+def jacobi_batch(
+    A: List[List[List[float]]],
+    b: List[List[float]],
+    x0: Optional[List[List[float]]] = None,
+    max_iterations: Optional[int] = None,
+    tolerance: Optional[float] = None
+) -> Dict:
+    """Solve many small independent systems A_s x_s = b_s with Jacobi at once.
+    
+    All m systems share one vectorized sweep over the stacked (m, n, n)
+    matrices, so the per-call overhead is paid once per batch rather than
+    once per system. Systems are dropped from the active set as soon as
+    they converge, and systems with a zero diagonal element are skipped.
+    
+    Args:
+        A: Stacked coefficient matrices (m x n x n)
+        b: Stacked right-hand side vectors (m x n)
+        x0: Stacked initial guesses (m x n) (if None, uses zeros)
+        max_iterations: Maximum number of iterations
+        tolerance: Convergence tolerance, applied to every system
+        
+    Returns:
+        Dictionary containing:
+            - success: Whether every system converged
+            - solutions: Final solution vectors (m x n)
+            - iterations: Iterations performed per system (m)
+            - errors: Final error per system (m)
+            - converged: Convergence flag per system (m)
+            - status: "converged", "max_iterations" or "zero_diagonal" per system (m)
+            - message: Status message
+    """
+    # Load configuration
+    if max_iterations is None:
+        max_iterations = config.get('jacobi.max_iterations', 100)
+    if tolerance is None:
+        tolerance = config.get('jacobi.tolerance', 1e-6)
+    
     try:
         A = np.array(A, dtype=float)
-        n = A.shape[0]
+        b = np.array(b, dtype=float)
         
-        for i in range(n):
-            diagonal = abs(A[i, i])
-            row_sum = sum(abs(A[i, j]) for j in range(n) if j != i)
+        if A.ndim != 3 or A.shape[1] != A.shape[2]:
+            raise LinearSystemError("A must be a stack of square matrices with shape (m, n, n)")
+        if b.shape != A.shape[:2]:
+            raise LinearSystemError("b must have shape (m, n) matching A")
+        
+        m, n = b.shape
+        X = np.zeros((m, n)) if x0 is None else np.array(x0, dtype=float)
+        if X.shape != b.shape:
+            raise LinearSystemError("Initial guesses must have the same shape as b")
+        
+        D = np.diagonal(A, axis1=1, axis2=2).copy()
+        R = A.copy()
+        R[:, np.arange(n), np.arange(n)] = 0.0
+        
+        valid = np.all(D != 0, axis=1)
+        iterations = np.zeros(m, dtype=int)
+        errors = np.full(m, np.nan)
+        converged = np.zeros(m, dtype=bool)
+        active = np.nonzero(valid)[0]
+        
+        for iteration in range(max_iterations):
+            if len(active) == 0:
+                break
+            
+            X_active = X[active]
+            X_new = (b[active] - np.matmul(R[active], X_active[:, :, None])[:, :, 0]) / D[active]
+            step = np.abs(X_new - X_active).max(axis=1) if n else np.zeros(len(active))
+            
+            X[active] = X_new
+            errors[active] = step
+            iterations[active] = iteration + 1
             
-            if diagonal <= row_sum:
-                return False, f"Row {i+1} fails diagonal dominance: |{A[i,i]}| <= {row_sum}"
+            # Mask out the systems that converged on this sweep
+            done = step < tolerance
+            converged[active[done]] = True
+            active = active[~done]
         
-        return True, "Matrix is strictly diagonally dominant"
+        status = np.where(converged, "converged", np.where(valid, "max_iterations", "zero_diagonal"))
+        n_converged = int(converged.sum())
+        
+        return {
+            "success": n_converged == m,
+            "solutions": X.tolist(),
+            "iterations": iterations.tolist(),
+            "errors": [None if np.isnan(e) else float(e) for e in errors],
+            "converged": converged.tolist(),
+            "status": status.tolist(),
+            "message": f"{n_converged} of {m} systems converged"
+        }
+    
+    except LinearSystemError as e:
+        return {
+            "success": False,
+            "solutions": None,
+            "iterations": None,
+            "errors": None,
+            "converged": None,
+            "status": None,
+            "message": str(e)
+        }
     
     except Exception as e:
-        return False, f"Error checking diagonal dominance: {str(e)}"
+        return {
+            "success": False,
+            "solutions": None,
+            "iterations": None,
+            "errors": None,
+            "converged": None,
+            "status": None,
+            "message": f"Error: {str(e)}"
+        }
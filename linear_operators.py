@@ -0,0 +1,550 @@
+"""Linear operator storage formats shared by the iterative linear solvers."""
+import numpy as np
+from typing import Any, Callable, Optional, Sequence
+
+# Value dtypes the operators can store and compute in
+DTypeLike = Any
+
+
+class DenseOperator:
+    """Dense n x n coefficient matrix.
+
+    The off-diagonal part R = A - diag(A) is split off once, on first use,
+    so Jacobi-type sweeps only need a single matrix product per iteration.
+    """
+
+    format = "dense"
+
+    def __init__(self, A: Any, dtype: DTypeLike = float):
+        """Initialize the operator.
+
+        Args:
+            A: Coefficient matrix as nested lists or a 2D array
+            dtype: Value dtype to store and compute in
+        """
+        self.A = np.array(A, dtype=dtype)
+        if self.A.ndim != 2:
+            raise ValueError("Matrix A must be two-dimensional")
+        self.shape = self.A.shape
+        self.dtype = self.A.dtype
+        self._offdiag = None
+
+    def astype(self, dtype: DTypeLike) -> "DenseOperator":
+        """Return the operator with its values stored in dtype."""
+        if np.dtype(dtype) == self.dtype:
+            return self
+        return DenseOperator(self.A, dtype)
+
+    def permute_rows(self, permutation: Sequence[int]) -> "DenseOperator":
+        """Return the operator whose row k is row permutation[k] of this one."""
+        return DenseOperator(self.A[np.asarray(permutation)], self.dtype)
+
+    def diagonal(self) -> np.ndarray:
+        """Return the main diagonal as a vector."""
+        return np.diag(self.A).copy()
+
+    def matvec(self, x: np.ndarray) -> np.ndarray:
+        """Return A @ x for a vector or an (n, k) block."""
+        return self.A @ x
+
+    def offdiag_matvec(self, x: np.ndarray) -> np.ndarray:
+        """Return R @ x where R is A with its diagonal zeroed."""
+        if self._offdiag is None:
+            self._offdiag = self.A.copy()
+            np.fill_diagonal(self._offdiag, 0.0)
+        return self._offdiag @ x
+
+    def offdiag_abs_row_sums(self) -> np.ndarray:
+        """Return sum(|A_ij| for j != i) for every row."""
+        return np.abs(self.A).sum(axis=1) - np.abs(np.diag(self.A))
+
+    def to_dense(self) -> np.ndarray:
+        """Return the operator as a dense array."""
+        return self.A
+
+
+class CSRMatrix:
+    """Square matrix in compressed sparse row (CSR) form.
+
+    Row i holds the entries data[indptr[i]:indptr[i+1]] in the columns
+    indices[indptr[i]:indptr[i+1]]. Products, the diagonal and the
+    dominance sums all cost O(nnz); no dense matrix is ever allocated.
+    """
+
+    format = "csr"
+
+    def __init__(
+        self,
+        indptr: Sequence[int],
+        indices: Sequence[int],
+        data: Sequence[float],
+        shape: Optional[Sequence[int]] = None,
+        dtype: DTypeLike = float
+    ):
+        """Initialize the matrix.
+
+        Args:
+            indptr: Row pointer array of length n_rows + 1
+            indices: Column index of every stored entry
+            data: Value of every stored entry
+            shape: Matrix shape (n_rows, n_cols); inferred from indptr if omitted
+            dtype: Value dtype to store and compute in
+        """
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.data = np.asarray(data, dtype=dtype)
+        self.dtype = self.data.dtype
+
+        if self.indptr.ndim != 1 or len(self.indptr) < 1:
+            raise ValueError("indptr must be a non-empty 1D array")
+        if len(self.indices) != len(self.data):
+            raise ValueError("indices and data must have the same length")
+        if self.indptr[0] != 0 or self.indptr[-1] != len(self.data):
+            raise ValueError("indptr must start at 0 and end at len(data)")
+        if np.any(np.diff(self.indptr) < 0):
+            raise ValueError("indptr must be non-decreasing")
+
+        n_rows = len(self.indptr) - 1
+        if shape is None:
+            shape = (n_rows, n_rows)
+        self.shape = (int(shape[0]), int(shape[1]))
+        if self.shape[0] != n_rows:
+            raise ValueError("shape does not match the length of indptr")
+        if len(self.indices) and (self.indices.min() < 0 or self.indices.max() >= self.shape[1]):
+            raise ValueError("column indices out of range")
+
+        self._rows = np.repeat(np.arange(n_rows), np.diff(self.indptr))
+        off = self._rows != self.indices
+        self._off_rows = self._rows[off]
+        self._off_indices = self.indices[off]
+        self._off_data = self.data[off]
+
+    @classmethod
+    def from_dense(cls, A: Any) -> "CSRMatrix":
+        """Build a CSR matrix from the non-zero entries of a dense matrix."""
+        A = np.asarray(A, dtype=float)
+        rows, cols = np.nonzero(A)
+        indptr = np.zeros(A.shape[0] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=A.shape[0]), out=indptr[1:])
+        return cls(indptr, cols, A[rows, cols], A.shape)
+
+    def astype(self, dtype: DTypeLike) -> "CSRMatrix":
+        """Return the matrix with its values stored in dtype."""
+        if np.dtype(dtype) == self.dtype:
+            return self
+        return CSRMatrix(self.indptr, self.indices, self.data, self.shape, dtype)
+
+    def permute_rows(self, permutation: Sequence[int]) -> "CSRMatrix":
+        """Return the matrix whose row k is row permutation[k] of this one."""
+        permutation = np.asarray(permutation)
+        starts = self.indptr[:-1][permutation]
+        lengths = np.diff(self.indptr)[permutation]
+        indptr = np.zeros(len(permutation) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=indptr[1:])
+        # Position of every stored entry of the new rows in the old arrays
+        entries = np.repeat(starts - indptr[:-1], lengths) + np.arange(indptr[-1])
+        return CSRMatrix(indptr, self.indices[entries], self.data[entries], self.shape, self.dtype)
+
+    @property
+    def nnz(self) -> int:
+        """Number of stored entries."""
+        return len(self.data)
+
+    def diagonal(self) -> np.ndarray:
+        """Return the main diagonal as a vector (duplicates are summed)."""
+        diag = np.zeros(min(self.shape), dtype=self.dtype)
+        mask = self._rows == self.indices
+        np.add.at(diag, self._rows[mask], self.data[mask])
+        return diag
+
+    def matvec(self, x: np.ndarray) -> np.ndarray:
+        """Return A @ x for a vector or an (n, k) block."""
+        return _segment_sum(self._rows, self.indices, self.data, x, self.shape[0])
+
+    def offdiag_matvec(self, x: np.ndarray) -> np.ndarray:
+        """Return R @ x where R is A with its diagonal removed."""
+        return _segment_sum(self._off_rows, self._off_indices, self._off_data, x, self.shape[0])
+
+    def offdiag_csr(self):
+        """Return the off-diagonal part as (indptr, indices, data) arrays."""
+        indptr = np.zeros(self.shape[0] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self._off_rows, minlength=self.shape[0]), out=indptr[1:])
+        return indptr, self._off_indices, self._off_data
+
+    def offdiag_abs_row_sums(self) -> np.ndarray:
+        """Return sum(|A_ij| for j != i) for every row."""
+        return np.bincount(self._off_rows, weights=np.abs(self._off_data), minlength=self.shape[0])
+
+    def to_dense(self) -> np.ndarray:
+        """Return the matrix as a dense array."""
+        A = np.zeros(self.shape, dtype=self.dtype)
+        np.add.at(A, (self._rows, self.indices), self.data)
+        return A
+
+
+class BandedOperator:
+    """Square banded matrix stored as its non-zero diagonals.
+
+    The diagonal with offset k (k > 0 above the main diagonal, k < 0
+    below) holds the n - |k| entries A[i, i + k]. Products are sums of
+    shifted slices, so storage and a sweep cost O(n * bandwidth) and no
+    dense matrix is ever built.
+    """
+
+    format = "banded"
+
+    def __init__(
+        self,
+        diagonals: Sequence[Sequence[float]],
+        offsets: Sequence[int],
+        dtype: DTypeLike = float
+    ):
+        """Initialize the matrix.
+
+        Args:
+            diagonals: One array per offset, of length n - |offset|
+            offsets: Offset of each diagonal (0 is the main diagonal)
+            dtype: Value dtype to store and compute in
+        """
+        offsets = [int(k) for k in offsets]
+        if not offsets or len(offsets) != len(diagonals):
+            raise ValueError("diagonals and offsets must be non-empty and of the same length")
+        if len(set(offsets)) != len(offsets):
+            raise ValueError("offsets must be distinct")
+        diagonals = [np.asarray(d, dtype=dtype) for d in diagonals]
+        if any(d.ndim != 1 for d in diagonals):
+            raise ValueError("each diagonal must be one-dimensional")
+
+        sizes = {len(d) + abs(k) for d, k in zip(diagonals, offsets)}
+        if len(sizes) != 1:
+            raise ValueError("diagonal with offset k must have n - |k| entries")
+        n = sizes.pop()
+        if any(abs(k) >= n for k in offsets):
+            raise ValueError("offsets must be smaller than the matrix size")
+
+        self.diagonals = diagonals
+        self.offsets = offsets
+        self.shape = (n, n)
+        self.dtype = diagonals[0].dtype
+
+    def astype(self, dtype: DTypeLike) -> "BandedOperator":
+        """Return the matrix with its values stored in dtype."""
+        if np.dtype(dtype) == self.dtype:
+            return self
+        return BandedOperator(self.diagonals, self.offsets, dtype)
+
+    def diagonal(self) -> np.ndarray:
+        """Return the main diagonal as a vector."""
+        for d, k in zip(self.diagonals, self.offsets):
+            if k == 0:
+                return d.copy()
+        return np.zeros(self.shape[0], dtype=self.dtype)
+
+    def _band_product(self, x: np.ndarray, include_main: bool) -> np.ndarray:
+        """Return the product with the stored diagonals, as shifted slices."""
+        n = self.shape[0]
+        result = np.zeros(x.shape, dtype=np.result_type(self.dtype, x.dtype))
+        for d, k in zip(self.diagonals, self.offsets):
+            if k == 0 and not include_main:
+                continue
+            if x.ndim == 2:
+                d = d[:, None]
+            if k >= 0:
+                result[:n - k] += d * x[k:]
+            else:
+                result[-k:] += d * x[:n + k]
+        return result
+
+    def matvec(self, x: np.ndarray) -> np.ndarray:
+        """Return A @ x for a vector or an (n, k) block."""
+        return self._band_product(x, include_main=True)
+
+    def offdiag_matvec(self, x: np.ndarray) -> np.ndarray:
+        """Return R @ x where R is A without its main diagonal."""
+        return self._band_product(x, include_main=False)
+
+    def offdiag_abs_row_sums(self) -> np.ndarray:
+        """Return sum(|A_ij| for j != i) for every row."""
+        n = self.shape[0]
+        sums = np.zeros(n)
+        for d, k in zip(self.diagonals, self.offsets):
+            if k > 0:
+                sums[:n - k] += np.abs(d)
+            elif k < 0:
+                sums[-k:] += np.abs(d)
+        return sums
+
+    def to_dense(self) -> np.ndarray:
+        """Return the matrix as a dense array (for small systems only)."""
+        A = np.zeros(self.shape, dtype=self.dtype)
+        for d, k in zip(self.diagonals, self.offsets):
+            A += np.diag(d, k)
+        return A
+
+
+# Named finite-difference stencils and the grid dimension they act on
+STENCILS = {
+    "laplacian_3pt": 1,
+    "laplacian_5pt": 2,
+    "laplacian_7pt": 3,
+}
+
+
+class StencilOperator:
+    """Matrix-free operator applying a constant-coefficient stencil on a grid.
+
+    The named Laplacian stencils act on a grid of the given shape with zero
+    (Dirichlet) boundary values; unknowns are the grid points in C order.
+    With the default coefficients (center 2d, neighbor -1 in d dimensions)
+    this is the negative discrete Laplacian, which is SPD. Only the grid
+    values are stored, so memory is O(grid) instead of O(grid²).
+    """
+
+    format = "stencil"
+
+    def __init__(
+        self,
+        stencil: str,
+        grid_shape: Sequence[int],
+        coefficients: Optional[dict] = None,
+        dtype: DTypeLike = float
+    ):
+        """Initialize the operator.
+
+        Args:
+            stencil: Stencil name, one of STENCILS
+            grid_shape: Number of grid points along each axis
+            coefficients: Optional {"center": c, "neighbor": w} overrides
+            dtype: Value dtype to compute in
+        """
+        if stencil not in STENCILS:
+            raise ValueError(f"Unknown stencil '{stencil}'. Use one of: {', '.join(STENCILS)}")
+        grid_shape = tuple(int(g) for g in grid_shape)
+        if len(grid_shape) != STENCILS[stencil]:
+            raise ValueError(f"Stencil '{stencil}' needs a {STENCILS[stencil]}D grid_shape")
+        if any(g < 1 for g in grid_shape):
+            raise ValueError("grid_shape entries must be positive")
+
+        coefficients = coefficients or {}
+        self.stencil = stencil
+        self.grid_shape = grid_shape
+        self.center = float(coefficients.get("center", 2.0 * len(grid_shape)))
+        self.neighbor = float(coefficients.get("neighbor", -1.0))
+        n = int(np.prod(grid_shape))
+        self.shape = (n, n)
+        self.dtype = np.dtype(dtype)
+
+    def astype(self, dtype: DTypeLike) -> "StencilOperator":
+        """Return the operator computing in dtype."""
+        if np.dtype(dtype) == self.dtype:
+            return self
+        coefficients = {"center": self.center, "neighbor": self.neighbor}
+        return StencilOperator(self.stencil, self.grid_shape, coefficients, dtype)
+
+    def diagonal(self) -> np.ndarray:
+        """Return the main diagonal as a vector."""
+        return np.full(self.shape[0], self.center, dtype=self.dtype)
+
+    def _neighbor_sum(self, x: np.ndarray, weight: float) -> np.ndarray:
+        """Return weight * (sum of grid neighbors) for a vector or (n, k) block."""
+        extra = x.shape[1:]
+        grid = x.reshape(self.grid_shape + extra)
+        result = np.zeros_like(grid)
+        for axis in range(len(self.grid_shape)):
+            lower = [slice(None)] * grid.ndim
+            upper = [slice(None)] * grid.ndim
+            lower[axis] = slice(None, -1)
+            upper[axis] = slice(1, None)
+            result[tuple(upper)] += weight * grid[tuple(lower)]
+            result[tuple(lower)] += weight * grid[tuple(upper)]
+        return result.reshape(x.shape)
+
+    def matvec(self, x: np.ndarray) -> np.ndarray:
+        """Return A @ x for a vector or an (n, k) block."""
+        return self.center * x + self._neighbor_sum(x, self.neighbor)
+
+    def offdiag_matvec(self, x: np.ndarray) -> np.ndarray:
+        """Return R @ x, the neighbor contributions only."""
+        return self._neighbor_sum(x, self.neighbor)
+
+    def offdiag_abs_row_sums(self) -> np.ndarray:
+        """Return sum(|A_ij| for j != i) for every row."""
+        return self._neighbor_sum(np.ones(self.shape[0]), abs(self.neighbor))
+
+    def to_dense(self) -> np.ndarray:
+        """Return the operator as a dense array (for small grids only)."""
+        return self.matvec(np.eye(self.shape[0]))
+
+
+class CallableOperator:
+    """Matrix-free operator given by a matvec callable and its diagonal.
+
+    Only products with A are needed by the solvers; Jacobi-type methods
+    additionally need diag(A), which must be supplied explicitly.
+    """
+
+    format = "callable"
+
+    def __init__(
+        self,
+        matvec: Callable[[np.ndarray], Any],
+        diagonal: Sequence[float],
+        dtype: DTypeLike = float
+    ):
+        """Initialize the operator.
+
+        Args:
+            matvec: Function returning A @ x for a vector x
+            diagonal: Main diagonal of A
+            dtype: Value dtype the products are returned in
+        """
+        if not callable(matvec):
+            raise ValueError("matvec must be callable")
+        self._matvec = matvec
+        self._diagonal = np.asarray(diagonal, dtype=dtype)
+        self.dtype = self._diagonal.dtype
+        n = len(self._diagonal)
+        self.shape = (n, n)
+
+    def astype(self, dtype: DTypeLike) -> "CallableOperator":
+        """Return the operator with its products cast to dtype."""
+        if np.dtype(dtype) == self.dtype:
+            return self
+        return CallableOperator(self._matvec, self._diagonal, dtype)
+
+    def diagonal(self) -> np.ndarray:
+        """Return the main diagonal as a vector."""
+        return self._diagonal.copy()
+
+    def matvec(self, x: np.ndarray) -> np.ndarray:
+        """Return A @ x for a vector or an (n, k) block."""
+        if x.ndim == 2:
+            result = np.zeros(x.shape, dtype=self.dtype)
+            for k in range(x.shape[1]):
+                result[:, k] = self._matvec(x[:, k])
+            return result
+        return np.asarray(self._matvec(x), dtype=self.dtype)
+
+    def offdiag_matvec(self, x: np.ndarray) -> np.ndarray:
+        """Return R @ x = A @ x - diag(A) * x."""
+        D = self._diagonal[:, None] if x.ndim == 2 else self._diagonal
+        return self.matvec(x) - D * x
+
+    def offdiag_abs_row_sums(self) -> np.ndarray:
+        """Return sum(|A_ij| for j != i) for every row (materializes A)."""
+        A = np.abs(self.to_dense())
+        return A.sum(axis=1) - np.abs(np.diag(A))
+
+    def to_dense(self) -> np.ndarray:
+        """Return the operator as a dense array (for small systems only)."""
+        return self.matvec(np.eye(self.shape[0]))
+
+
+def _segment_sum(
+    rows: np.ndarray,
+    cols: np.ndarray,
+    vals: np.ndarray,
+    x: np.ndarray,
+    n_rows: int
+) -> np.ndarray:
+    """Sum vals * x[cols] into their rows, for a vector or an (n, k) block.
+
+    bincount always accumulates in float64; the result is returned in the
+    dtype of vals.
+    """
+    if x.ndim == 1:
+        sums = np.bincount(rows, weights=vals * x[cols], minlength=n_rows)
+        return sums.astype(vals.dtype, copy=False)
+    products = vals[:, None] * x[cols]
+    result = np.zeros((n_rows, x.shape[1]), dtype=vals.dtype)
+    for k in range(x.shape[1]):
+        result[:, k] = np.bincount(rows, weights=products[:, k], minlength=n_rows)
+    return result
+
+
+def as_operator(A: Any):
+    """Wrap a coefficient matrix in the matching operator type.
+
+    Accepts nested lists or arrays (dense), a CSRMatrix, a dict with
+    "indptr", "indices" and "data" (and optionally "shape") keys, a banded
+    dict with "diagonals" and "offsets" keys, any
+    object exposing a ``tocsr()`` method such as a SciPy sparse matrix, a
+    matrix-free dict with "stencil" and "grid_shape" (and optionally
+    "coefficients") keys, or a BandedOperator / StencilOperator /
+    CallableOperator.
+
+    Args:
+        A: Coefficient matrix in any supported form
+
+    Returns:
+        Operator exposing shape, diagonal(), matvec() and offdiag_matvec()
+    """
+    if isinstance(A, (DenseOperator, CSRMatrix, BandedOperator, StencilOperator, CallableOperator)):
+        return A
+    if isinstance(A, dict):
+        if {"indptr", "indices", "data"} <= set(A):
+            return CSRMatrix(A["indptr"], A["indices"], A["data"], A.get("shape"))
+        if {"diagonals", "offsets"} <= set(A):
+            return BandedOperator(A["diagonals"], A["offsets"])
+        if {"stencil", "grid_shape"} <= set(A):
+            return StencilOperator(A["stencil"], A["grid_shape"], A.get("coefficients"))
+        raise ValueError(
+            "Unrecognized matrix format: expected indptr, indices and data, "
+            "diagonals and offsets, or stencil and grid_shape"
+        )
+    if hasattr(A, "tocsr"):
+        csr = A.tocsr()
+        return CSRMatrix(csr.indptr, csr.indices, csr.data, csr.shape)
+    return DenseOperator(A)
+
+
+def cached_value(A: Any, name: Any, compute: Callable[[], Any]) -> Any:
+    """Return a value derived from operator A, memoized if A is cached.
+
+    Operators handed out by operator_cache carry a `cache_entry`; for
+    those the value is computed once per matrix. Otherwise it is computed
+    on every call.
+    """
+    entry = getattr(A, "cache_entry", None)
+    if entry is None:
+        return compute()
+    return entry.memo(name, compute)
+
+
+class LinearSystemError(ValueError):
+    """Raised when a linear system fails input validation."""
+
+
+def prepare_linear_system(A: Any, b: Any, x0: Any = None):
+    """Convert and validate the inputs shared by all linear solvers.
+
+    Args:
+        A: Coefficient matrix in any form accepted by as_operator
+        b: Right-hand side vector (n) or block (n x k)
+        x0: Initial guess with the shape of b (if None, uses zeros)
+
+    Returns:
+        Tuple of (operator, b, x0) with b and x0 as float arrays
+
+    Raises:
+        LinearSystemError: If A is not square, the dimensions don't match
+            or A has zero diagonal elements
+    """
+    A = as_operator(A)
+    b = np.array(b, dtype=float)
+
+    if A.shape[0] != A.shape[1]:
+        raise LinearSystemError("Matrix A must be square")
+    if A.shape[0] != len(b):
+        raise LinearSystemError("Dimensions of A and b don't match")
+    if cached_value(A, "zero_diagonal", lambda: bool(np.any(A.diagonal() == 0))):
+        raise LinearSystemError("Matrix has zero diagonal elements")
+
+    if x0 is None:
+        x = np.zeros(b.shape)
+    else:
+        x = np.array(x0, dtype=float)
+        if x.shape != b.shape:
+            raise LinearSystemError("Initial guess must have the same shape as b")
+
+    return A, b, x
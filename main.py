@@ -1,22 +1,38 @@
 """Main FastAPI application for Numerical Methods project."""
-from fastapi import FastAPI, Request, Form
+from fastapi import FastAPI, Request, Form, Query
 from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from typing import List, Optional
+from pydantic import BaseModel
+from typing import Dict, List, Optional, Union
 import json
 
 # Import numerical methods
-from jacobi import jacobi_method, check_diagonal_dominance
-from regula_falsi import regula_falsi_method
+from jacobi import jacobi_method, jacobi_batch, check_diagonal_dominance, diagonal_dominance_report
+from gauss_seidel import gauss_seidel_method, sor_method
+from conjugate_gradient import conjugate_gradient_method
+from regula_falsi import regula_falsi_method, regula_falsi_batch
+from brent import brent_method
+from root_search import find_all_roots
+from polynomial import polynomial_roots
 from forward_fd import forward_finite_difference
 from backward_fd import backward_finite_difference
 from center_fd import center_finite_difference
 from config_loader import config
+from linear_operators import BandedOperator, CSRMatrix, StencilOperator
+from operator_cache import operator_cache
+from parallel_jacobi import max_workers
 
 # Create FastAPI app
 app = FastAPI(title="Numerical Methods Calculator", version="1.0.0")
 
+# Bracketing root finders selectable with the engine field of /api/regula-falsi
+ROOT_ENGINES = ("regula_falsi", "brent")
+
+# Bounds on client-supplied finite difference stencils (see finite_difference.stencil)
+MAX_FD_ORDER = config.get('finite_difference.max_order', 10)
+MAX_FD_ACCURACY = config.get('finite_difference.max_accuracy', 20)
+
 # Setup templates
 templates = Jinja2Templates(directory="templates")
 
@@ -27,6 +43,68 @@ except Exception:
     pass  # Directory may not exist yet
 
 
+# ============================================================================
+# REQUEST MODELS
+# ============================================================================
+
+class CSRMatrixPayload(BaseModel):
+    """Sparse matrix in compressed sparse row form."""
+    indptr: List[int]
+    indices: List[int]
+    data: List[float]
+    shape: Optional[List[int]] = None
+
+
+class BandedPayload(BaseModel):
+    """Banded matrix given by its diagonals and their offsets."""
+    diagonals: List[List[float]]
+    offsets: List[int]
+
+
+class StencilPayload(BaseModel):
+    """Matrix-free operator given by a named stencil on a grid."""
+    stencil: str
+    grid_shape: List[int]
+    coefficients: Optional[Dict[str, float]] = None
+
+
+def parse_matrix(matrix_a):
+    """Convert an API matrix payload into a form accepted by the solvers."""
+    if isinstance(matrix_a, CSRMatrixPayload):
+        return CSRMatrix(matrix_a.indptr, matrix_a.indices, matrix_a.data, matrix_a.shape)
+    if isinstance(matrix_a, BandedPayload):
+        return BandedOperator(matrix_a.diagonals, matrix_a.offsets)
+    if isinstance(matrix_a, StencilPayload):
+        return StencilOperator(matrix_a.stencil, matrix_a.grid_shape, matrix_a.coefficients)
+    return matrix_a
+
+
+def run_linear_solver(solver, matrix_a, b, **options):
+    """Parse matrix_a, run a linear solver and attach the dominance check.
+    
+    With the operator cache enabled the parsed matrix is looked up once, so
+    the solver and the dominance check share the prepared operator.
+    options are passed to the solver by keyword, so they cannot be shifted
+    onto the wrong parameter when a solver's signature grows.
+    """
+    try:
+        A = parse_matrix(matrix_a)
+        if config.get('jacobi.cache.enabled', True):
+            A = operator_cache.lookup(A).operator
+    except ValueError as e:
+        return {
+            "success": False,
+            "solution": None,
+            "iterations": 0,
+            "error": None,
+            "iteration_log": [],
+            "message": f"Invalid matrix: {str(e)}"
+        }
+    result = solver(A, b, **options)
+    result["diagonal_dominance"] = diagonal_dominance_report(A)
+    return result
+
+
 # Home page
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request):
@@ -112,20 +190,159 @@ async def jacobi_compute(
 
 @app.post("/api/jacobi")
 async def jacobi_api(
-    matrix_a: List[List[float]],
+    matrix_a: Union[List[List[float]], CSRMatrixPayload, BandedPayload, StencilPayload],
     vector_b: List[float],
     initial_guess: Optional[List[float]] = None,
     max_iterations: Optional[int] = None,
+    tolerance: Optional[float] = None,
+    engine: Optional[str] = None,
+    log_policy: Optional[str] = None,
+    relaxation_factor: Optional[float] = None,
+    divergence_check: Optional[bool] = None,
+    workers: Optional[int] = None,
+    warm_start: Optional[bool] = None,
+    precision: Optional[str] = None,
+    permute_rows: Optional[bool] = None,
+    acceleration: Optional[str] = None,
+    anderson_depth: Optional[int] = None,
+    measure_baseline: Optional[bool] = None,
+    checkpoint: Optional[bool] = None,
+    resume_token: Optional[str] = None
+):
+    """Jacobi method API endpoint.
+    
+    matrix_a is either a dense list of rows, a CSR object with
+    indptr, indices and data, a banded object with diagonals and offsets,
+    or a matrix-free stencil with grid_shape. workers may not exceed
+    parallel_jacobi.max_workers() (one per CPU unless jacobi.max_workers
+    is set).
+    """
+    if workers is not None and not 0 <= workers <= max_workers():
+        return {
+            "success": False,
+            "solution": None,
+            "iterations": 0,
+            "error": None,
+            "iteration_log": [],
+            "message": f"workers must be between 0 and {max_workers()}"
+        }
+    return run_linear_solver(
+        jacobi_method, matrix_a, vector_b, x0=initial_guess,
+        max_iterations=max_iterations, tolerance=tolerance, engine=engine,
+        log_policy=log_policy, relaxation_factor=relaxation_factor,
+        divergence_check=divergence_check, workers=workers, warm_start=warm_start,
+        precision=precision, permute_rows=permute_rows, acceleration=acceleration,
+        anderson_depth=anderson_depth, measure_baseline=measure_baseline,
+        checkpoint=checkpoint, resume_token=resume_token
+    )
+
+
+@app.get("/api/jacobi/cache")
+async def jacobi_cache_api():
+    """Operator cache statistics (hits, misses, evictions, size)."""
+    return operator_cache.stats()
+
+
+@app.post("/api/jacobi-multi")
+async def jacobi_multi_api(
+    matrix_a: Union[List[List[float]], CSRMatrixPayload, BandedPayload, StencilPayload],
+    matrix_b: List[List[float]],
+    initial_guess: Optional[List[List[float]]] = None,
+    max_iterations: Optional[int] = None,
+    tolerance: Optional[float] = None,
+    engine: Optional[str] = None,
+    log_policy: Optional[str] = None,
+    relaxation_factor: Optional[float] = None,
+    divergence_check: Optional[bool] = None,
+    precision: Optional[str] = None,
+    permute_rows: Optional[bool] = None
+):
+    """Jacobi method API endpoint for many right-hand sides.
+    
+    matrix_b is an n x k block whose columns are the right-hand sides; A is
+    parsed, validated and checked for dominance once for all of them.
+    """
+    return run_linear_solver(
+        jacobi_method, matrix_a, matrix_b, x0=initial_guess,
+        max_iterations=max_iterations, tolerance=tolerance, engine=engine,
+        log_policy=log_policy, relaxation_factor=relaxation_factor,
+        divergence_check=divergence_check, precision=precision,
+        permute_rows=permute_rows
+    )
+
+
+@app.post("/api/jacobi-batch")
+async def jacobi_batch_api(
+    matrices: List[List[List[float]]],
+    vectors: List[List[float]],
+    initial_guesses: Optional[List[List[float]]] = None,
+    max_iterations: Optional[int] = None,
     tolerance: Optional[float] = None
 ):
-    """Jacobi method API endpoint."""
-    result = jacobi_method(matrix_a, vector_b, initial_guess, max_iterations, tolerance)
-    dominance_check = check_diagonal_dominance(matrix_a)
-    result["diagonal_dominance"] = {
-        "is_dominant": dominance_check[0],
-        "message": dominance_check[1]
-    }
-    return result
+    """Batched Jacobi API endpoint for many small independent systems.
+    
+    matrices is an (m, n, n) stack and vectors an (m, n) stack; per-system
+    results are returned as compact arrays.
+    """
+    return jacobi_batch(matrices, vectors, initial_guesses, max_iterations, tolerance)
+
+
+@app.post("/api/gauss-seidel")
+async def gauss_seidel_api(
+    matrix_a: Union[List[List[float]], CSRMatrixPayload],
+    vector_b: List[float],
+    initial_guess: Optional[List[float]] = None,
+    max_iterations: Optional[int] = None,
+    tolerance: Optional[float] = None,
+    log_policy: Optional[str] = None
+):
+    """Gauss-Seidel method API endpoint."""
+    return run_linear_solver(
+        gauss_seidel_method, matrix_a, vector_b, x0=initial_guess,
+        max_iterations=max_iterations, tolerance=tolerance, log_policy=log_policy
+    )
+
+
+@app.post("/api/sor")
+async def sor_api(
+    matrix_a: Union[List[List[float]], CSRMatrixPayload],
+    vector_b: List[float],
+    initial_guess: Optional[List[float]] = None,
+    max_iterations: Optional[int] = None,
+    tolerance: Optional[float] = None,
+    relaxation_factor: Optional[float] = None,
+    log_policy: Optional[str] = None
+):
+    """Successive Over-Relaxation (SOR) method API endpoint."""
+    return run_linear_solver(
+        sor_method, matrix_a, vector_b, x0=initial_guess,
+        max_iterations=max_iterations, tolerance=tolerance,
+        relaxation_factor=relaxation_factor, log_policy=log_policy
+    )
+
+
+@app.post("/api/conjugate-gradient")
+async def conjugate_gradient_api(
+    matrix_a: Union[List[List[float]], CSRMatrixPayload, BandedPayload, StencilPayload],
+    vector_b: List[float],
+    initial_guess: Optional[List[float]] = None,
+    max_iterations: Optional[int] = None,
+    tolerance: Optional[float] = None,
+    preconditioner: Optional[str] = None,
+    log_policy: Optional[str] = None,
+    checkpoint: Optional[bool] = None,
+    resume_token: Optional[str] = None
+):
+    """Jacobi-preconditioned Conjugate Gradient API endpoint.
+    
+    matrix_a may be dense, CSR, banded or a matrix-free stencil, as for /api/jacobi.
+    """
+    return run_linear_solver(
+        conjugate_gradient_method, matrix_a, vector_b, x0=initial_guess,
+        max_iterations=max_iterations, tolerance=tolerance,
+        preconditioner=preconditioner, log_policy=log_policy,
+        checkpoint=checkpoint, resume_token=resume_token
+    )
 
 
 # ============================================================================
@@ -185,10 +402,104 @@ async def regula_falsi_api(
     a: float,
     b: float,
     max_iterations: Optional[int] = None,
+    tolerance: Optional[float] = None,
+    log_policy: Optional[str] = None,
+    variant: Optional[str] = None,
+    compare: Optional[bool] = None,
+    engine: Optional[str] = None
+):
+    """Bracketing root finder API endpoint.
+    
+    engine selects "regula_falsi" (default) or "brent"; both take the same
+    fields and return the same layout, so clients switch engines with this
+    one field. variant and compare apply to regula_falsi only.
+    """
+    if engine is None:
+        engine = "regula_falsi"
+    if engine not in ROOT_ENGINES:
+        return {
+            "success": False,
+            "root": None,
+            "iterations": 0,
+            "error": None,
+            "iteration_log": [],
+            "message": f"Unknown engine '{engine}'. Use one of: {', '.join(ROOT_ENGINES)}"
+        }
+    if engine == "brent":
+        if variant is not None or compare:
+            return {
+                "success": False,
+                "root": None,
+                "iterations": 0,
+                "error": None,
+                "iteration_log": [],
+                "message": "variant and compare apply only to the regula_falsi engine"
+            }
+        result = brent_method(function, a, b, max_iterations, tolerance, log_policy)
+    else:
+        result = regula_falsi_method(function, a, b, max_iterations, tolerance, log_policy, variant, compare)
+    result["engine"] = engine
+    return result
+
+
+@app.post("/api/regula-falsi-batch")
+async def regula_falsi_batch_api(
+    function: str,
+    a: List[float],
+    b: List[float],
+    parameters: Optional[Dict[str, List[float]]] = None,
+    max_iterations: Optional[int] = None,
+    tolerance: Optional[float] = None,
+    variant: Optional[str] = None
+):
+    """Batched Regula-Falsi API endpoint for many brackets and parameter sets.
+    
+    a, b and every parameter array (bound to a named symbol of function)
+    broadcast to a common length m; per-problem results are returned as
+    compact arrays.
+    """
+    return regula_falsi_batch(function, a, b, parameters, max_iterations, tolerance, variant)
+
+
+@app.post("/api/brent")
+async def brent_api(
+    function: str,
+    a: float,
+    b: float,
+    max_iterations: Optional[int] = None,
+    tolerance: Optional[float] = None,
+    log_policy: Optional[str] = None
+):
+    """Alias of /api/regula-falsi with engine="brent"."""
+    return await regula_falsi_api(
+        function, a, b, max_iterations, tolerance, log_policy, engine="brent"
+    )
+
+
+@app.post("/api/roots")
+async def roots_api(
+    function: str,
+    a: float,
+    b: float,
+    grid_points: Optional[int] = None,
+    max_refinements: Optional[int] = None,
+    tolerance: Optional[float] = None,
+    max_iterations: Optional[int] = None,
+    variant: Optional[str] = None,
+    polynomial: Optional[bool] = None
+):
+    """All-roots search API endpoint: finds every root of function in [a, b]."""
+    return find_all_roots(function, a, b, grid_points, max_refinements, tolerance, max_iterations, variant, polynomial)
+
+
+@app.post("/api/polynomial-roots")
+async def polynomial_roots_api(
+    function: str,
+    polish: Optional[bool] = None,
     tolerance: Optional[float] = None
 ):
-    """Regula-Falsi method API endpoint."""
-    return regula_falsi_method(function, a, b, max_iterations, tolerance)
+    """Polynomial roots API endpoint: every real and complex root, no interval needed."""
+    return polynomial_roots(function, polish, tolerance)
 
 
 # ============================================================================
@@ -259,11 +570,14 @@ async def forward_fd_api(
     function: str = "",
     x_values: List[float] = None,
     y_values: Optional[List[float]] = None,
-    order: int = 1,
-    h: Optional[float] = None
+    order: int = Query(1, ge=1, le=MAX_FD_ORDER),
+    h: Optional[float] = None,
+    compact: Optional[bool] = None,
+    accuracy: Optional[int] = Query(None, ge=1, le=MAX_FD_ACCURACY),
+    nonuniform: Optional[bool] = None
 ):
     """Forward finite difference API endpoint."""
-    return forward_finite_difference(function, x_values, y_values, order, h)
+    return forward_finite_difference(function, x_values, y_values, order, h, compact, accuracy, nonuniform)
 
 
 # ============================================================================
@@ -334,11 +648,14 @@ async def backward_fd_api(
     function: str = "",
     x_values: List[float] = None,
     y_values: Optional[List[float]] = None,
-    order: int = 1,
-    h: Optional[float] = None
+    order: int = Query(1, ge=1, le=MAX_FD_ORDER),
+    h: Optional[float] = None,
+    compact: Optional[bool] = None,
+    accuracy: Optional[int] = Query(None, ge=1, le=MAX_FD_ACCURACY),
+    nonuniform: Optional[bool] = None
 ):
     """Backward finite difference API endpoint."""
-    return backward_finite_difference(function, x_values, y_values, order, h)
+    return backward_finite_difference(function, x_values, y_values, order, h, compact, accuracy, nonuniform)
 
 
 # ============================================================================
@@ -409,11 +726,14 @@ async def center_fd_api(
     function: str = "",
     x_values: List[float] = None,
     y_values: Optional[List[float]] = None,
-    order: int = 1,
-    h: Optional[float] = None
+    order: int = Query(1, ge=1, le=MAX_FD_ORDER),
+    h: Optional[float] = None,
+    compact: Optional[bool] = None,
+    accuracy: Optional[int] = Query(None, ge=1, le=MAX_FD_ACCURACY),
+    nonuniform: Optional[bool] = None
 ):
     """Center finite difference API endpoint."""
-    return center_finite_difference(function, x_values, y_values, order, h)
+    return center_finite_difference(function, x_values, y_values, order, h, compact, accuracy, nonuniform)
 
 
 # Run with: uvicorn main:app --reload
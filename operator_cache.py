@@ -0,0 +1,204 @@
+"""LRU cache of prepared linear operators keyed by a content fingerprint."""
+import hashlib
+import threading
+import numpy as np
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+from config_loader import config
+from linear_operators import as_operator
+
+
+class CachedOperator:
+    """A prepared operator plus everything derived from it.
+
+    The operator itself keeps its lazily built off-diagonal part, and
+    derived values such as the diagonal inverse, the dominance verdict and
+    spectral estimates are memoized in `values`. `last_solution` holds the
+    most recent solution computed for this matrix, for warm starts.
+    An entry stored in an OperatorCache has `owner` set, so the cache can
+    re-check its byte bound whenever a memoized value is added.
+    """
+
+    def __init__(self, key: Optional[str], operator):
+        """Initialize the entry.
+
+        Args:
+            key: Content fingerprint (None if the operator is not cacheable)
+            operator: Operator from linear_operators.as_operator
+        """
+        self.key = key
+        self.operator = operator
+        self.values: Dict[Any, Any] = {}
+        self.last_solution: Optional[np.ndarray] = None
+        self.owner: Optional["OperatorCache"] = None
+
+    def memo(self, name: Any, compute: Callable[[], Any]) -> Any:
+        """Return the memoized value for name, computing it on first use."""
+        if name not in self.values:
+            value = compute()
+            self.values[name] = value
+            if self.owner is not None:
+                self.owner.trim()
+            return value
+        return self.values[name]
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the operator, its derived copies and memoized values."""
+        return _nbytes((self.operator, self.values, self.last_solution), set())
+
+
+def _nbytes(value: Any, seen: set) -> int:
+    """Return the array bytes reachable from value, counting each object once."""
+    if value is None or id(value) in seen:
+        return 0
+    seen.add(id(value))
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sum(_nbytes(item, seen) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(_nbytes(item, seen) for item in value)
+    if hasattr(value, "__dict__"):
+        # Operators: their arrays and lazily built copies; the back-reference
+        # to the entry is not part of the operator
+        return sum(_nbytes(item, seen) for key, item in vars(value).items() if key != "cache_entry")
+    return 0
+
+
+def fingerprint(operator) -> Optional[str]:
+    """Return a content hash of an operator, or None if it cannot be hashed.
+
+    Dense, CSR and banded operators are hashed over their raw array bytes and
+    stencils over their definition; callables have no content to hash.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{operator.format}:{operator.shape}".encode())
+
+    if operator.format == "dense":
+        digest.update(np.ascontiguousarray(operator.A).tobytes())
+    elif operator.format == "csr":
+        for array in (operator.indptr, operator.indices, operator.data):
+            digest.update(np.ascontiguousarray(array).tobytes())
+    elif operator.format == "banded":
+        digest.update(repr(operator.offsets).encode())
+        for diagonal in operator.diagonals:
+            digest.update(np.ascontiguousarray(diagonal).tobytes())
+    elif operator.format == "stencil":
+        definition = (operator.stencil, operator.grid_shape, operator.center, operator.neighbor)
+        digest.update(repr(definition).encode())
+    else:
+        return None
+
+    return digest.hexdigest()
+
+
+class OperatorCache:
+    """Size-bounded LRU cache of CachedOperator entries.
+
+    Entries are evicted least-recently-used first once max_size entries or
+    max_bytes are exceeded; the bytes of an entry include the copies
+    derived from it (off-diagonal part, float32 copy, permuted operator),
+    which grow as it is used. An operator larger than max_bytes on its own
+    is never stored. Hit, miss and eviction counters are kept for monitoring.
+    """
+
+    def __init__(self, max_size: Optional[int] = None, max_bytes: Optional[int] = None):
+        """Initialize the cache.
+
+        Args:
+            max_size: Maximum number of entries (uses jacobi.cache.max_size config)
+            max_bytes: Maximum bytes held by all entries (uses
+                jacobi.cache.max_bytes config)
+        """
+        if max_size is None:
+            max_size = config.get('jacobi.cache.max_size', 32)
+        if max_bytes is None:
+            max_bytes = config.get('jacobi.cache.max_bytes', 1073741824)
+        self.max_size = int(max_size)
+        self.max_bytes = int(max_bytes)
+        self._entries: "OrderedDict[str, CachedOperator]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def lookup(self, A: Any) -> CachedOperator:
+        """Return the cached entry for A, preparing and storing it on a miss.
+
+        Args:
+            A: Coefficient matrix in any form accepted by as_operator
+
+        Returns:
+            CachedOperator whose operator carries a `cache_entry` back-reference
+        """
+        existing = getattr(A, "cache_entry", None)
+        if existing is not None:
+            with self._lock:
+                self.hits += 1
+            return existing
+
+        operator = as_operator(A)
+        key = fingerprint(operator)
+
+        with self._lock:
+            if key is not None and key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+            self.misses += 1
+            entry = CachedOperator(key, operator)
+            operator.cache_entry = entry
+            if key is not None and self.max_size > 0 and entry.nbytes <= self.max_bytes:
+                entry.owner = self
+                self._entries[key] = entry
+                self._evict(keep=key)
+            return entry
+
+    def trim(self):
+        """Evict entries until the cache is back within its bounds."""
+        with self._lock:
+            self._evict()
+
+    def _evict(self, keep: Optional[str] = None):
+        """Drop least recently used entries beyond max_size or max_bytes.
+
+        The entry under keep (just looked up) is evicted last. Call with
+        the lock held.
+        """
+        sizes = {key: entry.nbytes for key, entry in self._entries.items()}
+        total = sum(sizes.values())
+        for key in list(self._entries):
+            if len(self._entries) <= self.max_size and total <= self.max_bytes:
+                break
+            if key == keep and len(self._entries) > 1:
+                continue
+            self._entries.pop(key).owner = None
+            total -= sizes[key]
+            self.evictions += 1
+
+    def stats(self) -> Dict:
+        """Return hit, miss and eviction counters and the current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "bytes": sum(entry.nbytes for entry in self._entries.values()),
+                "max_bytes": self.max_bytes,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+    def clear(self):
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+
+# Global operator cache instance
+operator_cache = OperatorCache()
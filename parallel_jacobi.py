@@ -0,0 +1,249 @@
+"""Shared-memory multi-process block Jacobi sweeps for large dense systems."""
+import multiprocessing as mp
+import os
+import sys
+import time
+import numpy as np
+from multiprocessing import shared_memory
+from multiprocessing.connection import wait
+from typing import Dict, Optional
+from config_loader import config
+
+
+def max_workers() -> int:
+    """Return the largest worker count a parallel sweep may start.
+
+    Uses jacobi.max_workers config; 0 means one per CPU.
+    """
+    return int(config.get('jacobi.max_workers', 0)) or os.cpu_count() or 1
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach to an existing shared memory block owned by the parent.
+
+    Workers share the parent's resource tracker, so registering the block
+    again is harmless; from Python 3.13 tracking is switched off outright
+    since the parent alone unlinks every block.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    return shared_memory.SharedMemory(name=name)
+
+
+def _worker(
+    names: Dict[str, str],
+    n: int,
+    dtype: str,
+    row_start: int,
+    row_end: int,
+    connection
+):
+    """Worker loop: update rows [row_start, row_end) once per sweep.
+
+    The worker waits for a message on its own pipe: "sweep" after the
+    parent has written x_in, answered with "done" once the block of x_out
+    is written, or "stop" to exit.
+    """
+    blocks = {key: _attach(name) for key, name in names.items()}
+    _sweep_loop(blocks, n, np.dtype(dtype), row_start, row_end, connection)
+    for shm in blocks.values():
+        shm.close()
+
+
+def _sweep_loop(blocks, n, dtype, row_start, row_end, connection):
+    """Run sweeps until the parent sends "stop" or closes the pipe.
+
+    Kept separate from _worker so that every array view of the shared
+    memory is released before the blocks are closed.
+    """
+    R = np.ndarray((n, n), dtype=dtype, buffer=blocks["R"].buf)[row_start:row_end]
+    D = np.ndarray((n,), dtype=dtype, buffer=blocks["D"].buf)[row_start:row_end]
+    b = np.ndarray((n,), dtype=dtype, buffer=blocks["b"].buf)[row_start:row_end]
+    x_in = np.ndarray((n,), dtype=dtype, buffer=blocks["x_in"].buf)
+    x_out = np.ndarray((n,), dtype=dtype, buffer=blocks["x_out"].buf)
+
+    while True:
+        try:
+            message = connection.recv()
+        except EOFError:
+            break
+        if message != "sweep":
+            break
+        x_out[row_start:row_end] = (b - R @ x_in) / D
+        connection.send("done")
+
+
+class ParallelSweep:
+    """Jacobi sweep that splits the rows of a dense system across processes.
+
+    A's off-diagonal part, its diagonal, b and the iterate live in
+    multiprocessing.shared_memory, so workers read them without copying.
+    Each worker owns a contiguous block of rows and a pipe to the parent;
+    one sweep sends "sweep" down every pipe and collects one "done" from
+    each. The shared arrays use the operator's dtype, so a float32 operator
+    halves the memory each sweep streams through.
+    Call close() (or use the object as a context manager) to stop the
+    workers and release the shared memory.
+    The parent polls the pipes and checks that every worker is alive, so
+    a worker that dies (e.g. killed for running out of memory) or stalls
+    past the timeout fails the sweep instead of hanging it; the pool is
+    then restarted, so the next sweep runs on fresh workers.
+    """
+
+    def __init__(self, A, workers: Optional[int] = None, timeout: Optional[float] = None):
+        """Start the worker pool.
+
+        Args:
+            A: Dense operator (see linear_operators.DenseOperator)
+            workers: Number of worker processes (uses jacobi.workers config;
+                0 means one per CPU), capped at max_workers() and n
+            timeout: Seconds a sweep may take before the workers are
+                considered stalled (uses jacobi.sweep_timeout config)
+        """
+        if A.format != "dense":
+            raise ValueError("The parallel engine requires a dense matrix")
+        if workers is None:
+            workers = config.get('jacobi.workers', 0)
+        if not workers:
+            workers = os.cpu_count() or 1
+        if timeout is None:
+            timeout = config.get('jacobi.sweep_timeout', 60)
+        n = A.shape[0]
+        workers = max(1, min(int(workers), n, max_workers()))
+        dtype = A.dtype
+
+        self.n = n
+        self.workers = workers
+        self.timeout = float(timeout)
+        self._dtype = dtype
+        self._b_source = None
+        self._blocks = {}
+        self._processes = []
+        self._connections = []
+        self._b = self._x_in = self._x_out = None
+
+        try:
+            R = self._allocate("R", (n, n), dtype)
+            R[:] = A.A
+            np.fill_diagonal(R, 0.0)
+            del R
+            self._allocate("D", (n,), dtype)[:] = A.diagonal()
+            self._b = self._allocate("b", (n,), dtype)
+            self._x_in = self._allocate("x_in", (n,), dtype)
+            self._x_out = self._allocate("x_out", (n,), dtype)
+            self._start_workers()
+        except Exception:
+            self.close()
+            raise
+
+    def _start_workers(self):
+        """Start one worker process per block of rows."""
+        ctx = mp.get_context()
+        names = {key: shm.name for key, shm in self._blocks.items()}
+        bounds = np.linspace(0, self.n, self.workers + 1).astype(int)
+
+        for w in range(self.workers):
+            parent_end, worker_end = ctx.Pipe()
+            process = ctx.Process(
+                target=_worker,
+                args=(names, self.n, self._dtype.str, bounds[w], bounds[w + 1], worker_end),
+                daemon=True
+            )
+            process.start()
+            # Only the worker holds its end, so its death shows up as EOF
+            worker_end.close()
+            self._processes.append(process)
+            self._connections.append(parent_end)
+
+    def _stop_workers(self, graceful: bool):
+        """Stop every worker, asking politely first when graceful."""
+        if graceful:
+            for connection in self._connections:
+                try:
+                    connection.send("stop")
+                except (BrokenPipeError, OSError):
+                    pass
+        for process in self._processes:
+            if graceful:
+                process.join(timeout=10)
+            if process.is_alive():
+                # SIGKILL also ends a stopped or stuck worker
+                process.kill()
+                process.join()
+        for connection in self._connections:
+            connection.close()
+        self._processes = []
+        self._connections = []
+
+    def _allocate(self, key: str, shape, dtype) -> np.ndarray:
+        """Create a shared memory block and return an array view of it."""
+        nbytes = max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1)
+        shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        self._blocks[key] = shm
+        return np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+    def __call__(self, x: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """Run one parallel sweep and return x^(k+1).
+
+        Raises:
+            RuntimeError: If a worker died or the sweep took longer than
+                the timeout; the pool is restarted before raising
+        """
+        if x.ndim != 1:
+            raise ValueError("The parallel engine accepts a single right-hand side vector")
+        if b is not self._b_source:
+            self._b[:] = b
+            self._b_source = b
+        self._x_in[:] = x
+
+        failure = self._sweep()
+        if failure is not None:
+            self._stop_workers(graceful=False)
+            self._start_workers()
+            raise RuntimeError(f"Parallel sweep failed: {failure}")
+        return self._x_out.copy()
+
+    def _sweep(self) -> Optional[str]:
+        """Release every worker for one sweep and wait for all of them.
+
+        Returns:
+            None on success, otherwise a description of the failure
+        """
+        for connection in self._connections:
+            try:
+                connection.send("sweep")
+            except (BrokenPipeError, OSError):
+                return "a worker died"
+
+        pending = dict(zip(self._connections, self._processes))
+        deadline = time.monotonic() + self.timeout
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return f"no result within {self.timeout:g} s"
+            for connection in wait(list(pending), timeout=min(remaining, 0.1)):
+                try:
+                    connection.recv()
+                except (EOFError, OSError):
+                    return "a worker died"
+                del pending[connection]
+            if any(not process.is_alive() for process in pending.values()):
+                return "a worker died"
+        return None
+
+    def close(self):
+        """Stop the workers and release the shared memory."""
+        self._stop_workers(graceful=True)
+
+        # Views must be dropped before the blocks can be closed
+        self._b = self._x_in = self._x_out = None
+        for shm in self._blocks.values():
+            shm.close()
+            shm.unlink()
+        self._blocks = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
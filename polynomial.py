@@ -0,0 +1,212 @@
+"""Polynomial roots from companion-matrix eigenvalues."""
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Tuple
+from config_loader import config
+from expression import compile_expression
+
+# Relative machine precision, which sets the scatter of multiple roots
+EPS = np.finfo(float).eps
+
+
+def polynomial_roots(
+    func_str: str,
+    polish: Optional[bool] = None,
+    tolerance: Optional[float] = None
+) -> Dict:
+    """Find every root of a polynomial at once.
+
+    The coefficients are extracted from the expression when it is parsed
+    (see expression.CompiledExpression.coefficients), so "(x - 1)*(x + 2)**2"
+    works as well as an expanded form. The roots are the eigenvalues of the
+    companion matrix; no bracket or interval is needed, and complex roots
+    are returned too.
+
+    Args:
+        func_str: Polynomial in x as string (e.g., "x**3 - 2*x - 5")
+        polish: Refine simple roots with Newton steps (uses polynomial.polish)
+        tolerance: Tolerance on the imaginary part of real roots and on the
+            sign change certifying a multiple root (uses polynomial.tolerance)
+
+    Returns:
+        Dictionary containing:
+            - success: Whether the roots were computed
+            - degree: Degree of the polynomial
+            - coefficients: Coefficients, highest degree first
+            - roots: Sorted real roots
+            - multiplicity: Multiplicity of each real root
+            - complex_roots: Remaining roots as [real, imag] pairs
+            - message: Status message
+    """
+    # Load configuration
+    if polish is None:
+        polish = config.get('polynomial.polish', True)
+    if tolerance is None:
+        tolerance = config.get('polynomial.tolerance', 1e-8)
+
+    try:
+        coefficients = compile_expression(func_str).coefficients
+        if coefficients is None:
+            raise ValueError(f"'{func_str}' is not a polynomial in x; use /api/roots with an interval")
+        if len(coefficients) < 2:
+            raise ValueError("A constant has no isolated roots")
+
+        roots, multiplicity, complex_roots = companion_roots(coefficients, polish, tolerance)
+
+        return {
+            "success": True,
+            "degree": len(coefficients) - 1,
+            "coefficients": list(coefficients),
+            "roots": roots.tolist(),
+            "multiplicity": multiplicity.tolist(),
+            "complex_roots": [[z.real, z.imag] for z in complex_roots.tolist()],
+            "message": f"Found {len(roots)} real and {len(complex_roots)} complex roots"
+        }
+
+    except Exception as e:
+        return {
+            "success": False,
+            "degree": None,
+            "coefficients": None,
+            "roots": None,
+            "multiplicity": None,
+            "complex_roots": None,
+            "message": f"Error: {str(e)}"
+        }
+
+
+def companion_roots(
+    coefficients: Sequence[float],
+    polish: bool,
+    tolerance: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return the real and complex roots of a polynomial.
+
+    1. The eigenvalues of the companion matrix (np.roots) are the roots.
+    2. A root of multiplicity k comes out as k eigenvalues scattered by
+       about eps**(1/k) around it, often as complex pairs. Eigenvalues are
+       grouped within cluster_radius(degree), the widest such scatter; a
+       group of k is taken as one root of multiplicity k at its mean (which
+       is accurate to about eps) when its scatter fits cluster_radius(k),
+       the mean is real and p changes sign or nearly vanishes there.
+       Other groups are split with a smaller radius until they pass or
+       fall apart into single eigenvalues.
+    3. Simple roots are polished with polynomial.newton_steps Newton steps,
+       each kept only if it reduces |p|.
+
+    Args:
+        coefficients: Real coefficients, highest degree first (degree >= 1)
+        polish: Apply the Newton steps
+        tolerance: Largest imaginary part of a real root (relative to
+            max(1, |root|)); a grouped root must show a sign change within
+            the tolerance or |p| below it
+
+    Returns:
+        (roots, multiplicity, complex_roots): sorted real roots with their
+        multiplicities, and the remaining complex roots
+    """
+    coefficients = np.asarray(coefficients, dtype=float)
+    newton_steps = config.get('polynomial.newton_steps', 2) if polish else 0
+
+    eigenvalues = np.roots(coefficients).astype(complex)
+    scale = np.maximum(1.0, np.abs(eigenvalues))
+    polished = _newton(coefficients, eigenvalues, newton_steps)
+    real = np.abs(polished.imag) <= tolerance * scale
+
+    roots, multiplicity, complex_roots = [], [], []
+    radius = cluster_radius(len(eigenvalues))
+    pending = [(group, radius) for group in _group(eigenvalues, np.arange(len(eigenvalues)), radius)]
+    while pending:
+        members, radius = pending.pop()
+        if len(members) > 1 and not _separate(coefficients, polished[members], real[members], tolerance):
+            centre = eigenvalues[members].mean()
+            centre_scale = max(1.0, abs(centre))
+            spread = np.abs(eigenvalues[members] - centre).max()
+            if (spread <= cluster_radius(len(members)) * centre_scale
+                    and abs(centre.imag) <= tolerance * centre_scale
+                    and _certified(coefficients, centre.real, tolerance)):
+                roots.append(centre.real)
+                multiplicity.append(len(members))
+                continue
+
+            # Not one multiple root: split the group more finely
+            groups = [members]
+            while len(groups) == 1 and radius > EPS:
+                radius /= 10
+                groups = _group(eigenvalues, members, radius)
+            if len(groups) > 1:
+                pending.extend((group, radius) for group in groups)
+                continue
+
+        # Separate roots, however close
+        for i in members:
+            if real[i]:
+                roots.append(polished[i].real)
+                multiplicity.append(1)
+            else:
+                complex_roots.append(polished[i])
+
+    order = np.argsort(roots)
+    return (
+        np.array(roots, dtype=float)[order],
+        np.array(multiplicity, dtype=int)[order],
+        np.array(complex_roots, dtype=complex)
+    )
+
+
+def cluster_radius(multiplicity: int) -> float:
+    """Return the expected relative scatter of the eigenvalues of a root.
+
+    A root of multiplicity k is perturbed by about eps**(1/k) relative to
+    max(1, |root|); polynomial.cluster_factor gives the safety margin.
+    """
+    return config.get('polynomial.cluster_factor', 10) * EPS ** (1.0 / max(int(multiplicity), 1))
+
+
+def _group(eigenvalues: np.ndarray, members: np.ndarray, radius: float) -> List[np.ndarray]:
+    """Split members into groups of eigenvalues linked within the radius.
+
+    Single linkage: the smallest index is propagated through every pair
+    closer than radius * max(1, |eigenvalue|) until nothing changes.
+    """
+    values = eigenvalues[members]
+    scale = np.maximum(1.0, np.abs(values))
+    close = np.abs(values[:, None] - values[None, :]) <= radius * np.minimum(scale[:, None], scale[None, :])
+    labels = np.arange(len(values))
+    while True:
+        merged = np.where(close, labels[None, :], len(labels)).min(axis=1)
+        if np.array_equal(merged, labels):
+            break
+        labels = merged
+    return [members[labels == label] for label in np.unique(labels)]
+
+
+def _separate(coefficients: np.ndarray, polished: np.ndarray, real: np.ndarray, tolerance: float) -> bool:
+    """Whether a group consists of distinct real roots, each with a sign change."""
+    x = np.sort(polished.real)
+    return bool(np.all(real) and _sign_changes(coefficients, x, tolerance).all()
+                and np.all(np.diff(x) > tolerance))
+
+
+def _certified(coefficients: np.ndarray, x: float, tolerance: float) -> bool:
+    """Whether p changes sign within the tolerance of x or nearly vanishes at x."""
+    return bool(_sign_changes(coefficients, np.array([x]), tolerance)[0]
+                or abs(np.polyval(coefficients, x)) < tolerance)
+
+
+def _newton(coefficients: np.ndarray, z: np.ndarray, steps: int) -> np.ndarray:
+    """Apply Newton steps to every root at once, keeping only improvements."""
+    derivative = np.polyder(coefficients)
+    for _ in range(steps):
+        p = np.polyval(coefficients, z)
+        dp = np.polyval(derivative, z)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = np.where(dp != 0, z - p / dp, z)
+        better = np.isfinite(step) & (np.abs(np.polyval(coefficients, step)) <= np.abs(p))
+        z = np.where(better, step, z)
+    return z
+
+
+def _sign_changes(coefficients: np.ndarray, x: np.ndarray, tolerance: float) -> np.ndarray:
+    """Whether p changes sign (or vanishes) within the tolerance of each x."""
+    sides = np.polyval(coefficients, x[:, None] + np.array([-tolerance, tolerance]))
+    return sides[:, 0] * sides[:, 1] <= 0
@@ -1,7 +1,13 @@
 """Regula-Falsi (False Position) method for finding roots of equations."""
 import numpy as np
-from typing import Callable, Dict, Optional
+from typing import Callable, Dict, List, Optional, Tuple, Union
 from config_loader import config
+from iteration_log import IterationLog
+from expression import ARRAY_NAMESPACE, compile_expression
+
+# Available variants: classic false position, and the modified methods that
+# scale down the function value of an endpoint retained twice in a row
+VARIANTS = ("classic", "illinois", "pegasus", "anderson_bjorck")
 
 
 def regula_falsi_method(
@@ -9,7 +15,10 @@ def regula_falsi_method(
     a: float,
     b: float,
     max_iterations: Optional[int] = None,
-    tolerance: Optional[float] = None
+    tolerance: Optional[float] = None,
+    log_policy: Optional[str] = None,
+    variant: Optional[str] = None,
+    compare: Optional[bool] = None
 ) -> Dict:
     """Find root of equation using Regula-Falsi (False Position) method.
     
@@ -19,12 +28,26 @@ def regula_falsi_method(
     3. Replace a or b with c based on sign of f(c)
     4. Repeat until convergence
     
+    Classic Regula-Falsi keeps one endpoint fixed on convex functions and
+    converges only linearly. The modified variants scale the function value
+    of an endpoint that is retained twice in a row, so it gets replaced soon
+    after; they converge superlinearly at one evaluation per iteration:
+        illinois:        f_retained *= 1/2
+        pegasus:         f_retained *= f_old / (f_old + f(c))
+        anderson_bjorck: f_retained *= 1 - f(c)/f_old  (1/2 if not positive)
+    where f_old is the value at the endpoint being replaced by c.
+    
     Args:
         func_str: Function as string (e.g., "x**2 - 4")
         a: Left endpoint
         b: Right endpoint
         max_iterations: Maximum number of iterations
         tolerance: Convergence tolerance
+        log_policy: Iteration log retention policy (see iteration_log.IterationLog)
+        variant: "classic", "illinois", "pegasus" or "anderson_bjorck"
+            (uses regula_falsi.variant config)
+        compare: Also run every variant and report their iteration and
+            function-evaluation counts (uses regula_falsi.compare config)
         
     Returns:
         Dictionary containing:
@@ -32,121 +55,47 @@ def regula_falsi_method(
             - root: Approximate root
             - iterations: Number of iterations performed
             - error: Final error estimate
-            - iteration_log: List of iteration details
+            - iteration_log: Iteration details retained by the log policy
             - message: Status message
+            - function_evaluations: Number of evaluations of f
+            - variant: Variant used
+            - comparison: Per-variant success, iterations and
+              function_evaluations (only when compare)
     """
     # Load configuration
     if max_iterations is None:
         max_iterations = config.get('regula_falsi.max_iterations', 100)
     if tolerance is None:
         tolerance = config.get('regula_falsi.tolerance', 1e-6)
+    if variant is None:
+        variant = config.get('regula_falsi.variant', 'classic')
+    if compare is None:
+        compare = config.get('regula_falsi.compare', False)
     
     try:
-        # Create function from string
-        def f(x):
-            # Safe evaluation with numpy functions available
-            allowed_names = {
-                'x': x,
-                'np': np,
-                'sin': np.sin,
-                'cos': np.cos,
-                'tan': np.tan,
-                'exp': np.exp,
-                'log': np.log,
-                'sqrt': np.sqrt,
-                'abs': np.abs,
-                'pi': np.pi,
-                'e': np.e
-            }
-            return eval(func_str, {"__builtins__": {}}, allowed_names)
-        
-        # Evaluate function at endpoints
-        fa = f(a)
-        fb = f(b)
-        
-        # Check if root exists in interval
-        if fa * fb > 0:
-            return {
-                "success": False,
-                "root": None,
-                "iterations": 0,
-                "error": None,
-                "iteration_log": [],
-                "message": f"Function has same sign at both endpoints: f({a}) = {fa}, f({b}) = {fb}"
-            }
+        if variant not in VARIANTS:
+            raise ValueError(f"Unknown variant '{variant}'. Use one of: {', '.join(VARIANTS)}")
         
-        # Check if a or b is already a root
-        if abs(fa) < tolerance:
-            return {
-                "success": True,
-                "root": a,
-                "iterations": 0,
-                "error": 0.0,
-                "iteration_log": [],
-                "message": f"Initial point a = {a} is a root"
-            }
+        iteration_log = IterationLog(log_policy)
         
-        if abs(fb) < tolerance:
-            return {
-                "success": True,
-                "root": b,
-                "iterations": 0,
-                "error": 0.0,
-                "iteration_log": [],
-                "message": f"Initial point b = {b} is a root"
-            }
+        # Create function from string (compiled once, cached across calls)
+        f = compile_expression(func_str)
         
-        iteration_log = []
-        c_old = a
+        result = _regula_falsi(f, a, b, max_iterations, tolerance, variant, iteration_log)
+        result["variant"] = variant
         
-        for iteration in range(max_iterations):
-            # Regula-Falsi formula
-            c = (a * fb - b * fa) / (fb - fa)
-            fc = f(c)
-            
-            # Calculate error
-            error = abs(c - c_old) if iteration > 0 else abs(b - a)
-            
-            # Log iteration
-            iteration_log.append({
-                "iteration": iteration + 1,
-                "a": float(a),
-                "b": float(b),
-                "c": float(c),
-                "f(c)": float(fc),
-                "error": float(error)
-            })
-            
-            # Check convergence
-            if abs(fc) < tolerance or error < tolerance:
-                return {
-                    "success": True,
-                    "root": float(c),
-                    "iterations": iteration + 1,
-                    "error": float(error),
-                    "iteration_log": iteration_log,
-                    "message": f"Converged after {iteration + 1} iterations"
+        if compare:
+            comparison = {}
+            for name in VARIANTS:
+                run = _regula_falsi(f, a, b, max_iterations, tolerance, name, IterationLog("none"))
+                comparison[name] = {
+                    "success": run["success"],
+                    "iterations": run["iterations"],
+                    "function_evaluations": run["function_evaluations"]
                 }
-            
-            # Update interval
-            if fa * fc < 0:
-                b = c
-                fb = fc
-            else:
-                a = c
-                fa = fc
-            
-            c_old = c
+            result["comparison"] = comparison
         
-        # Did not converge
-        return {
-            "success": False,
-            "root": float(c),
-            "iterations": max_iterations,
-            "error": float(error),
-            "iteration_log": iteration_log,
-            "message": f"Did not converge after {max_iterations} iterations"
-        }
+        return result
     
     except ZeroDivisionError:
         return {
@@ -167,3 +116,360 @@ def regula_falsi_method(
             "iteration_log": [],
             "message": f"Error: {str(e)}"
         }
+
+
+def regula_falsi_batch(
+    func_str: str,
+    a: Union[float, List[float]],
+    b: Union[float, List[float]],
+    parameters: Optional[Dict[str, Union[float, List[float]]]] = None,
+    max_iterations: Optional[int] = None,
+    tolerance: Optional[float] = None,
+    variant: Optional[str] = None,
+    stop: str = "step"
+) -> Dict:
+    """Solve many independent Regula-Falsi problems at once.
+    
+    Problem s finds a root of f(x; p_s) in [a_s, b_s], where the parameters
+    are named symbols of func_str, e.g. "x**2 - p" with parameters
+    {"p": [1, 2, 3]}. a, b and every parameter array broadcast to a common
+    length m. The false-position updates of all problems run in lock step
+    on NumPy arrays, one array evaluation of f per iteration, and problems
+    are dropped from the active set as soon as they converge.
+    
+    Args:
+        func_str: Function of x and the parameter names, as string
+        a: Left endpoints (m, or a scalar shared by all problems)
+        b: Right endpoints (m, or a scalar)
+        parameters: Parameter arrays (m, or scalars) by symbol name
+        max_iterations: Maximum number of iterations
+        tolerance: Convergence tolerance, applied to every problem
+        variant: Regula-Falsi variant (see regula_falsi_method)
+        stop: "step" stops like regula_falsi_method, when |f(c)| or the
+            step is below the tolerance; "bracket" stops only when a root
+            is certified within the tolerance of c (the bracket is that
+            narrow, or f changes sign within it), which locates roots where
+            f is flat but needs a modified variant
+        
+    Returns:
+        Dictionary containing:
+            - success: Whether every problem converged
+            - roots: Approximate root per problem (m; None without a root)
+            - iterations: Iterations performed per problem (m)
+            - errors: Final error per problem (m)
+            - converged: Convergence flag per problem (m)
+            - status: "converged", "max_iterations", "same_sign" or
+              "invalid" (f or the update became non-finite) per problem (m)
+            - function_evaluations: Evaluations of f per problem (m)
+            - message: Status message
+    """
+    # Load configuration
+    if max_iterations is None:
+        max_iterations = config.get('regula_falsi.max_iterations', 100)
+    if tolerance is None:
+        tolerance = config.get('regula_falsi.tolerance', 1e-6)
+    if variant is None:
+        variant = config.get('regula_falsi.variant', 'classic')
+    if parameters is None:
+        parameters = {}
+    
+    try:
+        if variant not in VARIANTS:
+            raise ValueError(f"Unknown variant '{variant}'. Use one of: {', '.join(VARIANTS)}")
+        if stop not in ("step", "bracket"):
+            raise ValueError("stop must be 'step' or 'bracket'")
+        for name in parameters:
+            if name == "x" or name in ARRAY_NAMESPACE:
+                raise ValueError(f"Parameter name '{name}' is reserved")
+        
+        names = tuple(parameters)
+        f = compile_expression(func_str, ("x",) + names)
+        
+        arrays = np.broadcast_arrays(
+            *(np.atleast_1d(np.asarray(values, dtype=float)) for values in (a, b, *parameters.values()))
+        )
+        if arrays[0].ndim != 1:
+            raise ValueError("Brackets and parameters must be scalars or 1-D arrays")
+        a, b = arrays[0].copy(), arrays[1].copy()
+        params = arrays[2:]
+        m = len(a)
+        
+        def evaluate(x, rows):
+            return np.broadcast_to(
+                np.asarray(f.array(x, *(p[rows] for p in params)), dtype=float), x.shape
+            )
+        
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            everything = np.arange(m)
+            fa = evaluate(a, everything).copy()
+            fb = evaluate(b, everything).copy()
+            
+            roots = np.full(m, np.nan)
+            iterations = np.zeros(m, dtype=int)
+            evaluations = np.full(m, 2)
+            errors = np.full(m, np.nan)
+            converged = np.zeros(m, dtype=bool)
+            invalid = ~(np.isfinite(fa) & np.isfinite(fb))
+            same_sign = ~invalid & (fa * fb > 0)
+            
+            # Endpoints that already are roots
+            f_tolerance = tolerance if stop == "step" else 0.0
+            at_a = ~invalid & ~same_sign & ((np.abs(fa) < f_tolerance) | (fa == 0))
+            at_b = ~invalid & ~same_sign & ~at_a & ((np.abs(fb) < f_tolerance) | (fb == 0))
+            roots[at_a] = a[at_a]
+            roots[at_b] = b[at_b]
+            errors[at_a | at_b] = 0.0
+            converged[at_a | at_b] = True
+            
+            active = np.flatnonzero(~(invalid | same_sign | converged))
+            c_old = a.copy()
+            # Endpoint kept by the previous update: 0 none, 1 a, 2 b
+            retained = np.zeros(m, dtype=np.int8)
+            
+            for iteration in range(max_iterations):
+                if len(active) == 0:
+                    break
+                
+                a_act, b_act = a[active], b[active]
+                fa_act, fb_act = fa[active], fb[active]
+                
+                # Regula-Falsi formula on every active problem
+                c = (a_act * fb_act - b_act * fa_act) / (fb_act - fa_act)
+                fc = evaluate(c, active)
+                error = np.abs(c - c_old[active]) if iteration > 0 else np.abs(b_act - a_act)
+                
+                roots[active] = c
+                errors[active] = error
+                iterations[active] = iteration + 1
+                evaluations[active] += 1
+                
+                # Mask out the problems that converged or broke down
+                broken = ~(np.isfinite(c) & np.isfinite(fc))
+                invalid[active[broken]] = True
+                if stop == "step":
+                    done = ~broken & ((np.abs(fc) < tolerance) | (error < tolerance))
+                else:
+                    done = np.zeros(len(active), dtype=bool)
+                converged[active[done]] = True
+                
+                # Update the brackets of the rest
+                keep = ~(done | broken)
+                rows = active[keep]
+                c, fc = c[keep], fc[keep]
+                fa_act, fb_act = fa_act[keep], fb_act[keep]
+                left = fa_act * fc < 0
+                
+                scale_a = left & (retained[rows] == 1)
+                fa_act[scale_a] *= _retained_scale(variant, fb_act[scale_a], fc[scale_a])
+                scale_b = ~left & (retained[rows] == 2)
+                fb_act[scale_b] *= _retained_scale(variant, fa_act[scale_b], fc[scale_b])
+                
+                b[rows] = np.where(left, c, b[rows])
+                fb[rows] = np.where(left, fc, fb_act)
+                a[rows] = np.where(left, a[rows], c)
+                fa[rows] = np.where(left, fa_act, fc)
+                retained[rows] = np.where(left, 1, 2)
+                c_old[rows] = c
+                
+                if stop == "bracket":
+                    width = np.abs(b[rows] - a[rows])
+                    errors[rows] = width
+                    done = (fc == 0) | (width < tolerance)
+                    
+                    # A step below the tolerance is not enough on its own:
+                    # certify it with a sign change within the tolerance of
+                    # c, probing towards the other end of the bracket
+                    probe = ~done & (error[keep] < tolerance)
+                    if probe.any():
+                        other = np.where(left, a[rows], b[rows])[probe]
+                        x_probe = c[probe] + tolerance * np.sign(other - c[probe])
+                        f_probe = evaluate(x_probe, rows[probe])
+                        evaluations[rows[probe]] += 1
+                        certified = f_probe * fc[probe] <= 0
+                        errors[rows[probe][certified]] = tolerance
+                        done[np.flatnonzero(probe)[certified]] = True
+                    
+                    converged[rows[done]] = True
+                    rows = rows[~done]
+                active = rows
+        
+        status = np.where(
+            converged, "converged",
+            np.where(same_sign, "same_sign", np.where(invalid, "invalid", "max_iterations"))
+        )
+        n_converged = int(converged.sum())
+        
+        return {
+            "success": n_converged == m,
+            "roots": [None if s in ("same_sign", "invalid") else float(r) for r, s in zip(roots, status)],
+            "iterations": iterations.tolist(),
+            "errors": [None if np.isnan(e) else float(e) for e in errors],
+            "converged": converged.tolist(),
+            "status": status.tolist(),
+            "function_evaluations": evaluations.tolist(),
+            "message": f"{n_converged} of {m} problems converged"
+        }
+    
+    except Exception as e:
+        return {
+            "success": False,
+            "roots": None,
+            "iterations": None,
+            "errors": None,
+            "converged": None,
+            "status": None,
+            "function_evaluations": None,
+            "message": f"Error: {str(e)}"
+        }
+
+
+def _regula_falsi(
+    f: Callable,
+    a: float,
+    b: float,
+    max_iterations: int,
+    tolerance: float,
+    variant: str,
+    iteration_log: IterationLog
+) -> Dict:
+    """Run one Regula-Falsi variant on [a, b] and return its result dict."""
+    fa, fb, result = check_bracket(f, a, b, tolerance)
+    if result is not None:
+        return result
+    
+    c_old = a
+    # Endpoint kept by the previous update ("a" or "b")
+    retained = None
+    
+    for iteration in range(max_iterations):
+        # Regula-Falsi formula
+        c = (a * fb - b * fa) / (fb - fa)
+        fc = f(c)
+        
+        # Calculate error
+        error = abs(c - c_old) if iteration > 0 else abs(b - a)
+        
+        # Log iteration
+        iteration_log.record(iteration + 1, error, lambda: {
+            "a": float(a),
+            "b": float(b),
+            "c": float(c),
+            "f(c)": float(fc)
+        })
+        
+        # Check convergence
+        if abs(fc) < tolerance or error < tolerance:
+            return {
+                "success": True,
+                "root": float(c),
+                "iterations": iteration + 1,
+                "error": float(error),
+                "iteration_log": iteration_log.to_list(),
+                "message": f"Converged after {iteration + 1} iterations",
+                "function_evaluations": iteration + 3
+            }
+        
+        # Update interval; an endpoint retained twice in a row has its
+        # function value scaled down by the modified variants
+        if fa * fc < 0:
+            if retained == "a":
+                fa *= _retained_scale(variant, fb, fc)
+            b = c
+            fb = fc
+            retained = "a"
+        else:
+            if retained == "b":
+                fb *= _retained_scale(variant, fa, fc)
+            a = c
+            fa = fc
+            retained = "b"
+        
+        c_old = c
+    
+    # Did not converge
+    return {
+        "success": False,
+        "root": float(c),
+        "iterations": max_iterations,
+        "error": float(error),
+        "iteration_log": iteration_log.to_list(),
+        "message": f"Did not converge after {max_iterations} iterations",
+        "function_evaluations": max_iterations + 2
+    }
+
+
+def check_bracket(f: Callable, a: float, b: float, tolerance: float) -> Tuple[float, float, Optional[Dict]]:
+    """Evaluate f at both endpoints and check that [a, b] brackets a root.
+    
+    Shared by the bracketing root finders.
+    
+    Args:
+        f: Function to evaluate
+        a: Left endpoint
+        b: Right endpoint
+        tolerance: Tolerance on |f| for accepting an endpoint as the root
+        
+    Returns:
+        (f(a), f(b), result), where result is the finished result dict when
+        the signs agree or an endpoint already is a root, and None otherwise
+    """
+    # Evaluate function at endpoints
+    fa = f(a)
+    fb = f(b)
+    
+    # Check if root exists in interval
+    if fa * fb > 0:
+        return fa, fb, {
+            "success": False,
+            "root": None,
+            "iterations": 0,
+            "error": None,
+            "iteration_log": [],
+            "message": f"Function has same sign at both endpoints: f({a}) = {fa}, f({b}) = {fb}",
+            "function_evaluations": 2
+        }
+    
+    # Check if a or b is already a root
+    if abs(fa) < tolerance:
+        return fa, fb, {
+            "success": True,
+            "root": a,
+            "iterations": 0,
+            "error": 0.0,
+            "iteration_log": [],
+            "message": f"Initial point a = {a} is a root",
+            "function_evaluations": 2
+        }
+    
+    if abs(fb) < tolerance:
+        return fa, fb, {
+            "success": True,
+            "root": b,
+            "iterations": 0,
+            "error": 0.0,
+            "iteration_log": [],
+            "message": f"Initial point b = {b} is a root",
+            "function_evaluations": 2
+        }
+    
+    return fa, fb, None
+
+
+def _retained_scale(variant: str, f_old: float, f_new: float) -> float:
+    """Return the factor applied to the retained endpoint's function value.
+
+    Works elementwise on arrays for regula_falsi_batch.
+    
+    Args:
+        variant: Regula-Falsi variant
+        f_old: Function value(s) at the endpoint being replaced
+        f_new: Function value(s) at the new point (same sign as f_old)
+    """
+    if variant == "illinois":
+        return 0.5
+    if variant == "pegasus":
+        return f_old / (f_old + f_new)
+    if variant == "anderson_bjorck":
+        m = 1 - f_new / f_old
+        return np.where(m > 0, m, 0.5)
+    return 1.0
@@ -0,0 +1,252 @@
+"""Bracket discovery and all-roots search on an interval."""
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+from config_loader import config
+from expression import compile_expression
+from polynomial import cluster_radius, companion_roots
+from regula_falsi import VARIANTS, regula_falsi_batch
+
+
+def find_all_roots(
+    func_str: str,
+    a: float,
+    b: float,
+    grid_points: Optional[int] = None,
+    max_refinements: Optional[int] = None,
+    tolerance: Optional[float] = None,
+    max_iterations: Optional[int] = None,
+    variant: Optional[str] = None,
+    polynomial: Optional[bool] = None
+) -> Dict:
+    """Find every root of f in [a, b].
+
+    Polynomials (detected when the expression is parsed) take a fast path:
+    all roots come at once from the companion-matrix eigenvalues (see
+    polynomial.companion_roots), and those in [a, b] are returned. Any
+    other expression, and any polynomial with a complex root in [a, b] too
+    close to the real axis to classify, is searched as follows:
+
+    1. f is sampled on a uniform grid of grid_points in one array evaluation;
+       every sign change between neighbouring samples is a bracket.
+    2. Where |f| dips towards zero without changing sign, a parabola through
+       the three samples around the dip is checked: if its vertex reaches
+       zero, the dip may hide a double root or two close roots, and its
+       cells are resampled more finely. All such dips of one level are
+       resampled in one evaluation, for up to max_refinements levels; new
+       sign changes become brackets, and a dip narrower than the tolerance
+       is a root where f touches zero.
+    3. All brackets are solved together with regula_falsi_batch.
+
+    Args:
+        func_str: Function as string (e.g., "sin(x)")
+        a: Left end of the search interval
+        b: Right end of the search interval
+        grid_points: Samples of the initial grid (uses root_search.grid_points)
+        max_refinements: Refinement levels for dips (uses root_search.max_refinements)
+        tolerance: Root tolerance (uses root_search.tolerance)
+        max_iterations: Iteration limit per bracket (uses root_search.max_iterations)
+        variant: Regula-Falsi variant for the brackets (uses root_search.variant;
+            a modified variant, since brackets must shrink to the tolerance)
+        polynomial: Use the companion-matrix fast path for polynomials
+            (uses root_search.polynomial)
+
+    Returns:
+        Dictionary containing:
+            - success: Whether every bracket converged
+            - roots: Sorted roots found in [a, b]
+            - count: Number of roots
+            - brackets: Sign-change brackets [lo, hi] that were solved
+            - even_multiplicity: Roots where f touches zero without changing
+              sign (double roots and the like)
+            - function_evaluations: Total evaluations of f (0 on the
+              polynomial fast path, which works on the coefficients)
+            - method: "companion" (polynomial fast path) or "bracketing"
+            - message: Status message
+    """
+    # Load configuration
+    if grid_points is None:
+        grid_points = config.get('root_search.grid_points', 200)
+    if max_refinements is None:
+        max_refinements = config.get('root_search.max_refinements', 10)
+    if tolerance is None:
+        tolerance = config.get('root_search.tolerance', 1e-8)
+    if max_iterations is None:
+        max_iterations = config.get('root_search.max_iterations', 100)
+    if variant is None:
+        variant = config.get('root_search.variant', 'illinois')
+    if polynomial is None:
+        polynomial = config.get('root_search.polynomial', True)
+    refine_points = config.get('root_search.refine_points', 16)
+
+    try:
+        if not a < b:
+            raise ValueError("The search interval needs a < b")
+        if grid_points < 3:
+            raise ValueError("grid_points must be at least 3")
+        if variant not in VARIANTS or variant == "classic":
+            raise ValueError(f"Unknown variant '{variant}'. Use one of: {', '.join(VARIANTS[1:])}")
+
+        f = compile_expression(func_str)
+
+        fast_path = polynomial and f.coefficients is not None and len(f.coefficients) > 1
+        if fast_path:
+            roots, multiplicity, complex_roots = companion_roots(f.coefficients, True, tolerance)
+            inside = (roots >= a) & (roots <= b)
+            roots, multiplicity = roots[inside], multiplicity[inside]
+
+            # A complex root within the eigenvalue scatter of the real axis
+            # may be a badly resolved real root: let the bracketing search
+            # decide instead
+            near_axis = np.abs(complex_roots.imag) <= (
+                cluster_radius(len(f.coefficients) - 1) * np.maximum(1.0, np.abs(complex_roots))
+            )
+            fast_path = not np.any(near_axis & (complex_roots.real >= a) & (complex_roots.real <= b))
+
+        if fast_path:
+            return {
+                "success": True,
+                "roots": roots.tolist(),
+                "count": len(roots),
+                "brackets": [],
+                "even_multiplicity": roots[multiplicity % 2 == 0].tolist(),
+                "function_evaluations": 0,
+                "method": "companion",
+                "message": f"Found {len(roots)} roots in [{a}, {b}]"
+            }
+
+        def evaluate(x):
+            with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+                return np.broadcast_to(np.asarray(f.array(x), dtype=float), x.shape)
+
+        x = np.linspace(a, b, grid_points)[None, :]
+        fx = evaluate(x)
+        evaluations = grid_points
+
+        brackets, zeros, dips = _scan(x, fx, tolerance)
+        touching = []
+
+        for level in range(max_refinements):
+            if len(dips) == 0:
+                break
+            # Resample every dip of this level in one evaluation
+            x = dips[:, :1] + (dips[:, 1:] - dips[:, :1]) * np.linspace(0, 1, refine_points)
+            fx = evaluate(x)
+            evaluations += x.size
+
+            more_brackets, more_zeros, dips = _scan(x, fx, tolerance)
+            brackets = np.vstack([brackets, more_brackets])
+            zeros = np.concatenate([zeros, more_zeros])
+
+            # Dips that reach the tolerance are roots where f touches zero
+            if len(dips):
+                narrow = dips[:, 1] - dips[:, 0] <= tolerance
+                touching.extend(dips[narrow].mean(axis=1).tolist())
+                dips = dips[~narrow]
+
+        # Dips still open after the last level: keep those that reached zero
+        if len(dips):
+            centre = dips.mean(axis=1)
+            reached = np.abs(evaluate(centre)) < tolerance
+            evaluations += len(centre)
+            touching.extend(centre[reached].tolist())
+
+        roots = zeros.tolist() + touching
+        success = True
+        if len(brackets):
+            # Stop on the bracket width: near a multiple root |f| and the
+            # steps become tiny well before the root is located
+            batch = regula_falsi_batch(
+                func_str, brackets[:, 0].tolist(), brackets[:, 1].tolist(),
+                max_iterations=max_iterations, tolerance=tolerance, variant=variant,
+                stop="bracket"
+            )
+            evaluations += sum(batch["function_evaluations"])
+            success = batch["success"]
+
+            # A sign change across a pole converges to the pole; a root has
+            # a smaller |f| than the bracket ends
+            found = np.array([r if ok else np.nan for r, ok in zip(batch["roots"], batch["converged"])])
+            ends = np.abs(evaluate(brackets)).max(axis=1)
+            at_root = np.abs(evaluate(found)) <= ends
+            evaluations += 3 * len(brackets)
+            roots.extend(found[at_root].tolist())
+
+        roots = np.array(_unique(sorted(roots), tolerance))
+
+        # Classify every root by the sign of f just either side of it: this
+        # also covers exact zeros of the grid and roots found in dips
+        sides = evaluate(roots[:, None] + np.array([-2.0, 2.0]) * tolerance)
+        evaluations += sides.size
+        even = roots[sides[:, 0] * sides[:, 1] > 0]
+
+        return {
+            "success": success,
+            "roots": roots.tolist(),
+            "count": len(roots),
+            "brackets": brackets.tolist(),
+            "even_multiplicity": even.tolist(),
+            "function_evaluations": int(evaluations),
+            "method": "bracketing",
+            "message": f"Found {len(roots)} roots in [{a}, {b}]"
+        }
+
+    except Exception as e:
+        return {
+            "success": False,
+            "roots": None,
+            "count": 0,
+            "brackets": [],
+            "even_multiplicity": [],
+            "function_evaluations": 0,
+            "method": None,
+            "message": f"Error: {str(e)}"
+        }
+
+
+def _scan(x: np.ndarray, fx: np.ndarray, tolerance: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Classify the cells of sampled rows.
+
+    Args:
+        x: Sample points, one row per interval (k, n)
+        fx: f at the sample points (k, n)
+        tolerance: Tolerance on |f| at a parabola vertex
+
+    Returns:
+        (brackets, zeros, dips): sign-change cells (m, 2), samples where f is
+        exactly 0, and the two-cell intervals (d, 2) around dips of |f|
+        whose parabola reaches (or heads well towards) zero
+    """
+    x0, x1, x2 = x[:, :-2], x[:, 1:-1], x[:, 2:]
+    f0, f1, f2 = fx[:, :-2], fx[:, 1:-1], fx[:, 2:]
+
+    change = fx[:, :-1] * fx[:, 1:] < 0
+    brackets = np.stack([x[:, :-1][change], x[:, 1:][change]], axis=1)
+    zeros = x[fx == 0]
+
+    # Interior local minima of |f| without a sign change around them
+    same_sign = (f0 * f1 > 0) & (f1 * f2 > 0)
+    minimum = same_sign & (np.abs(f1) <= np.abs(f0)) & (np.abs(f1) <= np.abs(f2))
+
+    # Vertex of the parabola through the three samples
+    with np.errstate(divide="ignore", invalid="ignore"):
+        d1 = (f1 - f0) / (x1 - x0)
+        d2 = (f2 - f1) / (x2 - x1)
+        curvature = (d2 - d1) / (x2 - x0)
+        xv = 0.5 * (x0 + x1) - d1 / (2 * curvature)
+        fv = f0 + d1 * (xv - x0) + curvature * (xv - x0) * (xv - x1)
+    # Refine when the vertex crosses zero, or lies well below the sampled
+    # minimum (the samples are still far from the bottom of the dip)
+    reaches_zero = (fv * np.sign(f1) <= 0) | (np.abs(fv) < tolerance) | (np.abs(fv) < 0.5 * np.abs(f1))
+    dip = minimum & (curvature != 0) & reaches_zero
+    dips = np.stack([x0[dip], x2[dip]], axis=1)
+
+    return brackets, zeros, dips
+
+
+def _unique(values: List[float], tolerance: float) -> List[float]:
+    """Merge sorted values closer than the tolerance."""
+    merged = []
+    for value in values:
+        if not merged or value - merged[-1] > tolerance:
+            merged.append(float(value))
+    return merged
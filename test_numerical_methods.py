@@ -1,11 +1,29 @@
 """Comprehensive test suite for all numerical methods."""
+import os
+import signal
+import time
+import warnings
 import pytest
 import numpy as np
-from jacobi import jacobi_method, check_diagonal_dominance
-from regula_falsi import regula_falsi_method
+from jacobi import (
+    jacobi_method, jacobi_batch, check_diagonal_dominance, diagonal_dominance_report,
+    estimate_spectral_radius, find_dominant_permutation
+)
+from gauss_seidel import gauss_seidel_method, sor_method
+from conjugate_gradient import conjugate_gradient_method
+from linear_operators import BandedOperator, CSRMatrix, CallableOperator, DenseOperator, StencilOperator
+from operator_cache import OperatorCache, operator_cache
+from checkpoint import Checkpointer
+from parallel_jacobi import ParallelSweep, max_workers
+from regula_falsi import regula_falsi_method, regula_falsi_batch
+from brent import brent_method
+from root_search import find_all_roots
+from polynomial import polynomial_roots
 from forward_fd import forward_finite_difference
 from backward_fd import backward_finite_difference
 from center_fd import center_finite_difference
+from finite_difference import stencil
+from expression import ExpressionError, compile_expression
 
 
 # ============================================================================
@@ -85,6 +103,325 @@ class TestJacobiMethod:
         assert result["success"] == False
         assert "diagonal" in result["message"]
     
+    def test_jacobi_engines_agree(self):
+        """Test that the vectorized engine matches the reference loop."""
+        A = [[10, 2, -1, 0], [1, 8, 2, 1], [0, 1, 6, 2], [2, 0, 1, 9]]
+        b = [7, -3, 4, 12]
+        
+        vectorized = jacobi_method(A, b, tolerance=1e-10, engine="vectorized")
+        reference = jacobi_method(A, b, tolerance=1e-10, engine="reference")
+        
+        assert vectorized["success"] == True
+        assert vectorized["iterations"] == reference["iterations"]
+        assert np.allclose(vectorized["solution"], reference["solution"], atol=1e-12)
+    
+    def test_jacobi_parallel_engine_matches_serial(self):
+        """Test that the shared-memory parallel engine matches the serial engine."""
+        rng = np.random.default_rng(0)
+        n = 60
+        A = rng.uniform(-1, 1, (n, n))
+        A[np.arange(n), np.arange(n)] = n
+        b = rng.uniform(-1, 1, n)
+        
+        serial = jacobi_method(A, b, tolerance=1e-12)
+        parallel = jacobi_method(A, b, tolerance=1e-12, engine="parallel", workers=3)
+        
+        assert parallel["success"] == True
+        assert parallel["iterations"] == serial["iterations"]
+        assert np.allclose(parallel["solution"], serial["solution"], rtol=0, atol=1e-12)
+    
+    def test_parallel_sweep_caps_workers(self):
+        """Test that the worker count is capped at the CPU count."""
+        n = 4 * max_workers() + 4
+        A = DenseOperator(np.eye(n) * 4)
+        
+        with ParallelSweep(A, workers=10 * n) as sweep:
+            assert sweep.workers == min(n, max_workers())
+            assert np.allclose(sweep(np.zeros(n), np.ones(n)), 0.25)
+    
+    def test_parallel_sweep_dead_worker(self):
+        """Test that a sweep fails instead of hanging when a worker dies."""
+        A = DenseOperator(np.eye(4) * 4)
+        
+        with ParallelSweep(A, workers=min(2, max_workers()), timeout=5) as sweep:
+            # Kill a worker while it idles between sweeps, and wait until
+            # it is gone, so the sweep always meets a dead worker
+            sweep._processes[0].kill()
+            sweep._processes[0].join()
+            
+            start = time.perf_counter()
+            with pytest.raises(RuntimeError, match="worker died"):
+                sweep(np.zeros(4), np.ones(4))
+            assert time.perf_counter() - start < 5
+            
+            # The pool was restarted
+            assert all(process.is_alive() for process in sweep._processes)
+            assert np.allclose(sweep(np.zeros(4), np.ones(4)), 0.25)
+    
+    @pytest.mark.skipif(not hasattr(signal, "SIGSTOP"), reason="needs SIGSTOP")
+    def test_parallel_sweep_stalled_worker(self):
+        """Test that a worker that stops responding fails the sweep after the timeout."""
+        A = DenseOperator(np.eye(4) * 4)
+        
+        with ParallelSweep(A, workers=min(2, max_workers()), timeout=0.5) as sweep:
+            os.kill(sweep._processes[0].pid, signal.SIGSTOP)
+            
+            with pytest.raises(RuntimeError, match="no result within"):
+                sweep(np.zeros(4), np.ones(4))
+            assert np.allclose(sweep(np.zeros(4), np.ones(4)), 0.25)
+    
+    def test_jacobi_parallel_engine_requires_dense(self):
+        """Test that the parallel engine rejects sparse input."""
+        A = CSRMatrix.from_dense([[4, -1], [-1, 4]])
+        
+        result = jacobi_method(A, [5, 0], engine="parallel", workers=2)
+        
+        assert result["success"] == False
+        assert "dense" in result["message"]
+    
+    def test_jacobi_unknown_engine(self):
+        """Test Jacobi with an unknown engine name."""
+        result = jacobi_method([[4, -1], [-1, 4]], [5, 0], engine="magic")
+        
+        assert result["success"] == False
+        assert "Unknown engine" in result["message"]
+    
+    def test_jacobi_sparse_matches_dense(self):
+        """Test Jacobi with a CSR matrix against the dense solve."""
+        A = [[4, -1, 0], [-1, 4, -1], [0, -1, 4]]
+        b = [5, 0, 6]
+        A_csr = {
+            "indptr": [0, 2, 5, 7],
+            "indices": [0, 1, 0, 1, 2, 1, 2],
+            "data": [4, -1, -1, 4, -1, -1, 4]
+        }
+        
+        dense = jacobi_method(A, b, tolerance=1e-10)
+        sparse = jacobi_method(A_csr, b, tolerance=1e-10)
+        
+        assert sparse["success"] == True
+        assert sparse["iterations"] == dense["iterations"]
+        assert np.allclose(sparse["solution"], dense["solution"])
+    
+    def test_jacobi_sparse_large_tridiagonal(self):
+        """Test sparse Jacobi on a system too large to want dense storage."""
+        n = 20000
+        main = np.full(n, 4.0)
+        off = np.full(n - 1, -1.0)
+        rows = np.concatenate([np.arange(n), np.arange(n - 1), np.arange(1, n)])
+        cols = np.concatenate([np.arange(n), np.arange(1, n), np.arange(n - 1)])
+        vals = np.concatenate([main, off, off])
+        order = np.lexsort((cols, rows))
+        indptr = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=n))])
+        A = CSRMatrix(indptr, cols[order], vals[order])
+        x_true = np.linspace(-1, 1, n)
+        b = A.matvec(x_true)
+        
+        result = jacobi_method(A, b, tolerance=1e-10, max_iterations=200)
+        
+        assert result["success"] == True
+        assert np.allclose(result["solution"], x_true, atol=1e-8)
+    
+    def test_jacobi_multiple_right_hand_sides(self):
+        """Test Jacobi with an n x k block of right-hand sides."""
+        A = [[4, -1, 0], [-1, 4, -1], [0, -1, 4]]
+        B = [[5, 0, 1], [0, 0, 2], [6, 0, 3]]
+        
+        result = jacobi_method(A, B, tolerance=1e-10)
+        
+        assert result["success"] == True
+        X = np.array(result["solution"])
+        assert X.shape == (3, 3)
+        assert np.allclose(np.array(A) @ X, B, atol=1e-8)
+        
+        # The zero column converges immediately and is frozen
+        assert result["column_iterations"][1] == 1
+        assert result["column_iterations"][0] > 1
+        assert all(result["column_converged"])
+        
+        single = jacobi_method(A, [1, 2, 3], tolerance=1e-10)
+        assert result["column_iterations"][2] == single["iterations"]
+        assert np.allclose(X[:, 2], single["solution"])
+    
+    def test_jacobi_log_policies(self):
+        """Test iteration log retention policies."""
+        A = [[4, -1, 0], [-1, 4, -1], [0, -1, 4]]
+        b = [5, 0, 6]
+        
+        full = jacobi_method(A, b, tolerance=1e-10, log_policy="full")
+        n_iter = full["iterations"]
+        assert len(full["iteration_log"]) == n_iter
+        
+        none = jacobi_method(A, b, tolerance=1e-10, log_policy="none")
+        assert none["iteration_log"] == []
+        assert none["solution"] == full["solution"]
+        
+        every = jacobi_method(A, b, tolerance=1e-10, log_policy="every:5")
+        assert [e["iteration"] for e in every["iteration_log"]] == list(range(5, n_iter + 1, 5))
+        
+        last = jacobi_method(A, b, tolerance=1e-10, log_policy="last:3")
+        assert last["iteration_log"] == full["iteration_log"][-3:]
+        
+        summary = jacobi_method(A, b, tolerance=1e-10, log_policy="summary")
+        assert len(summary["iteration_log"]) == n_iter
+        assert set(summary["iteration_log"][0]) == {"iteration", "error"}
+    
+    def test_jacobi_invalid_log_policy(self):
+        """Test Jacobi with an unknown log policy."""
+        result = jacobi_method([[4, -1], [-1, 4]], [5, 0], log_policy="sometimes")
+        
+        assert result["success"] == False
+        assert "log policy" in result["message"]
+    
+    def test_jacobi_spectral_precheck(self):
+        """Test the spectral radius estimate and iteration prediction."""
+        A = [[4, -1, 0], [-1, 4, -1], [0, -1, 4]]
+        M = np.eye(3) - np.diag([0.25] * 3) @ np.array(A)
+        rho = max(abs(np.linalg.eigvals(M)))
+        
+        assert abs(estimate_spectral_radius(A) - rho) < 1e-3
+        
+        result = jacobi_method(A, [5, 0, 6], tolerance=1e-6)
+        estimate = result["convergence_estimate"]
+        assert estimate["predicted_to_converge"] == True
+        assert abs(estimate["predicted_iterations"] - result["iterations"]) <= 2
+        assert result["divergence_detected"] == False
+    
+    def test_jacobi_predicted_divergence(self):
+        """Test that a divergent iteration is rejected before sweeping."""
+        result = jacobi_method([[1, 10], [1, 1]], [1, 2], max_iterations=10000)
+        
+        assert result["success"] == False
+        assert result["iterations"] == 0
+        assert result["divergence_detected"] == True
+        assert result["convergence_estimate"]["spectral_radius"] > 1
+        assert "Predicted divergence" in result["message"]
+    
+    def test_jacobi_divergence_monitor(self):
+        """Test that the online monitor aborts a diverging run early."""
+        from jacobi import _jacobi_single, SWEEP_ENGINES
+        from iteration_log import IterationLog
+        from linear_operators import as_operator
+        
+        sweep = SWEEP_ENGINES["vectorized"](as_operator([[1, 1.02], [1, 1]]))
+        result = _jacobi_single(sweep, np.array([1.0, 2.0]), np.zeros(2), 10000, 1e-6,
+                                IterationLog("none"), 5)
+        
+        assert result["success"] == False
+        assert result["divergence_detected"] == True
+        assert result["iterations"] < 20
+    
+    def test_jacobi_batch(self):
+        """Test batched Jacobi against individual solves."""
+        rng = np.random.default_rng(0)
+        m, n = 200, 6
+        A = rng.uniform(-1, 1, (m, n, n))
+        A[:, np.arange(n), np.arange(n)] = np.linspace(n + 1, 3 * n, m)[:, None]
+        b = rng.uniform(-1, 1, (m, n))
+        A[7, 3, 3] = 0.0
+        
+        result = jacobi_batch(A, b, tolerance=1e-10)
+        
+        assert result["status"][7] == "zero_diagonal"
+        assert sum(result["converged"]) == m - 1
+        for s in (0, 50, 199):
+            single = jacobi_method(A[s], b[s], tolerance=1e-10)
+            assert result["iterations"][s] == single["iterations"]
+            assert np.allclose(result["solutions"][s], single["solution"])
+        
+        # Better-conditioned systems converge earlier and are masked out
+        assert result["iterations"][199] < result["iterations"][0]
+    
+    def test_jacobi_batch_invalid_shape(self):
+        """Test batched Jacobi with mismatched shapes."""
+        result = jacobi_batch(np.ones((3, 2, 2)), np.ones((3, 3)))
+        
+        assert result["success"] == False
+        assert "shape" in result["message"]
+    
+    def test_jacobi_matrix_free_operators(self):
+        """Test Jacobi with a named stencil and with a matvec callable."""
+        A = [[4, -1, 0], [-1, 4, -1], [0, -1, 4]]
+        b = [5, 0, 6]
+        dense = jacobi_method(A, b, tolerance=1e-10)
+        
+        A_np = np.array(A, dtype=float)
+        callable_op = CallableOperator(lambda x: A_np @ x, np.diag(A_np))
+        result = jacobi_method(callable_op, b, tolerance=1e-10)
+        assert result["iterations"] == dense["iterations"]
+        assert np.allclose(result["solution"], dense["solution"])
+        
+        stencil = {"stencil": "laplacian_3pt", "grid_shape": [3], "coefficients": {"center": 4}}
+        result = jacobi_method(stencil, b, tolerance=1e-10)
+        assert result["iterations"] == dense["iterations"]
+        assert np.allclose(result["solution"], dense["solution"])
+    
+    def test_jacobi_callable_stays_matrix_free(self):
+        """Test that row permutation never materializes a callable operator."""
+        A_np = np.array([[4, -1, 0], [-1, 4, -1], [0, -1, 4]], dtype=float)
+        callable_op = CallableOperator(lambda x: A_np @ x, np.diag(A_np))
+        
+        dense_calls = []
+        callable_op.to_dense = lambda: dense_calls.append(1) or A_np
+        
+        result = jacobi_method(callable_op, [5, 0, 6], tolerance=1e-10, permute_rows=True)
+        
+        assert result["success"] == True
+        assert dense_calls == []
+        assert np.allclose(A_np @ result["solution"], [5, 0, 6])
+    
+    def test_jacobi_banded_matches_dense(self):
+        """Test Jacobi on banded storage against the dense solve."""
+        diagonals = [[-1, 2], [-1, -1, -1], [6, 6, 6, 6], [-1, -1, -1], [1, -1]]
+        offsets = [-2, -1, 0, 1, 2]
+        A = BandedOperator(diagonals, offsets)
+        dense_A = sum(np.diag(d, k) for d, k in zip(diagonals, offsets))
+        b = [1, 2, 3, 4]
+        
+        assert np.allclose(A.to_dense(), dense_A)
+        assert np.allclose(A.matvec(np.arange(4.0)), dense_A @ np.arange(4.0))
+        
+        dense = jacobi_method(dense_A, b, tolerance=1e-10)
+        banded = jacobi_method({"diagonals": diagonals, "offsets": offsets}, b, tolerance=1e-10)
+        
+        assert banded["success"] == True
+        assert banded["iterations"] == dense["iterations"]
+        assert np.allclose(banded["solution"], dense["solution"])
+    
+    def test_jacobi_banded_large_tridiagonal(self):
+        """Test banded Jacobi on a tridiagonal system with a million unknowns."""
+        n = 1_000_000
+        A = BandedOperator([-np.ones(n - 1), np.full(n, 4.0), -np.ones(n - 1)], [-1, 0, 1])
+        x_true = np.sin(np.linspace(0, 10, n))
+        
+        result = jacobi_method(A, A.matvec(x_true), tolerance=1e-10, log_policy="none")
+        
+        assert result["success"] == True
+        assert np.allclose(result["solution"], x_true, atol=1e-8)
+    
+    def test_jacobi_invalid_banded(self):
+        """Test Jacobi with diagonals whose lengths do not fit their offsets."""
+        result = jacobi_method({"diagonals": [[4, 4, 4], [-1, -1, -1]], "offsets": [0, 1]}, [1, 1, 1])
+        
+        assert result["success"] == False
+        assert "n - |k|" in result["message"]
+    
+    def test_jacobi_invalid_stencil(self):
+        """Test Jacobi with a stencil that does not match its grid."""
+        result = jacobi_method({"stencil": "laplacian_5pt", "grid_shape": [10]}, np.ones(10))
+        
+        assert result["success"] == False
+        assert "2D grid_shape" in result["message"]
+    
+    def test_check_diagonal_dominance_sparse(self):
+        """Test diagonal dominance checker on CSR input."""
+        A = CSRMatrix.from_dense([[1, 10, 1], [1, 10, 1], [1, 1, 10]])
+        
+        is_dominant, msg = check_diagonal_dominance(A)
+        
+        assert is_dominant == False
+        assert "Row 1" in msg
+    
     def test_check_diagonal_dominance(self):
         """Test diagonal dominance checker."""
         A_dominant = [[10, 1, 1], [1, 10, 1], [1, 1, 10]]
@@ -96,6 +433,383 @@ class TestJacobiMethod:
         is_dominant, msg = check_diagonal_dominance(A_not_dominant)
         assert is_dominant == False
 
+    def test_diagonal_dominance_report_lists_every_failing_row(self):
+        """Test that the dominance report returns all failing rows with margins."""
+        A = [[1, 10, 1], [1, 10, 1], [10, 1, 1]]
+
+        report = diagonal_dominance_report(A)
+
+        assert report["is_dominant"] == False
+        assert report["failing_rows"] == [1, 3]
+        assert report["margins"] == [-10.0, -10.0]
+        assert "Row 3" in report["message"]
+
+    def test_jacobi_row_permutation(self):
+        """Test that Jacobi reorders rows to reach diagonal dominance."""
+        A = [[1, 10, 1], [1, 1, 10], [10, 1, 1]]
+        b = [12, 12, 12]
+
+        assert find_dominant_permutation(A).tolist() == [2, 0, 1]
+        assert find_dominant_permutation(CSRMatrix.from_dense(A)).tolist() == [2, 0, 1]
+
+        result = jacobi_method(A, b, tolerance=1e-10)
+        assert result["success"] == True
+        assert result["row_permutation"] == [2, 0, 1]
+        assert np.allclose(result["solution"], [1, 1, 1])
+
+        unpermuted = jacobi_method(A, b, tolerance=1e-10, permute_rows=False)
+        assert unpermuted["success"] == False
+
+    def test_find_dominant_permutation_none(self):
+        """Test that no permutation is reported when none is dominant."""
+        assert find_dominant_permutation([[1, 10], [1, 1]]) is None
+        assert find_dominant_permutation([[1, 10], [1, 10]]) is None
+
+    @pytest.mark.parametrize("acceleration", ["chebyshev", "anderson"])
+    def test_jacobi_acceleration(self, acceleration):
+        """Test that acceleration cuts the sweeps on a slowly converging system."""
+        n = 100
+        A = np.diag(np.full(n, 2.05)) - np.diag(np.ones(n - 1), 1) - np.diag(np.ones(n - 1), -1)
+        b = np.ones(n)
+
+        result = jacobi_method(A, b, tolerance=1e-10, max_iterations=20000,
+                               acceleration=acceleration, measure_baseline=True)
+        report = result["acceleration"]
+
+        assert result["success"] == True
+        assert np.allclose(A @ result["solution"], b, atol=1e-8)
+        assert report["baseline"] == "measured"
+        assert report["iterations"] == result["iterations"]
+        assert report["unaccelerated_iterations"] > 3 * result["iterations"]
+        assert report["speedup"] > 3
+
+    def test_jacobi_acceleration_estimated_baseline(self):
+        """Test that the unaccelerated count defaults to the spectral prediction."""
+        A = [[4, -1, 0], [-1, 4, -1], [0, -1, 4]]
+
+        result = jacobi_method(A, [15, 10, 10], tolerance=1e-10, acceleration="anderson")
+
+        assert result["acceleration"]["baseline"] == "estimated"
+        assert (result["acceleration"]["unaccelerated_iterations"]
+                == result["convergence_estimate"]["predicted_iterations"])
+
+    def test_jacobi_unknown_acceleration(self):
+        """Test Jacobi with an unknown acceleration scheme."""
+        result = jacobi_method([[4, -1], [-1, 4]], [5, 0], acceleration="magic")
+
+        assert result["success"] == False
+        assert "Unknown acceleration" in result["message"]
+
+    def test_jacobi_checkpoint_resume(self, tmp_path, monkeypatch):
+        """Test that a resumed run continues exactly where it stopped."""
+        monkeypatch.chdir(tmp_path)
+        n = 50
+        A = np.diag(np.full(n, 2.1)) - np.diag(np.ones(n - 1), 1) - np.diag(np.ones(n - 1), -1)
+        b = np.ones(n)
+
+        full = jacobi_method(A, b, tolerance=1e-10, max_iterations=2000)
+        first = jacobi_method(A, b, tolerance=1e-10, max_iterations=40, checkpoint=True)
+        token = first["resume_token"]
+
+        assert first["success"] == False
+        assert (tmp_path / "checkpoints" / f"{token}.npz").exists()
+
+        resumed = jacobi_method(A, b, tolerance=1e-10, max_iterations=2000, resume_token=token)
+
+        assert resumed["success"] == True
+        assert resumed["resumed_from_iteration"] == 40
+        assert resumed["iterations"] == full["iterations"]
+        assert resumed["solution"] == full["solution"]
+        assert resumed["resume_token"] is None
+        assert not (tmp_path / "checkpoints" / f"{token}.npz").exists()
+
+    def test_checkpoint_pruning(self, tmp_path):
+        """Test that expired and surplus checkpoints are deleted on save."""
+        directory = tmp_path / "checkpoints"
+        directory.mkdir()
+        for age, name in [(7200, "expired"), (30, "oldest"), (20, "older"), (10, "recent")]:
+            path = directory / f"{name}.npz"
+            path.write_bytes(b"")
+            modified = time.time() - age
+            os.utime(path, (modified, modified))
+        
+        checkpointer = Checkpointer("jacobi", "system", "current", directory=str(directory),
+                                    max_age=3600, max_files=3)
+        checkpointer.save(1, x=np.zeros(2))
+        
+        assert sorted(path.name for path in directory.iterdir()) == ["current.npz", "older.npz", "recent.npz"]
+    
+    def test_jacobi_resume_token_other_system(self, tmp_path, monkeypatch):
+        """Test that a checkpoint cannot be resumed against another system."""
+        monkeypatch.chdir(tmp_path)
+        A = [[4, -1], [-1, 4]]
+
+        first = jacobi_method(A, [5, 0], max_iterations=2, resume_token="run-1")
+        other = jacobi_method(A, [5, 1], resume_token="run-1")
+
+        assert first["resume_token"] == "run-1"
+        assert other["success"] == False
+        assert "different system" in other["message"]
+
+    def test_jacobi_operator_cache_hits(self):
+        """Test that repeated solves with the same matrix reuse the cached operator."""
+        operator_cache.clear()
+        A = [[4, -1, 0], [-1, 4, -1], [0, -1, 4]]
+
+        first = jacobi_method(A, [15, 10, 10], tolerance=1e-10)
+        second = jacobi_method(np.array(A, dtype=float), [1, 2, 3], tolerance=1e-10)
+        stats = operator_cache.stats()
+
+        assert first["success"] == True
+        assert second["success"] == True
+        assert stats["misses"] == 1
+        assert stats["hits"] == 1
+        assert stats["size"] == 1
+
+        uncached = jacobi_method(A, [1, 2, 3], tolerance=1e-10, use_cache=False)
+        assert np.allclose(uncached["solution"], second["solution"])
+        assert operator_cache.stats()["hits"] == 1
+
+    def test_operator_cache_lru_eviction(self):
+        """Test that the cache evicts the least recently used matrix."""
+        cache = OperatorCache(max_size=2)
+        A1, A2, A3 = (np.eye(3) * d for d in (2.0, 3.0, 4.0))
+
+        cache.lookup(A1)
+        cache.lookup(A2)
+        cache.lookup(A1)
+        cache.lookup(A3)
+        cache.lookup(A2)
+        stats = cache.stats()
+
+        assert stats["evictions"] == 2
+        assert stats["hits"] == 1
+        assert stats["misses"] == 4
+        assert stats["size"] == 2
+
+    def test_operator_cache_byte_bound(self):
+        """Test that the cache is bounded by the bytes of its entries."""
+        cache = OperatorCache(max_size=8, max_bytes=200_000)
+        A1, A2 = np.eye(100) * 2, np.eye(100) * 3
+        
+        cache.lookup(A1)
+        cache.lookup(A2)
+        assert cache.stats()["size"] == 2
+        
+        # A derived copy pushes the total over the bound: the older entry goes
+        entry = cache.lookup(A2)
+        entry.memo(("astype", "float32"), lambda: entry.operator.astype(np.float32))
+        entry.operator.offdiag_matvec(np.ones(100))
+        cache.trim()
+        stats = cache.stats()
+        assert stats["size"] == 1 and stats["evictions"] == 1
+        assert stats["bytes"] <= stats["max_bytes"]
+        
+        # Too large on its own: returned but never stored
+        big = cache.lookup(np.eye(200))
+        assert big.owner is None
+        assert cache.stats()["size"] == 1
+    
+    def test_jacobi_warm_start(self):
+        """Test that a warm start from the cached solution converges immediately."""
+        operator_cache.clear()
+        A = [[4, -1, 0], [-1, 4, -1], [0, -1, 4]]
+        b = [15, 10, 10]
+
+        cold = jacobi_method(A, b, tolerance=1e-10, warm_start=True)
+        warm = jacobi_method(A, b, tolerance=1e-10, warm_start=True)
+
+        assert cold["warm_started"] == False
+        assert warm["warm_started"] == True
+        assert warm["success"] == True
+        assert warm["iterations"] < cold["iterations"]
+        assert np.allclose(warm["solution"], cold["solution"])
+
+    def test_jacobi_float32_precision(self):
+        """Test single-precision sweeps on dense and sparse input."""
+        A = [[4, -1, 0], [-1, 4, -1], [0, -1, 4]]
+        b = [15, 10, 10]
+
+        dense = jacobi_method(A, b, tolerance=1e-5, precision="float32")
+        sparse = jacobi_method(CSRMatrix.from_dense(A), b, tolerance=1e-5, precision="float32")
+
+        assert dense["success"] == True
+        assert dense["converged_precision"] == "float32"
+        assert np.allclose(np.array(A) @ dense["solution"], b, atol=1e-4)
+        assert np.allclose(sparse["solution"], dense["solution"])
+
+    def test_jacobi_mixed_precision_reaches_float64_accuracy(self):
+        """Test that float64 refinement recovers accuracy lost by float32 sweeps."""
+        rng = np.random.default_rng(1)
+        n = 50
+        A = rng.uniform(-1, 1, (n, n))
+        A[np.arange(n), np.arange(n)] = n
+        x_true = rng.uniform(-1, 1, n)
+        b = A @ x_true
+
+        single = jacobi_method(A, b, tolerance=1e-12, max_iterations=500, precision="float32")
+        mixed = jacobi_method(A, b, tolerance=1e-12, max_iterations=500, precision="mixed")
+
+        assert np.abs(np.array(single["solution"]) - x_true).max() > 1e-10
+        assert mixed["success"] == True
+        assert mixed["converged_precision"] == "float64"
+        assert mixed["refinement_steps"] > 1
+        assert np.allclose(mixed["solution"], x_true, rtol=0, atol=1e-12)
+
+    def test_jacobi_unknown_precision(self):
+        """Test Jacobi with an unknown precision name."""
+        result = jacobi_method([[4, -1], [-1, 4]], [5, 0], precision="float16")
+
+        assert result["success"] == False
+        assert "Unknown precision" in result["message"]
+
+
+class TestRelaxationMethods:
+    """Tests for weighted Jacobi, Gauss-Seidel and SOR."""
+    
+    A = [[10, 2, -1, 0], [1, 8, 2, 1], [0, 1, 6, 2], [2, 0, 1, 9]]
+    b = [7, -3, 4, 12]
+    
+    def test_gauss_seidel_fewer_sweeps_than_jacobi(self):
+        """Test that Gauss-Seidel converges in fewer sweeps than Jacobi."""
+        jacobi = jacobi_method(self.A, self.b, tolerance=1e-10)
+        gs = gauss_seidel_method(self.A, self.b, tolerance=1e-10)
+        
+        assert gs["success"] == True
+        assert gs["method"] == "gauss_seidel"
+        assert gs["iterations"] < jacobi["iterations"]
+        assert np.allclose(gs["solution"], jacobi["solution"], atol=1e-8)
+    
+    def test_sor_sparse_matches_dense(self):
+        """Test SOR on CSR input against the dense solve."""
+        dense = sor_method(self.A, self.b, tolerance=1e-10, relaxation_factor=1.1)
+        sparse = sor_method(CSRMatrix.from_dense(self.A), self.b, tolerance=1e-10,
+                            relaxation_factor=1.1)
+        
+        assert dense["success"] == True
+        assert dense["relaxation_factor"] == 1.1
+        assert sparse["iterations"] == dense["iterations"]
+        assert np.allclose(sparse["solution"], dense["solution"])
+    
+    def test_sor_with_unit_factor_is_gauss_seidel(self):
+        """Test that SOR with ω = 1 reproduces Gauss-Seidel."""
+        gs = gauss_seidel_method(self.A, self.b, tolerance=1e-10)
+        sor = sor_method(self.A, self.b, tolerance=1e-10, relaxation_factor=1.0)
+        
+        assert sor["iterations"] == gs["iterations"]
+        assert np.allclose(sor["solution"], gs["solution"])
+    
+    def test_weighted_jacobi(self):
+        """Test weighted Jacobi through the relaxation factor."""
+        result = jacobi_method(self.A, self.b, tolerance=1e-10, relaxation_factor=0.8)
+        
+        assert result["success"] == True
+        residual = np.array(self.A) @ np.array(result["solution"]) - np.array(self.b)
+        assert np.linalg.norm(residual) < 1e-8
+    
+    def test_invalid_relaxation_factor(self):
+        """Test relaxation factors outside (0, 2)."""
+        assert "Relaxation factor" in sor_method(self.A, self.b, relaxation_factor=2.5)["message"]
+        assert "Relaxation factor" in jacobi_method(self.A, self.b, relaxation_factor=0)["message"]
+    
+    def test_gauss_seidel_zero_diagonal(self):
+        """Test Gauss-Seidel with zero diagonal element."""
+        result = gauss_seidel_method([[0, 1], [1, 4]], [1, 2])
+        
+        assert result["success"] == False
+        assert "diagonal" in result["message"]
+
+
+class TestConjugateGradient:
+    """Tests for the (preconditioned) Conjugate Gradient method."""
+    
+    @staticmethod
+    def spd_system(n=200):
+        """Build a 1D Poisson system with a varying diagonal."""
+        A = (np.diag(np.linspace(2.001, 2.5, n)) - np.diag(np.ones(n - 1), 1)
+             - np.diag(np.ones(n - 1), -1))
+        x_true = np.sin(np.linspace(0, 3, n))
+        return A, A @ x_true, x_true
+    
+    def test_pcg_converges_faster_than_jacobi(self):
+        """Test that PCG needs far fewer iterations than Jacobi on an SPD system."""
+        A, b, x_true = self.spd_system()
+        
+        cg = conjugate_gradient_method(A, b, tolerance=1e-10)
+        jacobi = jacobi_method(A, b, tolerance=1e-10, max_iterations=20000)
+        
+        assert cg["success"] == True
+        assert cg["preconditioner"] == "jacobi"
+        assert np.allclose(cg["solution"], x_true, atol=1e-7)
+        assert cg["iterations"] * 10 < jacobi["iterations"]
+        assert len(cg["iteration_log"]) == cg["iterations"]
+    
+    def test_pcg_sparse_matches_dense(self):
+        """Test CG on CSR input against the dense solve."""
+        A, b, _ = self.spd_system(50)
+        
+        dense = conjugate_gradient_method(A, b, preconditioner="none")
+        sparse = conjugate_gradient_method(CSRMatrix.from_dense(A), b, preconditioner="none")
+        
+        assert sparse["success"] == True
+        assert sparse["iterations"] == dense["iterations"]
+        assert np.allclose(sparse["solution"], dense["solution"])
+    
+    def test_cg_matrix_free_stencil(self):
+        """Test CG with a matrix-free 5-point Laplacian against the assembled matrix."""
+        grid = {"stencil": "laplacian_5pt", "grid_shape": [12, 9]}
+        op = StencilOperator("laplacian_5pt", (12, 9))
+        b = np.linspace(-1, 1, 108)
+        
+        free = conjugate_gradient_method(grid, b, tolerance=1e-10)
+        dense = conjugate_gradient_method(op.to_dense(), b, tolerance=1e-10)
+        
+        assert free["success"] == True
+        assert free["iterations"] == dense["iterations"]
+        assert np.allclose(free["solution"], dense["solution"])
+    
+    def test_cg_not_positive_definite(self):
+        """Test CG with an indefinite matrix."""
+        result = conjugate_gradient_method([[1, 2], [2, 1]], [1, 0])
+        
+        assert result["success"] == False
+        assert "positive definite" in result["message"]
+    
+    def test_cg_checkpoint_resume(self, tmp_path, monkeypatch):
+        """Test that CG resumes from its saved recurrence state."""
+        monkeypatch.chdir(tmp_path)
+        A, b, x_true = self.spd_system()
+
+        full = conjugate_gradient_method(A, b, tolerance=1e-10)
+        first = conjugate_gradient_method(A, b, tolerance=1e-10, max_iterations=10, checkpoint=True)
+        resumed = conjugate_gradient_method(A, b, tolerance=1e-10, resume_token=first["resume_token"])
+
+        assert first["success"] == False
+        assert resumed["success"] == True
+        assert resumed["resumed_from_iteration"] == 10
+        assert resumed["iterations"] == full["iterations"]
+        assert np.allclose(resumed["solution"], full["solution"], rtol=0, atol=1e-14)
+    
+    def test_cg_checkpoint_rejects_callable(self, tmp_path, monkeypatch):
+        """Test that a callable, which has no fingerprint, cannot be checkpointed."""
+        monkeypatch.chdir(tmp_path)
+        A, b, x_true = self.spd_system()
+        A_np = np.array(A, dtype=float)
+        callable_op = CallableOperator(lambda x: A_np @ x, np.diag(A_np))
+        
+        result = conjugate_gradient_method(callable_op, b, max_iterations=5, resume_token="job")
+        
+        assert result["success"] == False
+        assert "callable" in result["message"]
+        assert not (tmp_path / "checkpoints" / "job.npz").exists()
+    
+    def test_cg_zero_diagonal(self):
+        """Test CG with zero diagonal element."""
+        result = conjugate_gradient_method([[0, 1], [1, 4]], [1, 2])
+        
+        assert result["success"] == False
+        assert "diagonal" in result["message"]
+
 
 # ============================================================================
 # REGULA-FALSI METHOD TESTS
@@ -137,6 +851,14 @@ class TestRegulaFalsiMethod:
         assert result["success"] == True
         assert abs(result["root"] - np.log(2)) < 1e-4
     
+    def test_regula_falsi_log_policy(self):
+        """Test Regula-Falsi with a ring-buffer log policy."""
+        full = regula_falsi_method("x - cos(x)", 0, 1, tolerance=1e-10)
+        last = regula_falsi_method("x - cos(x)", 0, 1, tolerance=1e-10, log_policy="last:2")
+        
+        assert last["root"] == full["root"]
+        assert last["iteration_log"] == full["iteration_log"][-2:]
+    
     def test_regula_falsi_same_sign(self):
         """Test Regula-Falsi with same sign at endpoints."""
         func = "x**2 + 1"
@@ -169,6 +891,361 @@ class TestRegulaFalsiMethod:
         
         assert result["success"] == True
         assert abs(result["root"] - 3.0) < 1e-5
+    
+    @pytest.mark.parametrize("variant", ["illinois", "pegasus", "anderson_bjorck"])
+    def test_regula_falsi_modified_variants(self, variant):
+        """Test that the modified variants converge where classic stalls."""
+        classic = regula_falsi_method("exp(x) - 2", 0, 4, tolerance=1e-10)
+        modified = regula_falsi_method("exp(x) - 2", 0, 4, tolerance=1e-10, variant=variant)
+        
+        assert classic["success"] == False
+        assert modified["success"] == True
+        assert modified["variant"] == variant
+        assert abs(modified["root"] - np.log(2)) < 1e-8
+        assert modified["function_evaluations"] == modified["iterations"] + 2
+        assert modified["function_evaluations"] < 20
+    
+    def test_regula_falsi_comparison(self):
+        """Test the function-evaluation comparison across variants."""
+        result = regula_falsi_method("x**3 - 2*x - 5", 2, 3, tolerance=1e-10, compare=True)
+        comparison = result["comparison"]
+        
+        assert set(comparison) == {"classic", "illinois", "pegasus", "anderson_bjorck"}
+        assert comparison["classic"]["function_evaluations"] == result["function_evaluations"]
+        assert comparison["pegasus"]["function_evaluations"] < comparison["classic"]["function_evaluations"]
+    
+    @pytest.mark.parametrize("variant", ["classic", "illinois"])
+    def test_regula_falsi_batch_matches_scalar(self, variant):
+        """Test that the batch mode reproduces one scalar solve per parameter."""
+        p = np.linspace(0.5, 10, 25)
+        
+        batch = regula_falsi_batch("x**2 - p", 0, 4, {"p": list(p)}, tolerance=1e-10, variant=variant)
+        single = [regula_falsi_method(f"x**2 - {q!r}", 0, 4, tolerance=1e-10, variant=variant)
+                  for q in p.tolist()]
+        
+        assert batch["success"] == True
+        assert batch["iterations"] == [r["iterations"] for r in single]
+        assert np.allclose(batch["roots"], [r["root"] for r in single], rtol=0, atol=1e-12)
+        assert np.allclose(batch["roots"], np.sqrt(p), atol=1e-8)
+    
+    def test_regula_falsi_batch_status(self):
+        """Test per-problem status with brackets and several parameters."""
+        result = regula_falsi_batch(
+            "a2 * x**2 - c", [0, 0, 2, 0], [4, 1, 4, 1], {"a2": 1.0, "c": [4, 9, 4, float("nan")]}
+        )
+        
+        assert result["success"] == False
+        assert result["status"] == ["converged", "same_sign", "converged", "invalid"]
+        assert result["roots"][1] is None and result["roots"][3] is None
+        assert result["roots"][2] == 2.0 and result["iterations"][2] == 0
+        assert abs(result["roots"][0] - 2.0) < 1e-5
+        assert result["message"] == "2 of 4 problems converged"
+    
+    def test_regula_falsi_batch_reserved_parameter(self):
+        """Test that parameters may not shadow x or built-in names."""
+        result = regula_falsi_batch("x - e", 0, 1, {"e": [1.0]})
+        
+        assert result["success"] == False
+        assert "reserved" in result["message"]
+    
+    def test_regula_falsi_batch_bracket_stop(self):
+        """Test that stop="bracket" locates a flat root to the tolerance."""
+        step = regula_falsi_batch("(x - 0.3)**3", 0, 1, tolerance=1e-8, variant="illinois")
+        bracket = regula_falsi_batch("(x - 0.3)**3", 0, 1, tolerance=1e-8, variant="illinois", stop="bracket")
+        
+        assert bracket["success"] == True
+        assert abs(bracket["roots"][0] - 0.3) < 1e-8 < abs(step["roots"][0] - 0.3)
+        assert bracket["function_evaluations"][0] > bracket["iterations"][0] + 2
+    
+    def test_regula_falsi_unknown_variant(self):
+        """Test Regula-Falsi with an unknown variant."""
+        result = regula_falsi_method("x**2 - 4", 0, 3, variant="secant")
+        
+        assert result["success"] == False
+        assert "Unknown variant" in result["message"]
+
+
+# ============================================================================
+# BRENT METHOD TESTS
+# ============================================================================
+
+class TestBrentMethod:
+    """Tests for Brent's method."""
+    
+    @pytest.mark.parametrize("func, a, b, root", [
+        ("x**2 - 4", 0, 3, 2.0),
+        ("exp(x) - 2", 0, 4, np.log(2)),
+        ("x**10 - 1", 0, 1.3, 1.0),
+        ("x - cos(x)", 0, 1, 0.7390851332151607),
+    ])
+    def test_brent_few_evaluations(self, func, a, b, root):
+        """Test that Brent converges in a handful of evaluations."""
+        result = brent_method(func, a, b, tolerance=1e-10)
+        classic = regula_falsi_method(func, a, b, tolerance=1e-10)
+        
+        assert result["success"] == True
+        assert abs(result["root"] - root) < 1e-8
+        assert result["function_evaluations"] <= 10
+        assert result["function_evaluations"] < classic["function_evaluations"]
+    
+    def test_brent_same_layout_as_regula_falsi(self):
+        """Test that Brent shares the Regula-Falsi result and log layout."""
+        brent = brent_method("x**3 - 2*x - 5", 2, 3)
+        regula = regula_falsi_method("x**3 - 2*x - 5", 2, 3)
+        
+        assert set(regula) - {"variant"} <= set(brent)
+        assert {"a", "b", "c", "f(c)"} <= set(brent["iteration_log"][0])
+        assert all(entry["a"] <= entry["c"] <= entry["b"] for entry in brent["iteration_log"])
+    
+    def test_brent_bracket_checks(self):
+        """Test the shared sign and endpoint checks."""
+        same_sign = brent_method("x**2 + 1", 0, 3)
+        at_a = brent_method("x**2 - 4", 2.0, 3.0)
+        
+        assert same_sign["success"] == False
+        assert "same sign" in same_sign["message"]
+        assert at_a["success"] == True and at_a["root"] == 2.0
+    
+    def test_brent_division_by_zero(self, monkeypatch):
+        """Test that Brent reports a division by zero like Regula-Falsi."""
+        import brent
+        def divide_by_zero(*args):
+            raise ZeroDivisionError
+        monkeypatch.setattr(brent, "_brent", divide_by_zero)
+        
+        result = brent.brent_method("x**2 - 4", 0, 3)
+        
+        assert result["success"] == False
+        assert result["message"] == "Division by zero - function may be constant"
+    
+    def test_brent_falls_back_to_bisection(self):
+        """Test that bisection steps keep a hard problem bracketed."""
+        result = brent_method("x**10 - 1", 0, 1.3, tolerance=1e-12)
+        
+        assert result["success"] == True
+        assert "bisection" in [entry["step"] for entry in result["iteration_log"]]
+
+
+# ============================================================================
+# ALL-ROOTS SEARCH TESTS
+# ============================================================================
+
+class TestRootSearch:
+    """Tests for the all-roots search."""
+    
+    def test_find_all_roots_sin(self):
+        """Test that every sign change on the grid yields a root."""
+        result = find_all_roots("sin(x)", -10, 10)
+        
+        assert result["success"] == True
+        assert result["count"] == 7
+        assert np.allclose(result["roots"], np.pi * np.arange(-3, 4), atol=1e-8)
+        assert result["even_multiplicity"] == []
+    
+    @pytest.mark.parametrize("func, a, b, roots", [
+        ("(x-0.5)*(x-0.5000001)", 0, 1, [0.5, 0.5000001]),
+        ("x**2 - 1e-10", -1, 1, [-1e-5, 1e-5]),
+        ("(x-0.3)**2*(x-0.7)**2 - 1e-14", 0, 1, [0.3 - 2.5e-7, 0.3 + 2.5e-7, 0.7 - 2.5e-7, 0.7 + 2.5e-7]),
+    ])
+    def test_find_all_roots_close_pairs(self, func, a, b, roots):
+        """Test that close root pairs inside one grid cell are resolved."""
+        result = find_all_roots(func, a, b, polynomial=False)
+        
+        assert result["success"] == True
+        assert result["count"] == len(roots)
+        assert np.allclose(result["roots"], roots, rtol=0, atol=1e-8)
+    
+    def test_find_all_roots_even_multiplicity(self):
+        """Test roots where f touches zero without changing sign."""
+        result = find_all_roots("sin(x)**2", 0.1, 10)
+        
+        assert result["success"] == True
+        assert np.allclose(result["roots"], np.pi * np.arange(1, 4), atol=1e-6)
+        assert result["even_multiplicity"] == result["roots"]
+    
+    def test_find_all_roots_multiple_root(self):
+        """Test that a flat odd-multiplicity root is still located."""
+        result = find_all_roots("x**3", -1, 1, polynomial=False)
+        
+        assert result["success"] == True
+        assert result["count"] == 1 and abs(result["roots"][0]) < 1e-8
+    
+    def test_find_all_roots_skips_poles(self):
+        """Test that sign changes across a pole are not reported as roots."""
+        result = find_all_roots("tan(x)", -1, 3)
+        
+        assert result["success"] == True
+        assert result["count"] == 1 and abs(result["roots"][0]) < 1e-8
+    
+    def test_find_all_roots_none(self):
+        """Test an interval without roots."""
+        result = find_all_roots("cos(x) + 2", 0, 10)
+        
+        assert result["success"] == True
+        assert result["roots"] == [] and result["count"] == 0
+    
+    def test_find_all_roots_classic_variant(self):
+        """Test that the classic variant, whose brackets need not shrink, is rejected."""
+        result = find_all_roots("sin(x)", 0, 10, variant="classic")
+        
+        assert result["success"] == False
+        assert "Unknown variant" in result["message"]
+    
+    def test_find_all_roots_polynomial_fast_path(self):
+        """Test that polynomials skip the grid and match the bracketing search."""
+        fast = find_all_roots("x**3 - 2*x - 5 + x**2*(x - 1)", -3, 3)
+        slow = find_all_roots("x**3 - 2*x - 5 + x**2*(x - 1)", -3, 3, polynomial=False)
+        
+        assert fast["method"] == "companion" and fast["function_evaluations"] == 0
+        assert slow["method"] == "bracketing"
+        assert fast["count"] == slow["count"]
+        assert np.allclose(fast["roots"], slow["roots"], atol=1e-8)
+        assert find_all_roots("sin(x)", 0, 10)["method"] == "bracketing"
+    
+    def test_find_all_roots_polynomial_multiple_root(self):
+        """Test the fast path on a root of high multiplicity."""
+        result = find_all_roots("(x - 2)**6", 0, 4)
+        
+        assert result["method"] == "companion"
+        assert result["count"] == 1 and abs(result["roots"][0] - 2) < 1e-10
+        assert result["even_multiplicity"] == result["roots"]
+    
+    def test_find_all_roots_polynomial_near_axis_fallback(self):
+        """Test that complex roots too close to the real axis fall back to bracketing."""
+        result = find_all_roots("x**2 + 1e-14", -1, 1)
+        
+        assert result["method"] == "bracketing"
+        assert result["count"] == 1 and abs(result["roots"][0]) < 1e-8
+        assert find_all_roots("x**2 + 1", -1, 1)["method"] == "companion"
+
+
+# ============================================================================
+# POLYNOMIAL ROOTS TESTS
+# ============================================================================
+
+class TestPolynomialRoots:
+    """Tests for the companion-matrix polynomial roots."""
+    
+    @pytest.mark.parametrize("func, coefficients", [
+        ("x**2 - 4", (1.0, 0.0, -4.0)),
+        ("(x - 1)*(x + 2)**2 / 2", (0.5, 1.5, 0.0, -2.0)),
+        ("-x + pi", (-1.0, np.pi)),
+        ("x**2.0", (1.0, 0.0, 0.0)),
+        ("sin(x)", None),
+        ("x**0.5", None),
+        ("1/x", None),
+        ("2**x", None),
+    ])
+    def test_polynomial_coefficients(self, func, coefficients):
+        """Test polynomial detection from the expression AST."""
+        assert compile_expression(func).coefficients == coefficients
+    
+    @pytest.mark.parametrize("func, coefficients", [
+        ("x - 1.0**10**8", (1.0, -1.0)),
+        ("x - 2.0**10**6", None),
+        ("x**(10**9)", None),
+        ("x - 1" + "0" * 400, None),
+    ])
+    def test_polynomial_huge_exponents(self, func, coefficients):
+        """Test that huge exponents are not expanded term by term at parse time."""
+        start = time.perf_counter()
+        
+        assert compile_expression(func).coefficients == coefficients
+        assert time.perf_counter() - start < 1.0
+    
+    def test_polynomial_roots_real_and_complex(self):
+        """Test that every root is returned at once."""
+        result = polynomial_roots("(x**2 + 1)*(x - 2)*(x + 3)")
+        
+        assert result["success"] == True
+        assert result["degree"] == 4
+        assert np.allclose(result["roots"], [-3, 2], rtol=0, atol=1e-12)
+        assert np.allclose(sorted(result["complex_roots"]), [[0, -1], [0, 1]], atol=1e-12)
+    
+    def test_polynomial_roots_multiple(self):
+        """Test that eigenvalue clusters of multiple roots are merged."""
+        result = polynomial_roots("(x - 0.3)**4 * (x - 2)")
+        close = polynomial_roots("(x - 0.5)*(x - 0.5000001)")
+        
+        assert np.allclose(result["roots"], [0.3, 2.0], rtol=0, atol=1e-10)
+        assert result["multiplicity"] == [4, 1] and result["complex_roots"] == []
+        assert np.allclose(close["roots"], [0.5, 0.5000001], rtol=0, atol=1e-8)
+        assert close["multiplicity"] == [1, 1]
+    
+    @pytest.mark.parametrize("k", [5, 6, 7, 8, 10])
+    @pytest.mark.parametrize("root", [1.0, 2.0])
+    def test_polynomial_roots_high_multiplicity(self, k, root):
+        """Test that the wider eigenvalue scatter of high multiplicities is merged."""
+        result = polynomial_roots(f"(x - {root})**{k} * (x + 3)")
+        
+        assert np.allclose(result["roots"], [-3, root], rtol=0, atol=1e-10)
+        assert result["multiplicity"] == [1, k] and result["complex_roots"] == []
+    
+    def test_polynomial_roots_not_polynomial(self):
+        """Test that other expressions are rejected."""
+        result = polynomial_roots("exp(x) - 2")
+        
+        assert result["success"] == False
+        assert "not a polynomial" in result["message"]
+
+
+# ============================================================================
+# COMPILED EXPRESSION TESTS
+# ============================================================================
+
+class TestCompiledExpression:
+    """Tests for the compiled expression cache."""
+    
+    def test_expression_scalar_and_array_agree(self):
+        """Test that scalar and array evaluation give the same values."""
+        f = compile_expression("sin(x) + sqrt(abs(x)) * exp(-x) - log(1 + x**2)")
+        xs = np.linspace(-2, 2, 9)
+        
+        scalars = [f(float(x)) for x in xs]
+        
+        assert type(scalars[0]) is float
+        assert np.allclose(scalars, f(xs))
+    
+    def test_expression_scalar_fallback(self):
+        """Test that math domain errors fall back to NumPy semantics."""
+        with np.errstate(invalid="ignore", over="ignore"):
+            assert np.isnan(compile_expression("log(x)")(-1.0))
+            assert np.isinf(compile_expression("exp(x)")(1000.0))
+    
+    def test_expression_cache_reuse(self):
+        """Test that repeated solves compile a function string once."""
+        func = "x**3 - 2*x - 5 + 0*x"
+        regula_falsi_method(func, 2, 3)
+        misses = compile_expression.cache_info().misses
+        
+        regula_falsi_method(func, 2, 3)
+        forward_finite_difference(func, [2.0])
+        
+        assert compile_expression.cache_info().misses == misses
+        assert compile_expression(func) is compile_expression(func)
+    
+    def test_expression_extra_variables(self):
+        """Test expressions with named parameters."""
+        f = compile_expression("a*x + b", ("x", "a", "b"))
+        
+        assert f(1.0, 2.0, 3.0) == 5.0
+        assert np.allclose(f(np.arange(3.0), 2.0, np.ones(3)), [1.0, 3.0, 5.0])
+    
+    @pytest.mark.parametrize("source", [
+        "__import__('os')", "x.__class__", "np.load('data')", "'text'",
+        "lambda: 1", "[x]", "y + 1", "x +", "np.sin(x, out=x)"
+    ])
+    def test_expression_rejects_unsafe(self, source):
+        """Test that anything outside the whitelist is rejected."""
+        with pytest.raises(ExpressionError):
+            compile_expression(source)
+    
+    def test_regula_falsi_invalid_expression(self):
+        """Test that an invalid function string is reported, not evaluated."""
+        result = regula_falsi_method("__import__('os').getcwd()", 0, 1)
+        
+        assert result["success"] == False
+        assert "expression" in result["message"]
 
 
 # ============================================================================
@@ -230,10 +1307,43 @@ class TestForwardFiniteDifference:
         func = "x**2"
         x_vals = [2.0]
         
-        result = forward_finite_difference(func, x_vals, order=3, h=0.01)
+        result = forward_finite_difference(func, x_vals, order=0, h=0.01)
+        
+        assert result["success"] == False
+        assert "Order must be a positive integer" in result["message"]
+    
+    @pytest.mark.parametrize("order, accuracy, message", [
+        (11, None, "Order must be at most 10"),
+        (1, 300, "Accuracy must be at most 20"),
+    ])
+    def test_forward_fd_order_accuracy_caps(self, order, accuracy, message):
+        """Test that oversized stencils are rejected instead of overflowing."""
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            result = forward_finite_difference("x**2", [2.0], order=order, accuracy=accuracy, h=0.01)
         
         assert result["success"] == False
-        assert "Order must be 1 or 2" in result["message"]
+        assert message in result["message"]
+        assert stencil.cache_info().maxsize is not None
+    
+    def test_forward_fd_higher_order(self):
+        """Test third and fourth derivatives from Fornberg stencils."""
+        third = forward_finite_difference("x**4", [1.0], order=3, h=0.01, accuracy=2)
+        fourth = forward_finite_difference("x**4", [1.0], order=4, h=0.05)
+        
+        assert abs(third["points"][0]["derivative"] - 24.0) < 1e-3
+        assert abs(fourth["points"][0]["derivative"] - 24.0) < 1e-3
+    
+    def test_forward_fd_accuracy(self):
+        """Test that a higher-accuracy stencil beats a smaller step."""
+        exact = np.cos(1.0)
+        
+        fine = forward_finite_difference("sin(x)", [1.0], h=0.001)
+        coarse = forward_finite_difference("sin(x)", [1.0], h=0.1, accuracy=4)
+        
+        assert coarse["accuracy"] == 4
+        assert len(coarse["points"][0]["points_used"]) == 5
+        assert abs(coarse["points"][0]["derivative"] - exact) < abs(fine["points"][0]["derivative"] - exact)
 
 
 # ============================================================================
@@ -365,6 +1475,103 @@ class TestCenterFiniteDifference:
         # Center difference should be more accurate
         assert center_error < forward_error
         assert center_error < backward_error
+    
+    def test_center_fd_vectorized_matches_pointwise(self):
+        """Test that the vectorized engine matches the scalar formulas."""
+        x_vals = list(np.linspace(-1, 2, 7))
+        h = 0.05
+        f = lambda x: np.sin(x) * np.exp(x)
+        
+        result = center_finite_difference("sin(x) * exp(x)", x_vals, order=2, h=h)
+        expected = [(f(x + h) - 2 * f(x) + f(x - h)) / h**2 for x in x_vals]
+        
+        assert np.allclose([p["derivative"] for p in result["points"]], expected)
+        assert [q["x"] for q in result["points"][3]["points_used"]] == pytest.approx(
+            [x_vals[3] - h, x_vals[3], x_vals[3] + h]
+        )
+    
+    def test_center_fd_incomplete_stencils(self):
+        """Test that sample points without a full stencil get no derivative."""
+        result = center_finite_difference("", [0, 1, 2, 3], [0, 1, 4, 9], order=2, h=1.0)
+        derivatives = [p["derivative"] for p in result["points"]]
+        
+        assert derivatives[1:3] == [2.0, 2.0]
+        assert derivatives[0] is None and derivatives[3] is None
+        assert "second order central" in result["points"][0]["error"]
+    
+    def test_center_fd_stencil_weights(self):
+        """Test Fornberg weights against the classical formulas."""
+        from finite_difference import stencil
+        
+        assert stencil("central", 1, 4) == (
+            (-2, -1, 0, 1, 2), pytest.approx((1/12, -2/3, 0.0, 2/3, -1/12))
+        )
+        assert stencil("backward", 1, 2) == ((-2, -1, 0), pytest.approx((0.5, -2.0, 1.5)))
+        assert stencil("central", 2, 2) is stencil("central", 2, 2)
+        with pytest.raises(ValueError):
+            stencil("central", 1, 3)
+    
+    def test_center_fd_high_accuracy_y_values(self):
+        """Test a sixth-order stencil applied to sampled data."""
+        h = 0.1
+        x_vals = list(np.arange(0, 2, h))
+        y_vals = list(np.exp(x_vals))
+        
+        result = center_finite_difference("", x_vals, y_vals, order=1, h=h, accuracy=6)
+        derivatives = [p["derivative"] for p in result["points"]]
+        
+        assert derivatives[:3] == [None] * 3 and derivatives[-3:] == [None] * 3
+        assert np.allclose(derivatives[3:-3], np.exp(x_vals[3:-3]), rtol=1e-7)
+    
+    def test_center_fd_nonuniform(self):
+        """Test first and second derivatives of irregularly sampled data."""
+        rng = np.random.default_rng(0)
+        x_vals = np.sort(rng.uniform(0, 2, 200))
+        y_vals = np.sin(x_vals)
+        
+        first = center_finite_difference("", list(x_vals), list(y_vals), order=1, nonuniform=True)
+        second = center_finite_difference("", list(x_vals), list(y_vals), order=2, nonuniform=True)
+        uniform = center_finite_difference("", list(x_vals), list(y_vals), order=1, h=0.01)
+        
+        d1 = np.array([p["derivative"] for p in first["points"][1:-1]])
+        d2 = np.array([p["derivative"] for p in second["points"][1:-1]])
+        assert np.allclose(d1, np.cos(x_vals[1:-1]), atol=1e-3)
+        assert np.allclose(d2, -np.sin(x_vals[1:-1]), atol=0.1)
+        assert first["points"][0]["derivative"] is None
+        assert len(first["points"][5]["points_used"]) == 3
+        assert not np.allclose([p["derivative"] for p in uniform["points"][1:-1]], d1, atol=1e-3)
+    
+    def test_center_fd_nonuniform_exact_quadratic(self):
+        """Test that local weights differentiate a quadratic exactly."""
+        x_vals = [0.0, 0.1, 0.4, 0.5, 1.2]
+        y_vals = [3 * x**2 + x for x in x_vals]
+        
+        result = backward_finite_difference("", x_vals, y_vals, order=1, accuracy=2,
+                                            nonuniform=True, compact=True)
+        
+        assert result["derivative"][:2] == [None, None]
+        assert np.allclose(result["derivative"][2:], [6 * x + 1 for x in x_vals[2:]])
+    
+    def test_center_fd_nonuniform_unsorted(self):
+        """Test that non-increasing x values are rejected."""
+        result = center_finite_difference("", [0, 2, 1], [0, 4, 1], nonuniform=True)
+        
+        assert result["success"] == False
+        assert "strictly increasing" in result["message"]
+    
+    def test_center_fd_compact(self):
+        """Test the compact output for large grids."""
+        x_vals = list(np.linspace(0, 1, 10001))
+        
+        compact = center_finite_difference("x**3", x_vals, order=1, h=1e-3, compact=True)
+        
+        assert compact["success"] == True
+        assert compact["points"] == []
+        assert len(compact["derivative"]) == len(compact["x"]) == len(x_vals)
+        assert np.allclose(compact["derivative"], 3 * np.array(x_vals)**2, atol=1e-5)
+        
+        with_y = center_finite_difference("", [0, 1, 2], [0, 1, 4], h=1.0, compact=True)
+        assert with_y["derivative"] == [None, 2.0, None]
 
 
 # ============================================================================